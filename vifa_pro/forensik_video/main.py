@@ -41,28 +41,38 @@ Deteksi:
 Author: OpenAI-GPT & Anda
 License: MIT
 Dependencies: opencv-python, opencv-contrib-python, imagehash, numpy, Pillow,
-              reportlab, matplotlib, tqdm, scikit-learn, scikit-image
+              reportlab, matplotlib, tqdm, scikit-learn, scikit-image, joblib
 """
 
 from __future__ import annotations
 import argparse
 import json
+import mmap
+import gc
 import hashlib
 import shutil
 import subprocess
+import os
 import sys
-from dataclasses import dataclass, field
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
+from fractions import Fraction
+from functools import lru_cache
 from pathlib import Path
 from collections import defaultdict, Counter
+from itertools import accumulate
 from typing import Dict, List, Tuple, Optional, Any
+from xml.sax.saxutils import escape
 
 # Pemeriksaan Dependensi Awal
 try:
     import cv2
     import imagehash
     import numpy as np
-    from PIL import Image, ImageChops, ImageEnhance, ImageDraw, ImageFont
+    from PIL import Image, ImageFont
     from reportlab.lib.pagesizes import A4, letter
     from reportlab.lib.units import mm
 
@@ -73,13 +83,29 @@ try:
     from reportlab.lib.utils import ImageReader
     try:
         from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image as PlatypusImage, Table, TableStyle, PageBreak
+        from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame
     except ImportError as e:
         PlatypusImage = None
     from reportlab.lib import colors
+    import matplotlib
+    matplotlib.use('Agg')  # Backend non-interaktif, dipasang sebelum pyplot diimpor
     import matplotlib.pyplot as plt
+    # Font & ukuran teks ditetapkan sekali; plot tidak perlu mengulang fontsize= per elemen
+    plt.rcParams.update({
+        'font.family': 'DejaVu Sans',
+        'font.size': 10,
+        'axes.titlesize': 14,
+        'axes.titleweight': 'bold',
+        'axes.labelsize': 12,
+        'legend.fontsize': 10,
+        'figure.autolayout': False,
+    })
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
     import matplotlib.patches as mpatches
     from tqdm import tqdm
     from sklearn.cluster import KMeans
+    from joblib import Parallel, delayed
     from skimage.metrics import structural_similarity as ssim
     from scipy import stats
     import seaborn as sns
@@ -96,6 +122,20 @@ try:
         DOCX_AVAILABLE = False
         print("Warning: python-docx tidak terinstall. Fitur ekspor DOCX tidak tersedia.")
 
+    # Numba opsional untuk mempercepat kernel numerik
+    try:
+        from numba import njit, prange
+        NUMBA_AVAILABLE = True
+    except ImportError:
+        NUMBA_AVAILABLE = False
+        prange = range
+
+        def njit(*args, **kwargs):
+            """Fallback tanpa Numba: fungsi dijalankan apa adanya."""
+            if len(args) == 1 and callable(args[0]) and not kwargs:
+                return args[0]
+            return lambda fn: fn
+
 except ImportError as e:
     print(f"Error: Dependensi penting tidak ditemukan -> {e}")
     sys.exit(1)
@@ -113,9 +153,32 @@ CONFIG = {
     "OPTICAL_FLOW_Z_THRESH": 5.0,
     "DUPLICATION_SSIM_CONFIRM": 0.80,
     "SIFT_MIN_MATCH_COUNT": 10,
+    "SIFT_FLANN_MIN_PAIRS": 1_000_000,  # Di atas jumlah pasangan deskriptor ini, pencocokan memakai FLANN
     "USE_AUTO_THRESHOLDS": True
 }
 
+# Jumlah thread OpenCV bawaan, dipulihkan setelah bagian paralel selesai
+_CV_THREADS = cv2.getNumThreads()
+
+@contextmanager
+def opencv_single_thread():
+    """Membatasi OpenCV ke satu thread selama bagian paralel untuk mencegah oversubscription."""
+    cv2.setNumThreads(1)
+    try:
+        yield
+    finally:
+        cv2.setNumThreads(_CV_THREADS)
+
+# Plot yang disematkan ke laporan disimpan sebagai JPEG ringkas (via Pillow)
+PLOT_JPEG_KWARGS = {"quality": 85, "optimize": True}
+
+# Parameter SSIM: jendela seragam 7x7 (box filter) tanpa koreksi kovarians sampel
+SSIM_FAST_KWARGS = {
+    "win_size": 7,
+    "gaussian_weights": False,
+    "use_sample_covariance": False,
+}
+
 class Icons:
     IDENTIFICATION = "🔍"
     PRESERVATION = "🛡️"
@@ -147,6 +210,10 @@ def print_stage_banner(stage_number: int, stage_name: str, icon: str, descriptio
 # Struktur Data Inti (DIPERLUAS UNTUK TAHAP 4 ENHANCED)
 ###############################################################################
 
+# Bit flag alasan temporal pada Evidence._reason_flags
+REASON_FLAG_SSIM = 1
+REASON_FLAG_OPTICAL_FLOW = 2
+
 @dataclass
 class Evidence:
     reasons: list[str] = field(default_factory=list)
@@ -158,6 +225,26 @@ class Evidence:
     detailed_analysis: dict = field(default_factory=dict)
     visualizations: dict = field(default_factory=dict)
     explanations: dict = field(default_factory=dict)
+    _reason_flags: int = 0  # REASON_FLAG_*, diisi bersamaan dengan reasons
+
+@dataclass(slots=True)
+class AnomalyExplanation:
+    """Penjelasan anomali temporal per frame; dikonversi ke dict di akhir Tahap 3."""
+    type: str
+    frame_index: int
+    timestamp: float
+    severity: str
+    technical_explanation: str
+    simple_explanation: str
+    metrics: dict
+
+# Kode integer untuk FrameInfo.type (0 = asli, >0 = anomali)
+FRAME_TYPE_CODES = {
+    "original": 0,
+    "anomaly_duplication": 1,
+    "anomaly_insertion": 2,
+    "anomaly_discontinuity": 3,
+}
 
 @dataclass
 class FrameInfo:
@@ -166,8 +253,11 @@ class FrameInfo:
     img_path_original: str  # Path ke frame asli
     img_path: str           # Path ke frame yang dinormalisasi (digunakan untuk analisis utama)
     img_path_comparison: str | None = None # Path ke gambar perbandingan (opsional)
+    img_path_comparison_thumb: str | None = None # Thumbnail perbandingan untuk laporan (hanya frame pertama)
     hash: str | None = None
+    hash_u64: int | None = None  # Representasi integer dari hash untuk bucketing vektor
     type: str = "original"
+    _type_code: int = 0     # FRAME_TYPE_CODES[type], diisi bersamaan dengan type
     ssim_to_prev: float | None = None
     optical_flow_mag: float | None = None
     color_cluster: int | None = None
@@ -193,6 +283,7 @@ class AnalysisResult:
     # Tambahan untuk Tahap 3
     detailed_anomaly_analysis: dict = field(default_factory=dict)
     statistical_summary: dict = field(default_factory=dict)
+    _flow_z_threshold_upper: Optional[float] = None  # Ambang atas magnitudo aliran optik (median + MAD)
     # TAMBAHAN UNTUK TAHAP 4 ENHANCED
     integrity_analysis: dict = field(default_factory=dict)  # Pastikan ini ada
     pipeline_assessment: dict = field(default_factory=dict)
@@ -205,57 +296,95 @@ class AnalysisResult:
 # Fungsi Analisis Individual (EXISTING)
 ###############################################################################
 
-def perform_ela(image_path: Path, quality: int=90) -> tuple[Path, int, np.ndarray] | None:
+def perform_ela(image_path: Path, quality: int=90, out_buf: np.ndarray | None = None) -> tuple[Path, int, np.ndarray] | None:
     """
     Error Level Analysis (ELA) yang ditingkatkan dengan analisis grid dan statistik detail.
     Mengembalikan path gambar ELA, max difference, dan array ELA untuk analisis lebih lanjut.
+    Kompresi ulang JPEG dilakukan di memori; `out_buf` (opsional) dipakai ulang sebagai
+    buffer selisih jika ukurannya cocok.
     """
     try:
         ela_dir = image_path.parent.parent / "ela_artifacts"
         ela_dir.mkdir(exist_ok=True)
         out_path = ela_dir / f"{image_path.stem}_ela.jpg"
-        temp_jpg_path = out_path.with_name(f"temp_{out_path.name}")
-
-        # Buka dan simpan dengan kualitas tertentu
-        with Image.open(image_path).convert('RGB') as im:
-            im.save(temp_jpg_path, 'JPEG', quality=quality)
 
-        # Hitung perbedaan
-        with Image.open(image_path).convert('RGB') as im_orig, Image.open(temp_jpg_path) as resaved_im:
-            ela_im = ImageChops.difference(im_orig, resaved_im)
+        img = cv2.imread(str(image_path), cv2.IMREAD_COLOR)
+        if img is None:
+            raise ValueError("gambar tidak dapat dibaca")
 
-        if Path(temp_jpg_path).exists():
-            Path(temp_jpg_path).unlink()
+        # Kompresi ulang dengan kualitas tertentu tanpa file sementara
+        ok, encoded = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not ok:
+            raise ValueError("encode JPEG gagal")
+        resaved = cv2.imdecode(encoded, cv2.IMREAD_COLOR)
 
-        # Konversi ke array untuk analisis statistik
-        ela_array = np.array(ela_im)
+        # Hitung perbedaan langsung ke buffer
+        if out_buf is None or out_buf.shape != img.shape or out_buf.dtype != img.dtype:
+            out_buf = np.empty_like(img)
+        ela_array = cv2.absdiff(img, resaved, dst=out_buf)
 
         # Hitung statistik detail
-        extrema = ela_im.getextrema()
-        max_diff = max(ex[1] for ex in extrema) if extrema else 1
+        max_diff = int(ela_array.max()) if ela_array.size else 1
         scale = 255.0 / (max_diff if max_diff > 0 else 1)
 
         # Enhance dan simpan
-        ela_im = ImageEnhance.Brightness(ela_im).enhance(scale)
+        ela_enhanced = cv2.convertScaleAbs(ela_array, alpha=scale)
 
         # Tambahkan grid untuk analisis regional
-        ela_with_grid = ela_im.copy()
-        draw = ImageDraw.Draw(ela_with_grid)
-        width, height = ela_with_grid.size
         grid_size = 50
+        ela_enhanced[:, ::grid_size] = 128
+        ela_enhanced[::grid_size, :] = 128
 
-        for x in range(0, width, grid_size):
-            draw.line([(x, 0), (x, height)], fill=(128, 128, 128), width=1)
-        for y in range(0, height, grid_size):
-            draw.line([(0, y), (width, y)], fill=(128, 128, 128), width=1)
-
-        ela_with_grid.save(out_path)
+        cv2.imwrite(str(out_path), ela_enhanced)
 
         return out_path, max_diff, ela_array
     except Exception as e:
         log(f"  {Icons.ERROR} Gagal ELA pada {image_path.name}: {e}")
         return None
 
+def perform_ela_batch(image_paths: list[Path], quality: int = 90, grid_size: int = 50) -> list[tuple[Path, int, np.ndarray] | None]:
+    """
+    ELA untuk sekumpulan frame berukuran sama sekaligus: frame ditumpuk ke satu array
+    kontigu [N,H,W,3] dan selisihnya dihitung dengan satu absdiff. Frame yang gagal dibaca
+    atau berbeda ukuran diproses satu per satu dengan perform_ela.
+    """
+    images = [cv2.imread(str(p), cv2.IMREAD_COLOR) for p in image_paths]
+    if any(img is None for img in images) or len({img.shape for img in images}) != 1:
+        return [perform_ela(p, quality) for p in image_paths]
+    try:
+        originals = np.stack(images)
+        del images
+        resaved = np.empty_like(originals)
+        for i in range(len(originals)):
+            ok, encoded = cv2.imencode('.jpg', originals[i], [cv2.IMWRITE_JPEG_QUALITY, quality])
+            if not ok:
+                raise ValueError("encode JPEG gagal")
+            resaved[i] = cv2.imdecode(encoded, cv2.IMREAD_COLOR)
+
+        # Satu absdiff untuk seluruh batch (dilihat sebagai satu gambar setinggi N*H)
+        n, h, w, c = originals.shape
+        ela_arrays = cv2.absdiff(originals.reshape(n * h, w, c), resaved.reshape(n * h, w, c)).reshape(n, h, w, c)
+        max_diffs = ela_arrays.reshape(n, -1).max(axis=1)
+
+        enhanced = resaved  # Buffer hasil kompresi ulang dipakai ulang untuk gambar ELA
+        for i in range(n):
+            max_diff = int(max_diffs[i])
+            cv2.convertScaleAbs(ela_arrays[i], dst=enhanced[i], alpha=255.0 / (max_diff if max_diff > 0 else 1))
+        enhanced[:, :, ::grid_size] = 128
+        enhanced[:, ::grid_size, :] = 128
+
+        results = []
+        for i, image_path in enumerate(image_paths):
+            ela_dir = image_path.parent.parent / "ela_artifacts"
+            ela_dir.mkdir(exist_ok=True)
+            out_path = ela_dir / f"{image_path.stem}_ela.jpg"
+            cv2.imwrite(str(out_path), enhanced[i])
+            results.append((out_path, int(max_diffs[i]), ela_arrays[i]))
+        return results
+    except Exception as e:
+        log(f"  ⚠️ ELA batch gagal ({e}), memproses frame satu per satu.")
+        return [perform_ela(p, quality) for p in image_paths]
+
 def analyze_ela_regions(ela_array: np.ndarray, grid_size: int = 50) -> dict:
     """
     Menganalisis ELA berdasarkan region grid untuk mendeteksi area yang mencurigakan.
@@ -294,42 +423,138 @@ def analyze_ela_regions(ela_array: np.ndarray, grid_size: int = 50) -> dict:
         'grid_size': grid_size
     }
 
-def compare_sift_enhanced(img_path1: Path, img_path2: Path, out_dir: Path) -> dict:
+@njit(parallel=True, fastmath=True, cache=True)
+def _sift_l2_knn2(desc_q, desc_t):
+    """Dua tetangga terdekat (jarak L2) di desc_t untuk setiap deskriptor di desc_q."""
+    n_q, n_t, dim = desc_q.shape[0], desc_t.shape[0], desc_q.shape[1]
+    best_idx = np.empty(n_q, dtype=np.int64)
+    best = np.empty(n_q, dtype=np.float64)
+    second = np.empty(n_q, dtype=np.float64)
+    for i in prange(n_q):
+        b1, b2, j1 = 1e30, 1e30, -1
+        for j in range(n_t):
+            s = 0.0
+            for k in range(dim):
+                d = desc_q[i, k] - desc_t[j, k]
+                s += d * d
+            if s < b1:
+                b2, b1, j1 = b1, s, j
+            elif s < b2:
+                b2 = s
+        best_idx[i], best[i], second[i] = j1, b1, b2
+    return best_idx, np.sqrt(best), np.sqrt(second)
+
+def _sift_ratio_matches(des1: np.ndarray, des2: np.ndarray, ratio: float = 0.75, use_flann: bool = False) -> tuple[list, int]:
+    """
+    Pencocokan kNN (k=2) des1 -> des2 + uji rasio Lowe; mengembalikan (good_matches, total_matches).
+    Arah query selalu sama (setiap deskriptor des1 mencari tetangga di des2), baik lewat
+    pencarian eksak (kernel ber-JIT, atau BFMatcher bila Numba tidak ada) maupun indeks FLANN
+    (KD-tree, 5 pohon) yang dibangun atas des2.
+    """
+    des1 = np.ascontiguousarray(des1, dtype=np.float32)
+    des2 = np.ascontiguousarray(des2, dtype=np.float32)
+    if use_flann:
+        index = cv2.flann_Index(des2, dict(algorithm=1, trees=5))
+        idx, dists = index.knnSearch(des1, 2, params=dict(checks=50))
+        best_idx, best, second = idx[:, 0], np.sqrt(dists[:, 0]), np.sqrt(dists[:, 1])  # FLANN: L2 kuadrat
+    elif not NUMBA_AVAILABLE:
+        good = [m for m, n in cv2.BFMatcher(cv2.NORM_L2).knnMatch(des1, des2, k=2) if m.distance < ratio * n.distance]
+        return good, len(des1)
+    else:
+        best_idx, best, second = _sift_l2_knn2(des1, des2)
+    good = np.flatnonzero(best < ratio * second)
+    return [cv2.DMatch(int(i), int(best_idx[i]), float(best[i])) for i in good], len(des1)
+
+# Pool thread untuk deteksi SIFT per ubin; detectAndCompute melepas GIL
+_SIFT_TILE_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+# Radius dukungan deskriptor SIFT relatif terhadap KeyPoint.size (jendela deskriptor 4x4 sel
+# ~5.3 x size, ditambah margin untuk blur Gaussian di tepi ubin)
+_SIFT_SUPPORT_FACTOR = 6.0
+
+def _tiled_sift(img: np.ndarray, sift_factory, rows: int = 2, cols: int = 4, max_seam_kp_size: float = 32.0, min_width: int = 1280) -> tuple:
+    """
+    SIFT paralel per ubin (rows x cols, dengan tumpang tindih) untuk frame besar.
+    Tumpang tindih diturunkan dari ukuran keypoint terbesar yang dijamin utuh di sambungan
+    (max_seam_kp_size). Keypoint digeser ke koordinat frame dan hanya disimpan oleh ubin yang
+    memiliki area intinya; keypoint yang area dukungan deskriptornya melewati tepi ubin
+    ber-padding (bukan tepi frame) dibuang agar tidak ada deskriptor terpotong.
+    `sift_factory` membuat detektor dengan parameter pemanggil; setiap ubin memakai instance sendiri.
+    """
+    h, w = img.shape[:2]
+    if w < min_width:
+        return sift_factory().detectAndCompute(img, None)
+
+    overlap = int(np.ceil(_SIFT_SUPPORT_FACTOR * max_seam_kp_size))
+    xs = np.linspace(0, w, cols + 1).astype(int)
+    ys = np.linspace(0, h, rows + 1).astype(int)
+    tiles = [(xs[c], ys[r], xs[c + 1], ys[r + 1]) for r in range(rows) for c in range(cols)]
+
+    def detect(tile):
+        x0, y0, x1, y1 = tile
+        ox0, oy0 = max(0, x0 - overlap), max(0, y0 - overlap)
+        ox1, oy1 = min(w, x1 + overlap), min(h, y1 + overlap)
+        # Batas aman dukungan; sisi yang berimpit dengan tepi frame tidak dibatasi (sama seperti SIFT utuh)
+        lim_x0 = ox0 if ox0 > 0 else -np.inf
+        lim_y0 = oy0 if oy0 > 0 else -np.inf
+        lim_x1 = ox1 if ox1 < w else np.inf
+        lim_y1 = oy1 if oy1 < h else np.inf
+        kps, des = sift_factory().detectAndCompute(img[oy0:oy1, ox0:ox1], None)
+        kept_kp, kept_rows = [], []
+        for i, kp in enumerate(kps):
+            x, y = kp.pt[0] + ox0, kp.pt[1] + oy0
+            if not (x0 <= x < x1 and y0 <= y < y1):
+                continue
+            r = _SIFT_SUPPORT_FACTOR * kp.size
+            if x - r < lim_x0 or x + r > lim_x1 or y - r < lim_y0 or y + r > lim_y1:
+                continue
+            kept_kp.append(cv2.KeyPoint(x, y, kp.size, kp.angle, kp.response, kp.octave, kp.class_id))
+            kept_rows.append(i)
+        return kept_kp, (des[kept_rows] if des is not None and kept_rows else None)
+
+    with opencv_single_thread():
+        results = list(_SIFT_TILE_EXECUTOR.map(detect, tiles))
+    keypoints = [kp for kps, _ in results for kp in kps]
+    descriptors = [des for _, des in results if des is not None]
+    return keypoints, (np.vstack(descriptors) if descriptors else None)
+
+def _sift_features(img_path: Path, sift_factory, feature_cache: dict | None = None) -> tuple:
+    """(gambar grayscale, keypoints, descriptors) untuk satu frame; di-cache per path bila cache diberikan."""
+    key = str(img_path)
+    if feature_cache is not None and key in feature_cache:
+        return feature_cache[key]
+    img = cv2.imread(key, cv2.IMREAD_GRAYSCALE)
+    kp, des = _tiled_sift(img, sift_factory) if img is not None else ((), None)
+    if feature_cache is not None:
+        feature_cache[key] = (img, kp, des)
+    return img, kp, des
+
+def compare_sift_enhanced(img_path1: Path, img_path2: Path, out_dir: Path, feature_cache: dict | None = None) -> dict:
     """
     SIFT comparison yang ditingkatkan dengan analisis geometri dan visualisasi detail.
+    `feature_cache` (opsional) hanya menyimpan fitur frame sumber (img_path1), yang
+    dibandingkan berulang kali; fitur kandidat selalu dihitung tanpa cache.
     """
     try:
-        img1 = cv2.imread(str(img_path1), cv2.IMREAD_GRAYSCALE)
-        img2 = cv2.imread(str(img_path2), cv2.IMREAD_GRAYSCALE)
+        # Create SIFT detector (factory: ubin paralel masing-masing membuat instance sendiri)
+        sift_factory = cv2.SIFT_create
+        img1, kp1, des1 = _sift_features(img_path1, sift_factory, feature_cache)
+        img2, kp2, des2 = _sift_features(img_path2, sift_factory)
         if img1 is None or img2 is None:
             return {'success': False, 'error': 'Failed to load images'}
 
-        # Create SIFT detector
-        sift = cv2.SIFT_create()
-        kp1, des1 = sift.detectAndCompute(img1, None)
-        kp2, des2 = sift.detectAndCompute(img2, None)
-
         if des1 is None or des2 is None or len(kp1) < 2 or len(kp2) < 2:
             return {'success': False, 'error': 'Insufficient keypoints'}
 
-        # Match features
-        bf = cv2.BFMatcher()
-        matches = bf.knnMatch(des1, des2, k=2)
-
-        if not matches or any(len(m) < 2 for m in matches):
-            return {'success': False, 'error': 'No valid matches'}
-
-        # Apply ratio test
-        good_matches = []
-        for m, n in matches:
-            if m.distance < 0.75 * n.distance:
-                good_matches.append(m)
+        # Match features + ratio test: pencarian eksak untuk set kecil, FLANN untuk set besar
+        use_flann = len(des1) * len(des2) >= CONFIG["SIFT_FLANN_MIN_PAIRS"]
+        good_matches, total_matches = _sift_ratio_matches(des1, des2, use_flann=use_flann)
 
         result = {
             'success': True,
             'total_keypoints_img1': len(kp1),
             'total_keypoints_img2': len(kp2),
-            'total_matches': len(matches),
+            'total_matches': total_matches,
             'good_matches': len(good_matches),
             'match_quality': 'excellent' if len(good_matches) > 100 else 'good' if len(good_matches) > 50 else 'fair' if len(good_matches) > 20 else 'poor'
         }
@@ -478,22 +703,40 @@ def calculate_frame_metrics(frame_path: str) -> dict:
         log(f"  {Icons.ERROR} Error calculating frame metrics: {e}")
         return {}
 
+def _calculate_frame_metrics_worker(frame_path: str) -> dict:
+    """Versi calculate_frame_metrics untuk worker paralel: OpenCV dibatasi satu thread per proses."""
+    cv2.setNumThreads(1)
+    return calculate_frame_metrics(frame_path)
+
 def calculate_sha256(file_path: Path) -> str:
-    sha256_hash = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+: pembacaan & hashing di lapisan C
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()  # mmap tidak bisa memetakan file kosong
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.sha256(memoryview(mm)).hexdigest()
 
 def ffprobe_metadata(video_path: Path) -> dict:
-    cmd = ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_format", "-show_streams", str(video_path)]
+    # '-v error' (bukan 'quiet') agar pesan kegagalan ffprobe tetap tersedia di stderr
+    cmd = ["ffprobe", "-v", "error", "-print_format", "json", "-show_format", "-show_streams", str(video_path)]
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, check=True, encoding='utf-8')
         return json.loads(result.stdout)
+    except subprocess.CalledProcessError as e:
+        log(f"FFprobe error: {(e.stderr or '').strip() or e}")
+        return {}
     except Exception as e:
         log(f"FFprobe error: {e}")
         return {}
 
+def _parse_frame_rate(rate: str) -> float:
+    """Mengurai rasio frame rate ffprobe (mis. '30000/1001') tanpa eval."""
+    try:
+        return float(Fraction(rate))
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
 # --- FUNGSI BARU: PARSE METADATA DETAIL ---
 def parse_ffprobe_output(metadata: dict) -> dict:
     """Mengurai output JSON ffprobe menjadi format yang lebih mudah dibaca."""
@@ -518,7 +761,7 @@ def parse_ffprobe_output(metadata: dict) -> dict:
             'Resolution': f"{stream.get('width')}x{stream.get('height')}",
             'Aspect Ratio': stream.get('display_aspect_ratio', 'N/A'),
             'Pixel Format': stream.get('pix_fmt', 'N/A'),
-            'Frame Rate': f"{eval(stream.get('r_frame_rate', '0/1')):.2f} FPS",
+            'Frame Rate': f"{_parse_frame_rate(stream.get('r_frame_rate', '0/1')):.2f} FPS",
             'Bitrate': f"{int(stream.get('bit_rate', 0)) / 1000:.0f} kb/s" if 'bit_rate' in stream else 'N/A',
             'Encoder': stream.get('tags', {}).get('encoder', 'N/A'),
         }
@@ -526,6 +769,113 @@ def parse_ffprobe_output(metadata: dict) -> dict:
     return parsed
 
 # --- FUNGSI DIREVISI: EKSTRAKSI FRAME DENGAN NORMALISASI WARNA ---
+def _report_thumb_path(path: str | Path) -> Path:
+    """Path thumbnail laporan untuk sebuah artefak gambar (di direktori yang sama)."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}_thumb.jpg")
+
+def write_report_thumbnail(img: np.ndarray, out_path: Path, width: int) -> Path | None:
+    """Menyimpan salinan kecil (lebar tetap, rasio dipertahankan) untuk disematkan ke laporan."""
+    h, w = img.shape[:2]
+    if w <= 0 or h <= 0:
+        return None
+    thumb_h = max(1, round(h * width / w))
+    thumb = cv2.resize(img, (width, thumb_h), interpolation=cv2.INTER_AREA)
+    return out_path if cv2.imwrite(str(out_path), thumb, [cv2.IMWRITE_JPEG_QUALITY, 85]) else None
+
+def _cached_thumb(path: str | Path, w: int, h: int, cache_dir: Path) -> str:
+    """Salinan JPEG yang sudah diperkecil untuk slot gambar w x h di laporan (di-cache di disk)."""
+    path = Path(path)
+    try:
+        stat = path.stat()
+        key = hashlib.md5(f"{path.resolve()}|{stat.st_mtime_ns}|{w}x{h}".encode()).hexdigest()
+        cache_path = cache_dir / f"{key}.jpg"
+        if not cache_path.exists():
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            with Image.open(path) as img:
+                img.thumbnail((w * 2, h * 2), Image.LANCZOS)  # 2x agar tetap tajam saat dicetak
+                img.convert('RGB').save(cache_path, 'JPEG', quality=85, optimize=True)
+        return str(cache_path)
+    except Exception as e:
+        log(f"  ⚠️ Gagal membuat thumbnail untuk {path.name}, memakai gambar asli: {e}")
+        return str(path)
+
+def _ffmpeg_sampled_frames(video_path: Path, fps: int):
+    """
+    Generator frame BGR yang di-decode dan disampling oleh ffmpeg; None jika ffmpeg/ffprobe tidak tersedia.
+    Seleksi memakai akumulator waktu yang sama dengan jalur OpenCV (frame ke-n diambil saat
+    t >= n/fps), sehingga frame tidak pernah diduplikasi walau fps diminta > fps sumber.
+    """
+    if shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None:
+        return None
+    try:
+        probe = subprocess.run(["ffprobe", "-v", "error", "-select_streams", "v:0",
+                                "-show_entries", "stream=width,height:stream_tags=rotate:stream_side_data=rotation",
+                                "-of", "json", str(video_path)], capture_output=True, text=True, timeout=60)
+    except subprocess.TimeoutExpired:
+        return None
+    if probe.returncode != 0:
+        return None
+    try:
+        stream = json.loads(probe.stdout)["streams"][0]
+        width, height = int(stream["width"]), int(stream["height"])
+        rotations = [stream.get("tags", {}).get("rotate", 0)]
+        rotations += [sd.get("rotation", 0) for sd in stream.get("side_data_list", [])]
+        rotation = next((int(float(r)) for r in rotations if int(float(r)) != 0), 0)
+    except (ValueError, KeyError, IndexError, TypeError):
+        return None
+    # ffmpeg memutar frame sesuai metadata (seperti cv2.VideoCapture), sehingga dimensi ditukar untuk 90/270 derajat
+    if abs(rotation) % 180 == 90:
+        width, height = height, width
+
+    cmd = ["ffmpeg", "-v", "error", "-hwaccel", "auto", "-i", str(video_path),
+           "-vf", f"select='gte(t-start_t,selected_n/{fps})'", "-fps_mode", "passthrough",
+           "-f", "rawvideo", "-pix_fmt", "bgr24", "-threads", "0", "pipe:1"]
+
+    def frames():
+        frame_size = width * height * 3
+        # stderr ditulis ke file sementara agar ffmpeg tidak terblokir saat pipe stderr penuh
+        with tempfile.TemporaryFile() as err:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err)
+            try:
+                while len(buf := proc.stdout.read(frame_size)) == frame_size:
+                    yield np.frombuffer(buf, dtype=np.uint8).reshape(height, width, 3)
+            finally:
+                proc.stdout.close()
+                proc.wait()
+            if proc.returncode:
+                err.seek(0)
+                stderr = err.read().decode(errors='replace').strip()
+                raise RuntimeError(stderr or f"ffmpeg exit {proc.returncode}")
+
+    return frames()
+
+def _write_frame_artifacts(frame: np.ndarray, index: int, original_dir: Path, normalized_dir: Path, comparison_dir: Path) -> tuple[str, str, str]:
+    """Menyimpan frame original, ternormalisasi, dan perbandingannya dari piksel hasil decode yang sama."""
+    original_path = original_dir / f"frame_{index:06d}_orig.jpg"
+    cv2.imwrite(str(original_path), frame)
+
+    # Normalisasi: Histogram Equalization pada channel Y dari YCrCb
+    ycrcb_img = cv2.cvtColor(frame, cv2.COLOR_BGR2YCrCb)
+    ycrcb_img[:, :, 0] = cv2.equalizeHist(ycrcb_img[:, :, 0])
+    normalized_frame = cv2.cvtColor(ycrcb_img, cv2.COLOR_YCrCb2BGR)
+    normalized_path = normalized_dir / f"frame_{index:06d}_norm.jpg"
+    cv2.imwrite(str(normalized_path), normalized_frame)
+
+    # Gambar perbandingan
+    h, w, _ = frame.shape
+    comparison_img = np.zeros((h, w * 2 + 10, 3), dtype=np.uint8)
+    comparison_img[:, :w] = frame
+    comparison_img[:, w+10:] = normalized_frame
+    cv2.putText(comparison_img, 'Original', (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
+    cv2.putText(comparison_img, 'Normalized', (w + 20, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
+    comparison_path = comparison_dir / f"frame_{index:06d}_comp.jpg"
+    cv2.imwrite(str(comparison_path), comparison_img)
+    if index == 0:
+        # Laporan hanya menyematkan perbandingan frame pertama (lebar 380pt, thumbnail 2x)
+        write_report_thumbnail(comparison_img, _report_thumb_path(comparison_path), 760)
+    return str(original_path), str(normalized_path), str(comparison_path)
+
 def extract_frames_with_normalization(video_path: Path, out_dir: Path, fps: int) -> list[tuple[str, str, str]] | None:
     """Mengekstrak frame, menormalisasi, dan membuat gambar perbandingan."""
     original_dir = out_dir / "frames_original"
@@ -536,6 +886,20 @@ def extract_frames_with_normalization(video_path: Path, out_dir: Path, fps: int)
     comparison_dir.mkdir(parents=True, exist_ok=True)
 
     try:
+        # Jalur utama: ffmpeg men-decode dan menyeleksi frame, sehingga Python hanya
+        # menerima piksel frame yang terpilih (bukan setiap frame video)
+        sampled = _ffmpeg_sampled_frames(video_path, fps)
+        if sampled is not None:
+            try:
+                frame_paths = [_write_frame_artifacts(frame, index, original_dir, normalized_dir, comparison_dir)
+                               for index, frame in enumerate(tqdm(sampled, desc="    Ekstraksi & Normalisasi", leave=False))]
+                if frame_paths:
+                    return frame_paths
+                log(f"  ⚠️ ffmpeg tidak menghasilkan frame, beralih ke OpenCV.")
+            except (OSError, RuntimeError) as e:
+                log(f"  ⚠️ Ekstraksi ffmpeg gagal ({e}), beralih ke OpenCV.")
+
+        # Cadangan tanpa ffmpeg: decode dan sampling dengan OpenCV
         cap = cv2.VideoCapture(str(video_path))
         if not cap.isOpened():
             log(f"  {Icons.ERROR} Gagal membuka file video: {video_path}")
@@ -581,28 +945,8 @@ def extract_frames_with_normalization(video_path: Path, out_dir: Path, fps: int)
             # ======= [END BUGFIX] ==========
 
             if should_extract:
-                # 1. Simpan frame original
-                original_path = original_dir / f"frame_{extracted_count:06d}_orig.jpg"
-                cv2.imwrite(str(original_path), frame)
-
-                # 2. Lakukan normalisasi (Histogram Equalization pada channel Y dari YCrCb)
-                ycrcb_img = cv2.cvtColor(frame, cv2.COLOR_BGR2YCrCb)
-                ycrcb_img[:, :, 0] = cv2.equalizeHist(ycrcb_img[:, :, 0])
-                normalized_frame = cv2.cvtColor(ycrcb_img, cv2.COLOR_YCrCb2BGR)
-                normalized_path = normalized_dir / f"frame_{extracted_count:06d}_norm.jpg"
-                cv2.imwrite(str(normalized_path), normalized_frame)
-
-                # 3. Buat gambar perbandingan
-                h, w, _ = frame.shape
-                comparison_img = np.zeros((h, w * 2 + 10, 3), dtype=np.uint8)
-                comparison_img[:, :w] = frame
-                comparison_img[:, w+10:] = normalized_frame
-                cv2.putText(comparison_img, 'Original', (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
-                cv2.putText(comparison_img, 'Normalized', (w + 20, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
-                comparison_path = comparison_dir / f"frame_{extracted_count:06d}_comp.jpg"
-                cv2.imwrite(str(comparison_path), comparison_img)
-
-                frame_paths.append((str(original_path), str(normalized_path), str(comparison_path)))
+                # Simpan frame original, versi ternormalisasi, dan gambar perbandingan
+                frame_paths.append(_write_frame_artifacts(frame, extracted_count, original_dir, normalized_dir, comparison_dir))
                 extracted_count += 1
 
                 # ======= [BUGFIX FPS-30] =======
@@ -725,7 +1069,8 @@ def create_enhanced_localization_map(result: AnalysisResult, out_dir: Path) -> P
     fig = plt.figure(figsize=(20, 12))
 
     # Create grid layout
-    gs = fig.add_gridspec(4, 3, height_ratios=[1, 2, 1, 1], hspace=0.3, wspace=0.2)
+    gs = fig.add_gridspec(4, 3, height_ratios=[1, 2, 1, 1], hspace=0.3, wspace=0.2,
+                          left=0.04, right=0.98, top=0.97, bottom=0.05)
 
     # Title and header
     ax_title = fig.add_subplot(gs[0, :])
@@ -861,7 +1206,7 @@ Distribusi Kepercayaan:
 
     # Save the enhanced map
     enhanced_map_path = out_dir / f"enhanced_localization_map_{Path(result.video_path).stem}.png"
-    plt.savefig(enhanced_map_path, dpi=150, bbox_inches='tight', facecolor='white')
+    plt.savefig(enhanced_map_path, dpi=150, facecolor='white')
     plt.close()
 
     return enhanced_map_path
@@ -2009,7 +2354,9 @@ def run_tahap_1_pra_pemrosesan(video_path: Path, out_dir: Path, fps: int) -> Ana
                 img_path_original=p_orig,
                 img_path=p_norm, # img_path utama menunjuk ke versi ternormalisasi
                 img_path_comparison=p_comp,
-                hash=frame_hash
+                img_path_comparison_thumb=(str(_report_thumb_path(p_comp)) if idx == 0 and _report_thumb_path(p_comp).exists() else None),
+                hash=frame_hash,
+                hash_u64=int(frame_hash, 16)
             ))
         except Exception as e:
             log(f"  {Icons.ERROR} Gagal memproses frame set {idx}: {e}")
@@ -2090,12 +2437,16 @@ def run_tahap_1_pra_pemrosesan(video_path: Path, out_dir: Path, fps: int) -> Ana
 
                 montage_path = kmeans_dir / f"cluster_{i}_samples.jpg"
                 montage_img.save(montage_path)
+                # Thumbnail untuk laporan (lebar 230pt, thumbnail 2x)
+                montage_thumb_path = write_report_thumbnail(
+                    cv2.cvtColor(np.asarray(montage_img), cv2.COLOR_RGB2BGR), _report_thumb_path(montage_path), 460)
 
                 kmeans_artifacts['clusters'].append({
                     'id': i,
                     'count': len(cluster_indices),
                     'palette_path': str(palette_path),
-                    'samples_montage_path': str(montage_path)
+                    'samples_montage_path': str(montage_path),
+                    'samples_montage_thumb_path': str(montage_thumb_path) if montage_thumb_path else None
                 })
             log(f"  -> Artefak K-Means berhasil dibuat di direktori {kmeans_dir.name}")
 
@@ -2116,15 +2467,17 @@ def run_tahap_2_analisis_temporal(result: AnalysisResult, baseline_result: Analy
                        "Menganalisis aliran optik, SSIM, dan perbandingan dengan baseline jika ada.")
     frames = result.frames
     prev_gray = None
+    prev_gray_f32 = None
 
     log(f"  {Icons.EXAMINATION} Menghitung Aliran Optik & SSIM antar frame (menggunakan frame ternormalisasi)...")
     for f_idx, f in enumerate(tqdm(frames, desc="    Temporal", leave=False, bar_format='{l_bar}{bar}{r_bar}')):
         current_gray = cv2.imread(f.img_path, cv2.IMREAD_GRAYSCALE) # f.img_path adalah frame ternormalisasi
+        current_gray_f32 = current_gray.astype(np.float32) if current_gray is not None else None
         if current_gray is not None:
             if prev_gray is not None and prev_gray.shape == current_gray.shape:
                 data_range = float(current_gray.max() - current_gray.min())
                 if data_range > 0:
-                    ssim_score = ssim(prev_gray, current_gray, data_range=data_range)
+                    ssim_score = ssim(prev_gray_f32, current_gray_f32, **SSIM_FAST_KWARGS, data_range=data_range)
                     f.ssim_to_prev = float(ssim_score)
                 else:
                     f.ssim_to_prev = 1.0 # Frames are identical if data_range is 0
@@ -2144,6 +2497,7 @@ def run_tahap_2_analisis_temporal(result: AnalysisResult, baseline_result: Analy
                 f.optical_flow_mag = 0.0
 
         prev_gray = current_gray
+        prev_gray_f32 = current_gray_f32
 
     if baseline_result:
         log(f"  {Icons.ANALYSIS} Melakukan analisis komparatif terhadap video baseline...")
@@ -2152,6 +2506,7 @@ def run_tahap_2_analisis_temporal(result: AnalysisResult, baseline_result: Analy
         for f_sus in frames:
             if f_sus.hash and f_sus.hash not in base_hashes:
                 f_sus.type = "anomaly_insertion"
+                f_sus._type_code = FRAME_TYPE_CODES["anomaly_insertion"]
                 f_sus.evidence_obj.reasons.append("Frame tidak ada di baseline")
                 f_sus.evidence_obj.confidence = "SANGAT TINGGI"
                 insertion_count += 1
@@ -2181,8 +2536,16 @@ def run_tahap_3_sintesis_bukti(result: AnalysisResult, out_dir: Path):
 
     # Kalkulasi metrik tambahan untuk setiap frame
     log(f"  {Icons.EXAMINATION} Menghitung metrik detail untuk setiap frame...")
-    for f in tqdm(frames, desc="    Metrik Frame", leave=False):
-        metrics = calculate_frame_metrics(f.img_path_original)
+    # Metrik per frame hanya bergantung pada path gambar, sehingga dapat dihitung paralel antar proses
+    with opencv_single_thread():
+        # Hasil dialirkan sebagai generator agar progress bar maju saat frame selesai, bukan saat dikirim
+        frame_metrics = list(tqdm(
+            Parallel(n_jobs=-1, backend='loky', batch_size=32, return_as="generator")(
+                delayed(_calculate_frame_metrics_worker)(f.img_path_original) for f in frames
+            ),
+            total=len(frames), desc="    Metrik Frame", leave=False,
+        ))
+    for f, metrics in zip(frames, frame_metrics):
         f.edge_density = metrics.get('edge_density')
         f.blur_metric = metrics.get('blur_metric')
         f.evidence_obj.detailed_analysis['frame_metrics'] = metrics
@@ -2192,16 +2555,16 @@ def run_tahap_3_sintesis_bukti(result: AnalysisResult, out_dir: Path):
 
     if flow_mags:
         # Gunakan metode statistik yang lebih robust
-        filtered_flow_mags = [m for m in flow_mags if m > 0.0]
+        flow_arr = np.asarray(flow_mags, dtype=np.float64)
+        filtered_flow_mags = flow_arr[flow_arr > 0.0]
         if len(filtered_flow_mags) > 1:
             median_flow = np.median(filtered_flow_mags)
             mad_flow = stats.median_abs_deviation(filtered_flow_mags)
             mad_flow = 1e-9 if mad_flow == 0 else mad_flow
+            result._flow_z_threshold_upper = float((CONFIG["OPTICAL_FLOW_Z_THRESH"] / 0.6745) * mad_flow + median_flow)
 
-            # Hitung persentil untuk context
-            p25 = np.percentile(filtered_flow_mags, 25)
-            p75 = np.percentile(filtered_flow_mags, 75)
-            p95 = np.percentile(filtered_flow_mags, 95)
+            # Hitung persentil untuk context (satu kali partisi)
+            p25, p75, p95 = np.quantile(filtered_flow_mags, [0.25, 0.75, 0.95])
 
             log(f"  📊 Statistik Aliran Optik:")
             log(f"     - Median: {median_flow:.3f}")
@@ -2214,23 +2577,24 @@ def run_tahap_3_sintesis_bukti(result: AnalysisResult, out_dir: Path):
                         z_score = 0.6745 * (f.optical_flow_mag - median_flow) / mad_flow
                         if abs(z_score) > CONFIG["OPTICAL_FLOW_Z_THRESH"]:
                             f.evidence_obj.reasons.append("Lonjakan Aliran Optik")
+                            f.evidence_obj._reason_flags |= REASON_FLAG_OPTICAL_FLOW
                             f.evidence_obj.metrics["optical_flow_z_score"] = round(z_score, 2)
 
                             # Tambahkan penjelasan detail
-                            explanation = {
-                                "type": "optical_flow_spike",
-                                "frame_index": f.index,
-                                "timestamp": f.timestamp,
-                                "severity": "high" if abs(z_score) > 6 else "medium",
-                                "technical_explanation": (
+                            explanation = AnomalyExplanation(
+                                type="optical_flow_spike",
+                                frame_index=f.index,
+                                timestamp=f.timestamp,
+                                severity="high" if abs(z_score) > 6 else "medium",
+                                technical_explanation=(
                                     f"Frame ini menunjukkan pergerakan piksel yang {abs(z_score):.1f}x "
                                     "lebih besar dari normal."
                                 ),
-                                "simple_explanation": (
+                                simple_explanation=(
                                     "Terjadi perubahan gambar yang sangat mendadak, "
                                     "seperti perpindahan kamera yang kasar atau cut yang tidak halus."
                                 ),
-                                "metrics": {
+                                metrics={
                                     "flow_magnitude": f.optical_flow_mag,
                                     "z_score": z_score,
                                     "median_flow": median_flow,
@@ -2240,7 +2604,7 @@ def run_tahap_3_sintesis_bukti(result: AnalysisResult, out_dir: Path):
                                     if median_flow > 0
                                     else 0,
                                 },
-                            }
+                            )
                             f.evidence_obj.explanations['optical_flow'] = explanation
                             result.detailed_anomaly_analysis['temporal_discontinuities'].append(explanation)
 
@@ -2263,43 +2627,45 @@ def run_tahap_3_sintesis_bukti(result: AnalysisResult, out_dir: Path):
             # Deteksi penurunan drastis
             if ssim_drop > CONFIG["SSIM_DISCONTINUITY_DROP"]:
                 f_curr.evidence_obj.reasons.append("Penurunan Drastis SSIM")
+                f_curr.evidence_obj._reason_flags |= REASON_FLAG_SSIM
                 f_curr.evidence_obj.metrics["ssim_drop"] = round(ssim_drop, 4)
 
-                explanation = {
-                    'type': 'ssim_drop',
-                    'frame_index': f_curr.index,
-                    'timestamp': f_curr.timestamp,
-                    'severity': 'high' if ssim_drop > 0.5 else 'medium',
-                    'technical_explanation': f"SSIM turun {ssim_drop:.3f} dari frame sebelumnya ({f_prev.ssim_to_prev:.3f} → {f_curr.ssim_to_prev:.3f}).",
-                    'simple_explanation': "Frame ini sangat berbeda dari frame sebelumnya, mungkin ada potongan atau sisipan.",
-                    'metrics': {
+                explanation = AnomalyExplanation(
+                    type='ssim_drop',
+                    frame_index=f_curr.index,
+                    timestamp=f_curr.timestamp,
+                    severity='high' if ssim_drop > 0.5 else 'medium',
+                    technical_explanation=f"SSIM turun {ssim_drop:.3f} dari frame sebelumnya ({f_prev.ssim_to_prev:.3f} → {f_curr.ssim_to_prev:.3f}).",
+                    simple_explanation="Frame ini sangat berbeda dari frame sebelumnya, mungkin ada potongan atau sisipan.",
+                    metrics={
                         'ssim_current': f_curr.ssim_to_prev,
                         'ssim_previous': f_prev.ssim_to_prev,
                         'drop_amount': ssim_drop,
                         'drop_percentage': (ssim_drop / f_prev.ssim_to_prev * 100) if f_prev.ssim_to_prev > 0 else 0
                     }
-                }
+                )
                 f_curr.evidence_obj.explanations['ssim_drop'] = explanation
                 result.detailed_anomaly_analysis['temporal_discontinuities'].append(explanation)
 
             # Deteksi nilai SSIM sangat rendah
             elif f_curr.ssim_to_prev < 0.7:
                 f_curr.evidence_obj.reasons.append("SSIM Sangat Rendah")
+                f_curr.evidence_obj._reason_flags |= REASON_FLAG_SSIM
                 f_curr.evidence_obj.metrics["ssim_absolute_low"] = round(f_curr.ssim_to_prev, 4)
 
-                explanation = {
-                    'type': 'ssim_low',
-                    'frame_index': f_curr.index,
-                    'timestamp': f_curr.timestamp,
-                    'severity': 'medium',
-                    'technical_explanation': f"SSIM sangat rendah ({f_curr.ssim_to_prev:.3f}), menunjukkan perbedaan struktural yang signifikan.",
-                    'simple_explanation': "Frame ini memiliki struktur visual yang sangat berbeda dari frame sebelumnya.",
-                    'metrics': {
+                explanation = AnomalyExplanation(
+                    type='ssim_low',
+                    frame_index=f_curr.index,
+                    timestamp=f_curr.timestamp,
+                    severity='medium',
+                    technical_explanation=f"SSIM sangat rendah ({f_curr.ssim_to_prev:.3f}), menunjukkan perbedaan struktural yang signifikan.",
+                    simple_explanation="Frame ini memiliki struktur visual yang sangat berbeda dari frame sebelumnya.",
+                    metrics={
                         'ssim_value': f_curr.ssim_to_prev,
                         'threshold': 0.7,
                         'below_threshold_by': 0.7 - f_curr.ssim_to_prev
                     }
-                }
+                )
                 f_curr.evidence_obj.explanations['ssim_low'] = explanation
 
     # Analisis perubahan klaster warna dengan konteks
@@ -2350,17 +2716,21 @@ def run_tahap_3_sintesis_bukti(result: AnalysisResult, out_dir: Path):
     log(f"  📖 Penjelasan: SIFT mendeteksi titik-titik unik dalam gambar. Jika dua frame memiliki")
     log(f"     banyak titik yang cocok sempurna, kemungkinan besar frame tersebut diduplikasi.")
 
-    hash_map = defaultdict(list)
-    for f in frames:
-        if f.hash: hash_map[f.hash].append(f.index)
-
-    dup_candidates = {k: v for k, v in hash_map.items() if len(v) > 1}
+    # Bucketing hash secara vektor: np.unique atas hash uint64 menggantikan dict per frame
+    hashed_frames = [f for f in frames if f.hash_u64 is not None]
+    hash_values = np.fromiter((f.hash_u64 for f in hashed_frames), dtype=np.uint64, count=len(hashed_frames))
+    hash_indices = np.fromiter((f.index for f in hashed_frames), dtype=np.int64, count=len(hashed_frames))
+    uniq_hashes, hash_inverse, hash_counts = np.unique(hash_values, return_inverse=True, return_counts=True)
+    dup_candidates = {int(uniq_hashes[i]): hash_indices[hash_inverse == i].tolist()
+                      for i in np.flatnonzero(hash_counts > 1)}
 
     if dup_candidates:
         log(f"  🔍 Ditemukan {len(dup_candidates)} grup kandidat duplikasi untuk diverifikasi...")
 
         # Loop through duplicate candidates
         for hash_val, indices in dup_candidates.items():
+            # Fitur SIFT di-cache per grup: frame sumber (indices[0]) hanya diekstrak sekali
+            sift_feature_cache = {}
             for i in range(1, len(indices)):
                 idx1, idx2 = indices[0], indices[i]
                 p1 = Path(frames[idx1].img_path_original)
@@ -2374,15 +2744,16 @@ def run_tahap_3_sintesis_bukti(result: AnalysisResult, out_dir: Path):
 
                 data_range = float(im1.max() - im1.min())
                 if data_range == 0: continue
-                ssim_val = ssim(im1, im2, data_range=data_range)
+                ssim_val = ssim(im1.astype(np.float32), im2.astype(np.float32), **SSIM_FAST_KWARGS, data_range=data_range)
 
                 if ssim_val > CONFIG["DUPLICATION_SSIM_CONFIRM"]:
                     # Analisis SIFT detail
-                    sift_result = compare_sift_enhanced(p1, p2, out_dir)
+                    sift_result = compare_sift_enhanced(p1, p2, out_dir, feature_cache=sift_feature_cache)
 
                     if sift_result.get('success') and sift_result.get('inliers', 0) >= CONFIG["SIFT_MIN_MATCH_COUNT"]:
                         f_dup = frames[idx2]
                         f_dup.type = "anomaly_duplication"
+                        f_dup._type_code = FRAME_TYPE_CODES["anomaly_duplication"]
                         f_dup.evidence_obj.reasons.append(f"Duplikasi dari frame {idx1}")
                         f_dup.evidence_obj.metrics.update({
                             "source_frame": idx1,
@@ -2425,7 +2796,8 @@ def run_tahap_3_sintesis_bukti(result: AnalysisResult, out_dir: Path):
     detail_viz_dir = out_dir / "detailed_visualizations"
     detail_viz_dir.mkdir(exist_ok=True)
 
-    for f in tqdm(frames, desc="    Analisis ELA & Sintesis", leave=False):
+    ela_targets = []
+    for f in frames:
         # First, ensure reasons is a list
         if isinstance(f.evidence_obj.reasons, str):
             f.evidence_obj.reasons = [r.strip() for r in f.evidence_obj.reasons.split(',')]
@@ -2433,6 +2805,7 @@ def run_tahap_3_sintesis_bukti(result: AnalysisResult, out_dir: Path):
         if f.evidence_obj.reasons:
             if f.type == "original":
                 f.type = "anomaly_discontinuity"
+                f._type_code = FRAME_TYPE_CODES["anomaly_discontinuity"]
 
             # Tentukan tingkat kepercayaan berdasarkan jumlah bukti
             num_reasons = len(f.evidence_obj.reasons)
@@ -2447,7 +2820,15 @@ def run_tahap_3_sintesis_bukti(result: AnalysisResult, out_dir: Path):
 
             # Lakukan ELA untuk anomali dengan kepercayaan sedang ke atas
             if f.evidence_obj.confidence in ["SEDANG", "TINGGI", "SANGAT TINGGI"] and f.type not in ["anomaly_duplication", "anomaly_insertion"]:
-                ela_result = perform_ela(Path(f.img_path_original))
+                ela_targets.append(f)
+
+    # ELA dijalankan per batch frame (satu array kontigu per batch, bukan satu frame per iterasi)
+    ela_batch_size = 8
+    with tqdm(total=len(ela_targets), desc="    Analisis ELA & Sintesis", leave=False) as pbar:
+        for batch_start in range(0, len(ela_targets), ela_batch_size):
+            batch = ela_targets[batch_start:batch_start + ela_batch_size]
+            for f, ela_result in zip(batch, perform_ela_batch([Path(f.img_path_original) for f in batch])):
+                pbar.update(1)
                 if ela_result:
                     ela_path, max_diff, ela_array = ela_result
                     f.evidence_obj.ela_path = str(ela_path)
@@ -2494,10 +2875,17 @@ def run_tahap_3_sintesis_bukti(result: AnalysisResult, out_dir: Path):
                         f.evidence_obj.explanations['ela'] = ela_explanation
                         result.detailed_anomaly_analysis['compression_anomalies'].append(ela_explanation)
 
-    # Konversi reasons list ke string untuk konsistensi
+    # Konversi reasons list ke string dan penjelasan ke dict untuk konsistensi
     for f in frames:
         if isinstance(f.evidence_obj.reasons, list) and f.evidence_obj.reasons:
             f.evidence_obj.reasons = ", ".join(sorted(list(set(f.evidence_obj.reasons))))
+        for exp_key, exp in f.evidence_obj.explanations.items():
+            if isinstance(exp, AnomalyExplanation):
+                f.evidence_obj.explanations[exp_key] = asdict(exp)
+    result.detailed_anomaly_analysis['temporal_discontinuities'] = [
+        asdict(exp) if isinstance(exp, AnomalyExplanation) else exp
+        for exp in result.detailed_anomaly_analysis['temporal_discontinuities']
+    ]
 
     # Analisis statistik keseluruhan
     log(f"\n  {Icons.ANALYSIS} ANALISIS STATISTIK KESELURUHAN...")
@@ -2516,18 +2904,10 @@ def run_tahap_3_sintesis_bukti(result: AnalysisResult, out_dir: Path):
     # Analisis clustering temporal anomali
     temporal_clusters = []
     if temporal_distribution:
-        current_cluster = [temporal_distribution[0]]
-
-        for i in range(1, len(temporal_distribution)):
-            if temporal_distribution[i] - temporal_distribution[i-1] < 2.0:  # Within 2 seconds
-                current_cluster.append(temporal_distribution[i])
-            else:
-                if len(current_cluster) > 1:
-                    temporal_clusters.append(current_cluster)
-                current_cluster = [temporal_distribution[i]]
-
-        if len(current_cluster) > 1:
-            temporal_clusters.append(current_cluster)
+        # Anomali yang berjarak < 2 detik berada dalam kluster yang sama
+        td = np.asarray(temporal_distribution, dtype=np.float64)
+        boundaries = np.flatnonzero(np.diff(td) >= 2.0) + 1
+        temporal_clusters = [g for g in np.split(td, boundaries) if g.size > 1]
 
         log(f"  📊 Distribusi Anomali:")
         for atype, count in anomaly_types.items():
@@ -2570,25 +2950,36 @@ def create_ela_visualization(original_path: Path, ela_array: np.ndarray, regiona
         if original is None:
             return None
 
-        # Convert ELA array to color
-        ela_color = cv2.applyColorMap((ela_array.mean(axis=2) * 5).astype(np.uint8), cv2.COLORMAP_JET)
+        # Convert ELA array to color (jalur uint8 CV_8UC1 agar memakai LUT cepat)
+        if ela_array.dtype == np.uint8:
+            gray = cv2.cvtColor(ela_array, cv2.COLOR_BGR2GRAY) if ela_array.ndim == 3 else ela_array
+        else:
+            gray = cv2.convertScaleAbs(ela_array.mean(axis=2) if ela_array.ndim == 3 else ela_array)
+        ela_color = cv2.applyColorMap(cv2.convertScaleAbs(gray, alpha=5.0), cv2.COLORMAP_JET)
 
         # Create combined visualization
         height, width = original.shape[:2]
-        combined = np.zeros((height, width * 2 + 20, 3), dtype=np.uint8)
-        combined[:, :width] = original
-        combined[:, width+20:] = ela_color
-
-        # Draw suspicious regions
-        for region in regional_analysis['suspicious_regions'][:10]:  # Top 10
-            x, y = region['x'], region['y']
-            w, h = region['width'], region['height']
-            color = (0, 0, 255) if region['suspicion_level'] == 'high' else (0, 255, 255)
-
+        gap = np.zeros((height, 20, 3), dtype=np.uint8)
+        combined = cv2.hconcat([original, gap, ela_color])
+
+        # Draw suspicious regions (Top 10), koordinat disusun sebagai array per kolom
+        regions = regional_analysis['suspicious_regions'][:10]
+        n = len(regions)
+        xs = np.fromiter((r['x'] for r in regions), np.int32, count=n)
+        ys = np.fromiter((r['y'] for r in regions), np.int32, count=n)
+        x2s = xs + np.fromiter((r['width'] for r in regions), np.int32, count=n)
+        y2s = ys + np.fromiter((r['height'] for r in regions), np.int32, count=n)
+        is_high = np.fromiter((r['suspicion_level'] == 'high' for r in regions), bool, count=n)
+        xs_ela, x2s_ela = xs + (width + 20), x2s + (width + 20)
+        region_colors = ((0, 255, 255), (0, 0, 255))
+
+        for i in range(n):
+            color = region_colors[int(is_high[i])]
+            y, y2 = int(ys[i]), int(y2s[i])
             # Draw on original
-            cv2.rectangle(combined, (x, y), (x+w, y+h), color, 2)
+            cv2.rectangle(combined, (int(xs[i]), y), (int(x2s[i]), y2), color, 2)
             # Draw on ELA
-            cv2.rectangle(combined, (width+20+x, y), (width+20+x+w, y+h), color, 2)
+            cv2.rectangle(combined, (int(xs_ela[i]), y), (int(x2s_ela[i]), y2), color, 2)
 
         # Add labels
         font = cv2.FONT_HERSHEY_SIMPLEX
@@ -2609,7 +3000,20 @@ def create_ela_visualization(original_path: Path, ela_array: np.ndarray, regiona
 def create_anomaly_summary_visualization(result: AnalysisResult, out_dir: Path):
     """Membuat visualisasi ringkasan dari semua anomali yang terdeteksi."""
     try:
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
+        anomaly_times = []
+        anomaly_types_list = []
+        for f in result.frames:
+            if f.type.startswith("anomaly"):
+                anomaly_times.append(f.timestamp)
+                anomaly_types_list.append(f.type.replace('anomaly_', ''))
+
+        # Tidak ada yang diringkas: lewati pembuatan figure sepenuhnya
+        if (not result.statistical_summary.get('anomaly_types')
+                and not result.statistical_summary.get('confidence_distribution')
+                and not anomaly_times):
+            return
+
+        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10), constrained_layout=True)
         fig.suptitle('Ringkasan Analisis Forensik Video', fontsize=16, fontweight='bold')
 
         # 1. Pie chart distribusi tipe anomali
@@ -2640,26 +3044,21 @@ def create_anomaly_summary_visualization(result: AnalysisResult, out_dir: Path):
             ax2.set_ylabel('Jumlah Anomali')
 
         # 3. Timeline anomali
-        anomaly_times = []
-        anomaly_types_list = []
-        for f in result.frames:
-            if f.type.startswith("anomaly"):
-                anomaly_times.append(f.timestamp)
-                anomaly_types_list.append(f.type.replace('anomaly_', ''))
-
         if anomaly_times:
-            # Create scatter plot with different colors for each type
+            # Satu scatter untuk semua tipe; warna dipetakan per titik
+            from matplotlib.lines import Line2D
             type_colors = {'discontinuity': 'purple', 'duplication': 'orange', 'insertion': 'red'}
-            for atype in set(anomaly_types_list):
-                times = [t for t, at in zip(anomaly_times, anomaly_types_list) if at == atype]
-                ax3.scatter(times, [1]*len(times), label=atype.title(),
-                           color=type_colors.get(atype, 'gray'), s=100, alpha=0.7)
+            times_arr = np.asarray(anomaly_times, dtype=np.float32)
+            color_arr = [type_colors.get(t, 'gray') for t in anomaly_types_list]
+            ax3.scatter(times_arr, np.ones_like(times_arr), c=color_arr, s=100, alpha=0.7)
+            ax3.legend(handles=[Line2D([0], [0], color=type_colors.get(atype, 'gray'), marker='o',
+                                       linestyle='None', alpha=0.7, label=atype.title())
+                                for atype in sorted(set(anomaly_types_list))])
 
             ax3.set_title('Timeline Anomali')
             ax3.set_xlabel('Waktu (detik)')
             ax3.set_ylim(0.5, 1.5)
             ax3.set_yticks([])
-            ax3.legend()
             ax3.grid(True, axis='x', alpha=0.3)
         else:
             ax3.text(0.5, 0.5, 'Tidak ada timeline anomali', ha='center', va='center')
@@ -2675,83 +3074,254 @@ Kluster Temporal: {result.statistical_summary.get('temporal_clusters', 'N/A')}
 Rata-rata Anomali per Kluster: {result.statistical_summary.get('average_anomalies_per_cluster', 0):.1f}"""
 
         ax4.text(0.1, 0.5, stats_text, fontsize=12, verticalalignment='center',
-                fontfamily='monospace', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
+                fontfamily='DejaVu Sans Mono', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
         ax4.set_xlim(0, 1)
         ax4.set_ylim(0, 1)
         ax4.axis('off')
         ax4.set_title('Statistik Ringkasan')
 
-        plt.tight_layout(rect=[0, 0.03, 1, 0.95])
-        summary_path = out_dir / "anomaly_summary.png"
-        plt.savefig(summary_path, dpi=150, bbox_inches='tight')
+        summary_path = out_dir / "anomaly_summary.jpg"
+        plt.savefig(summary_path, dpi=150, pil_kwargs=PLOT_JPEG_KWARGS)
         plt.close()
 
         result.plots['anomaly_summary'] = str(summary_path)
     except Exception as e:
         log(f"  {Icons.ERROR} Error creating summary visualization: {e}")
 
+# Plot temporal Tahap 4 (independen, masing-masing dengan Figure sendiri)
+def _new_agg_figure(figsize: tuple) -> Figure:
+    """Figure baru dengan canvas Agg sendiri (tanpa state global pyplot)."""
+    fig = Figure(figsize=figsize, constrained_layout=True)
+    FigureCanvasAgg(fig)
+    return fig
+
+def _plot_kmeans_temporal(color_clusters: list, stem: str, out_dir: Path) -> tuple[str, Path] | None:
+    if not color_clusters:
+        return None
+    fig = _new_agg_figure((15, 6))
+    ax = fig.add_subplot(111)
+    ax.plot(range(len(color_clusters)), color_clusters, marker='.', linestyle='-', markersize=4, label='Klaster Warna Frame')
+    cc = np.asarray(color_clusters, dtype=np.int32)
+    jump_frames = (np.flatnonzero(np.diff(cc) != 0) + 1).tolist()
+    if jump_frames:
+        # Satu LineCollection setinggi sumbu, setara axvline per frame
+        ax.vlines(jump_frames, 0, 1, transform=ax.get_xaxis_transform(),
+                  colors='r', linestyles='--', linewidth=1, alpha=0.7,
+                  label='Perubahan Adegan Terdeteksi')
+    ax.set_title('Visualisasi Klasterisasi Warna (Metode K-Means) Sepanjang Waktu')
+    ax.set_xlabel('Indeks Frame')
+    ax.set_ylabel('Nomor Klaster Warna')
+    if len(set(color_clusters)) > 1:
+        ax.set_yticks(range(min(set(color_clusters)), max(set(color_clusters))+1))
+    ax.grid(True, linestyle=':', alpha=0.7)
+    ax.legend(loc='upper right')
+    kmeans_temporal_plot_path = out_dir / f"plot_kmeans_temporal_{stem}.jpg"
+    fig.savefig(kmeans_temporal_plot_path, dpi=100, pil_kwargs=PLOT_JPEG_KWARGS)
+    return 'kmeans_temporal', kmeans_temporal_plot_path
+
+def _plot_ssim_temporal(ssim_values: list, ssim_reason_indices: list, stem: str, out_dir: Path) -> tuple[str, Path] | None:
+    if len(ssim_values) <= 1:
+        return None
+    y_values_ssim = ssim_values[1:]
+    x_indices_ssim = list(range(1, len(y_values_ssim) + 1))
+
+    fig = _new_agg_figure((15, 6))
+    ax = fig.add_subplot(111)
+    ax.plot(x_indices_ssim, y_values_ssim, color='skyblue', marker='.', linestyle='-', markersize=3, alpha=0.7)
+
+    if ssim_reason_indices:
+        ssim_idx = np.asarray(ssim_reason_indices, dtype=np.int64)
+        valid_indices = ssim_idx[(ssim_idx > 0) & (ssim_idx < len(ssim_values))]
+        if valid_indices.size:
+            discontinuity_ssim_y_values = np.asarray(ssim_values)[valid_indices]
+            ax.scatter(valid_indices, discontinuity_ssim_y_values, color='red', marker='X', s=100, zorder=5, label='Diskontinuitas Terdeteksi (SSIM)')
+
+    ax.set_title('Perubahan SSIM Antar Frame Sepanjang Waktu')
+    ax.set_xlabel('Indeks Frame')
+    ax.set_ylabel('Skor SSIM (0-1, Lebih Tinggi Lebih Mirip)')
+    ax.set_ylim(0, 1.05)
+    ax.grid(True, linestyle=':', alpha=0.7)
+    ax.legend(loc='lower left')
+    ssim_temporal_plot_path = out_dir / f"plot_ssim_temporal_{stem}.jpg"
+    fig.savefig(ssim_temporal_plot_path, dpi=100, pil_kwargs=PLOT_JPEG_KWARGS)
+    return 'ssim_temporal', ssim_temporal_plot_path
+
+def _plot_optical_flow_temporal(flow_values: list, flow_reason_indices: list, stem: str, out_dir: Path,
+                                threshold_mag_upper: float | None = None) -> tuple[str, Path] | None:
+    if len(flow_values) <= 1:
+        return None
+    y_values_flow = flow_values[1:]
+    x_indices_flow = list(range(1, len(y_values_flow) + 1))
+
+    fig = _new_agg_figure((15, 6))
+    ax = fig.add_subplot(111)
+    ax.plot(x_indices_flow, y_values_flow, color='salmon', marker='.', linestyle='-', markersize=3, alpha=0.7)
+
+    if flow_reason_indices:
+        flow_idx = np.asarray(flow_reason_indices, dtype=np.int64)
+        valid_indices_flow = flow_idx[(flow_idx > 0) & (flow_idx < len(flow_values))]
+        if valid_indices_flow.size:
+            discontinuity_flow_y_values = np.asarray(flow_values)[valid_indices_flow]
+            ax.scatter(valid_indices_flow, discontinuity_flow_y_values, color='darkgreen', marker='o', s=100, zorder=5, label='Diskontinuitas Terdeteksi (Aliran Optik)')
+
+    if threshold_mag_upper is None:
+        # Fallback bila Tahap 3 tidak menyimpan ambang (mis. hasil lama)
+        flow_values_np = np.asarray(flow_values, dtype=np.float32)
+        flow_mags_for_z = flow_values_np[flow_values_np > 0]
+        if flow_mags_for_z.size > 1:
+            median_flow = np.median(flow_mags_for_z)
+            mad_flow = stats.median_abs_deviation(flow_mags_for_z)
+            mad_flow = 1e-9 if mad_flow == 0 else mad_flow
+            threshold_mag_upper = (CONFIG["OPTICAL_FLOW_Z_THRESH"] / 0.6745) * mad_flow + median_flow
+    if threshold_mag_upper is not None:
+        ax.axhline(y=threshold_mag_upper, color='blue', linestyle='--', linewidth=1, label=f'Ambang Batas Atas Z-score')
+
+    ax.set_title('Perubahan Rata-rata Magnitudo Aliran Optik')
+    ax.set_xlabel('Indeks Frame')
+    ax.set_ylabel('Rata-rata Magnitudo Aliran Optik')
+    ax.grid(True, linestyle=':', alpha=0.7)
+    ax.legend(loc='upper right')
+    optical_flow_temporal_plot_path = out_dir / f"plot_optical_flow_temporal_{stem}.jpg"
+    fig.savefig(optical_flow_temporal_plot_path, dpi=100, pil_kwargs=PLOT_JPEG_KWARGS)
+    return 'optical_flow_temporal', optical_flow_temporal_plot_path
+
+def _plot_metrics_histograms(ssim_values: list, flow_values: list, stem: str, out_dir: Path) -> tuple[str, Path] | None:
+    ssim_to_plot = [s for s in ssim_values[1:] if s is not None]
+    flow_to_plot = [f for f in flow_values[1:] if f is not None]
+    if not ssim_to_plot and not flow_to_plot:
+        return None
+
+    fig = _new_agg_figure((12, 4))
+    ax1, ax2 = fig.subplots(1, 2)
+    if len(ssim_values) > 1:
+        if ssim_to_plot:
+            counts, edges = np.histogram(np.asarray(ssim_to_plot, dtype=np.float32), bins=50)
+            ax1.bar(edges[:-1], counts, width=np.diff(edges), align='edge', color='skyblue', edgecolor='black')
+        ax1.set_title("Distribusi Skor SSIM")
+        ax1.set_xlabel("Skor SSIM")
+        ax1.set_ylabel("Frekuensi")
+    if len(flow_values) > 1:
+        if flow_to_plot:
+            counts, edges = np.histogram(np.asarray(flow_to_plot, dtype=np.float32), bins=50)
+            ax2.bar(edges[:-1], counts, width=np.diff(edges), align='edge', color='salmon', edgecolor='black')
+        ax2.set_title("Distribusi Aliran Optik")
+        ax2.set_xlabel("Rata-rata Pergerakan")
+        ax2.set_ylabel("Frekuensi")
+    metrics_histograms_plot_path = out_dir / f"plot_metrics_histograms_{stem}.jpg"
+    fig.savefig(metrics_histograms_plot_path, dpi=100, pil_kwargs=PLOT_JPEG_KWARGS)
+    return 'metrics_histograms', metrics_histograms_plot_path
+
+def _plot_temporal_anomalies(anomaly_indices: dict, video_path: str, out_dir: Path) -> tuple[str, Path]:
+    from matplotlib.lines import Line2D
+
+    fig = _new_agg_figure((15, 6))
+    ax = fig.add_subplot(111)
+    anomaly_data = {
+        'Duplikasi': {'x': anomaly_indices['anomaly_duplication'], 'color': 'orange', 'marker': 'o', 'level': 1.0},
+        'Penyisipan': {'x': anomaly_indices['anomaly_insertion'], 'color': 'red', 'marker': 'x', 'level': 0.9},
+        'Diskontinuitas': {'x': anomaly_indices['anomaly_discontinuity'], 'color': 'purple', 'marker': '|', 'level': 0.8}
+    }
+
+    for label, data in anomaly_data.items():
+        if data['x']:
+            ax.vlines(data['x'], 0, data['level'], colors=data['color'], lw=1.5, alpha=0.8)
+            ax.scatter(data['x'], np.full_like(data['x'], data['level'], dtype=float),
+                       c=data['color'], marker=data['marker'], s=40, label=label, zorder=5)
+
+    ax.set_ylim(-0.1, 1.2)
+    ax.set_yticks([0, 0.8, 0.9, 1.0])
+    ax.set_yticklabels(['Asli', 'Diskontinuitas', 'Penyisipan', 'Duplikasi'])
+    ax.set_xlabel("Indeks Frame")
+    ax.set_ylabel("Jenis Anomali Terdeteksi")
+    ax.set_title(f"Peta Anomali Temporal untuk {Path(video_path).name}")
+    ax.grid(True, axis='x', linestyle=':', alpha=0.7)
+
+    ax.legend(handles=[Line2D([0], [0], color=d['color'], marker=d['marker'], linestyle='None', label=l)
+                       for l, d in anomaly_data.items() if d['x']], loc='upper right')
+    temporal_plot_path = out_dir / f"plot_temporal_{Path(video_path).stem}.png"
+    fig.savefig(temporal_plot_path, dpi=100)
+    return 'temporal', temporal_plot_path
+
 # --- TAHAP 4: VISUALISASI & PENILAIAN INTEGRITAS (ENHANCED VERSION) ---
 def run_tahap_4_visualisasi_dan_penilaian(result: AnalysisResult, out_dir: Path):
     print_stage_banner(4, "Visualisasi & Penilaian Keandalan Bukti", "📊",
                        "Membuat plot detail, melokalisasi peristiwa, menilai keandalan bukti dengan FERM, dan menilai pipeline.")
 
+    # Satu kali traversal frame untuk semua data plot Tahap 4
+    color_clusters, ssim_values, flow_values = [], [], []
+    for f in result.frames:
+        if f.color_cluster is not None:
+            color_clusters.append(f.color_cluster)
+        if f.ssim_to_prev is not None:
+            ssim_values.append(f.ssim_to_prev)
+        if f.optical_flow_mag is not None:
+            flow_values.append(f.optical_flow_mag)
+
+    # Frame dengan alasan SSIM / Aliran Optik lewat bit flag, bukan pencarian substring
+    n_frames = len(result.frames)
+    frame_idx = np.fromiter((f.index for f in result.frames), dtype=np.int64, count=n_frames)
+    reason_flags = np.fromiter((f.evidence_obj._reason_flags for f in result.frames), dtype=np.int8, count=n_frames)
+    ssim_reason_indices = frame_idx[(reason_flags & REASON_FLAG_SSIM) != 0].tolist()
+    flow_reason_indices = frame_idx[(reason_flags & REASON_FLAG_OPTICAL_FLOW) != 0].tolist()
+
+    # Partisi tipe anomali lewat kode integer
+    types = np.fromiter((f._type_code for f in result.frames), dtype=np.int8, count=n_frames)
+    total_anom = int(np.count_nonzero(types > 0))
+    anomaly_indices = {name: np.flatnonzero(types == code).tolist()
+                       for name, code in FRAME_TYPE_CODES.items() if code > 0}
+
     log(f"  {Icons.ANALYSIS} METODE UTAMA: Melakukan Localization Tampering untuk mengelompokkan anomali...")
     log(f"  📖 Localization Tampering adalah teknik untuk mengelompokkan frame-frame anomali yang berdekatan")
     log(f"     menjadi satu 'peristiwa' yang koheren, memudahkan interpretasi hasil forensik.")
 
-    locs, event = [], None
-    for f in result.frames:
-        is_anomaly = f.type.startswith("anomaly")
-        if is_anomaly:
-            image_to_show = f.img_path_original
-            if event and event["event"] == f.type and f.index == event["end_frame"] + 1:
-                # Extend existing event
-                event["end_frame"] = f.index
-                event["end_ts"] = f.timestamp
-                event["frame_count"] += 1
-                # Update confidence ke yang tertinggi
-                conf_hierarchy = {"SANGAT TINGGI": 4, "TINGGI": 3, "SEDANG": 2, "RENDAH": 1, "N/A": 0}
-                if conf_hierarchy.get(f.evidence_obj.confidence, 0) > conf_hierarchy.get(event["confidence"], 0):
-                    event["confidence"] = f.evidence_obj.confidence
-                # Update explanations
-                if f.evidence_obj.explanations:
-                    event["explanations"].update(f.evidence_obj.explanations)
-                # Collect all metrics
-                event["all_metrics"].append(f.evidence_obj.metrics)
-            else:
-                # Save previous event if exists
-                if event:
-                    locs.append(event)
-                # Start new event
-                event = {
-                    "event": f.type,
-                    "start_frame": f.index,
-                    "end_frame": f.index,
-                    "start_ts": f.timestamp,
-                    "end_ts": f.timestamp,
-                    "frame_count": 1,
-                    "confidence": f.evidence_obj.confidence,
-                    "reasons": str(f.evidence_obj.reasons),
-                    "metrics": f.evidence_obj.metrics,
-                    "all_metrics": [f.evidence_obj.metrics],  # Collect all metrics for statistics
-                    "image": image_to_show,
-                    "ela_path": f.evidence_obj.ela_path,
-                    "sift_path": f.evidence_obj.sift_path,
-                    "explanations": f.evidence_obj.explanations.copy(),
-                    "visualizations": f.evidence_obj.visualizations.copy()
-                }
-        elif event:
-            locs.append(event)
-            event = None
-    if event:
+    # Segmentasi run-length atas (tipe, indeks): run baru dimulai saat tipe berubah
+    # atau indeks frame tidak berurutan. Hanya run anomali yang dijadikan peristiwa.
+    breaks = np.flatnonzero((types[1:] != types[:-1]) | (np.diff(frame_idx) != 1)) + 1
+    run_starts = np.r_[0, breaks] if types.size else np.empty(0, dtype=np.int64)
+    run_ends = np.r_[breaks, types.size] if types.size else np.empty(0, dtype=np.int64)
+
+    conf_hierarchy = {"SANGAT TINGGI": 4, "TINGGI": 3, "SEDANG": 2, "RENDAH": 1, "N/A": 0}
+    locs = []
+    for start, end in zip(run_starts.tolist(), run_ends.tolist()):
+        if types[start] == 0:
+            continue
+        f, last = result.frames[start], result.frames[end - 1]
+        event = {
+            "event": f.type,
+            "start_frame": f.index,
+            "end_frame": last.index,
+            "start_ts": f.timestamp,
+            "end_ts": last.timestamp,
+            "frame_count": end - start,
+            "confidence": f.evidence_obj.confidence,
+            "reasons": str(f.evidence_obj.reasons),
+            "metrics": f.evidence_obj.metrics,
+            "all_metrics": [f.evidence_obj.metrics],  # Collect all metrics for statistics
+            "image": f.img_path_original,
+            "ela_path": f.evidence_obj.ela_path,
+            "sift_path": f.evidence_obj.sift_path,
+            "explanations": f.evidence_obj.explanations.copy(),
+            "visualizations": f.evidence_obj.visualizations.copy()
+        }
+        for f in result.frames[start + 1:end]:
+            # Update confidence ke yang tertinggi
+            if conf_hierarchy.get(f.evidence_obj.confidence, 0) > conf_hierarchy.get(event["confidence"], 0):
+                event["confidence"] = f.evidence_obj.confidence
+            # Update explanations
+            if f.evidence_obj.explanations:
+                event["explanations"].update(f.evidence_obj.explanations)
+            # Collect all metrics
+            event["all_metrics"].append(f.evidence_obj.metrics)
         locs.append(event)
 
     # Enhance localization dengan analisis tambahan
     for loc in locs:
-        # Calculate event duration and severity
         loc['duration'] = loc['end_ts'] - loc['start_ts']
-        loc['severity_score'] = calculate_event_severity(loc)
+    # Severity semua peristiwa dihitung dalam satu panggilan kernel
+    for loc, severity in zip(locs, calculate_event_severities(locs).tolist()):
+        loc['severity_score'] = severity
 
+    for loc in locs:
         # Aggregate metrics across all frames in event
         if loc.get('all_metrics'):
             aggregated = {}
@@ -2769,21 +3339,27 @@ def run_tahap_4_visualisasi_dan_penilaian(result: AnalysisResult, out_dir: Path)
             for key, vals in aggregated.items():
                 numeric_vals = [v for v in vals if isinstance(v, (int, float))]
                 if numeric_vals:
+                    # max/min memakai nilai aslinya agar metrik integer tetap integer
+                    v_mean, v_std = _aggregate_numeric(np.asarray(numeric_vals, dtype=np.float64))
                     loc['aggregated_metrics'][key] = {
-                        'mean': np.mean(numeric_vals),
+                        'mean': v_mean,
                         'max': max(numeric_vals),
                         'min': min(numeric_vals),
-                        'std': np.std(numeric_vals)
+                        'std': v_std
                     }
 
     result.localizations = locs
+    n_locs = len(locs)
+    durations = np.fromiter((loc['duration'] for loc in locs), dtype=np.float64, count=n_locs)
+    severities = np.fromiter((loc['severity_score'] for loc in locs), dtype=np.float64, count=n_locs)
+    frame_counts = np.fromiter((loc['frame_count'] for loc in locs), dtype=np.int64, count=n_locs)
     result.localization_details = {
-        'total_events': len(locs),
+        'total_events': n_locs,
         'events_by_type': Counter(loc['event'] for loc in locs),
-        'total_anomalous_frames': sum(loc.get('frame_count', 0) for loc in locs),
-        'average_event_duration': np.mean([loc.get('duration',0) for loc in locs]) if locs else 0,
-        'max_event_duration': max([loc.get('duration',0) for loc in locs]) if locs else 0,
-        'high_severity_events': sum(1 for loc in locs if loc.get('severity_score',0) > 0.7)
+        'total_anomalous_frames': int(frame_counts.sum()),
+        'average_event_duration': float(durations.mean()) if n_locs else 0,
+        'max_event_duration': float(durations.max()) if n_locs else 0,
+        'high_severity_events': int(np.count_nonzero(severities > 0.7))
     }
 
     log(f"  -> Ditemukan dan dilokalisasi {len(locs)} peristiwa anomali.")
@@ -2791,7 +3367,6 @@ def run_tahap_4_visualisasi_dan_penilaian(result: AnalysisResult, out_dir: Path)
     log(f"  -> Peristiwa dengan severity tinggi: {result.localization_details['high_severity_events']}")
 
     # Calculate comprehensive summary
-    total_anom = sum(1 for f in result.frames if f.type.startswith("anomaly"))
     total_frames = len(result.frames)
     pct_anomaly = round(total_anom * 100 / total_frames, 2) if total_frames > 0 else 0
     result.summary = {
@@ -2841,970 +3416,1008 @@ def run_tahap_4_visualisasi_dan_penilaian(result: AnalysisResult, out_dir: Path)
     # 3. Existing plots (dengan perbaikan)
     log(f"  📈 Membuat plot temporal standar...")
 
-    # K-Means temporal plot
-    color_clusters = [f.color_cluster for f in result.frames if f.color_cluster is not None]
-    if color_clusters:
-        plt.figure(figsize=(15, 6))
-        plt.plot(range(len(color_clusters)), color_clusters, marker='.', linestyle='-', markersize=4, label='Klaster Warna Frame')
-        jump_frames = [i for i in range(1, len(color_clusters)) if color_clusters[i] != color_clusters[i-1]]
-        if jump_frames:
-            for jf in jump_frames:
-                plt.axvline(x=jf, color='r', linestyle='--', linewidth=1, alpha=0.7)
-            plt.plot([], [], color='r', linestyle='--', linewidth=1, label='Perubahan Adegan Terdeteksi')
-        plt.title('Visualisasi Klasterisasi Warna (Metode K-Means) Sepanjang Waktu', fontsize=14, weight='bold')
-        plt.xlabel('Indeks Frame', fontsize=12)
-        plt.ylabel('Nomor Klaster Warna', fontsize=12)
-        if len(set(color_clusters)) > 1:
-            plt.yticks(range(min(set(color_clusters)), max(set(color_clusters))+1))
-        plt.grid(True, linestyle=':', alpha=0.7)
-        plt.legend(loc='upper right', fontsize=10)
-        plt.tight_layout()
-        kmeans_temporal_plot_path = out_dir / f"plot_kmeans_temporal_{Path(result.video_path).stem}.png"
-        plt.savefig(kmeans_temporal_plot_path, bbox_inches="tight", dpi=150)
-        plt.close()
-        result.plots['kmeans_temporal'] = str(kmeans_temporal_plot_path)
-
-    # SSIM temporal plot
-    ssim_values = [f.ssim_to_prev for f in result.frames if f.ssim_to_prev is not None]
-    if len(ssim_values) > 1:
-        y_values_ssim = ssim_values[1:]
-        x_indices_ssim = list(range(1, len(y_values_ssim) + 1))
-
-        plt.figure(figsize=(15, 6))
-        plt.plot(x_indices_ssim, y_values_ssim, color='skyblue', marker='.', linestyle='-', markersize=3, alpha=0.7)
-
-        discontinuity_frames_ssim_indices = [f.index for f in result.frames if "SSIM" in str(f.evidence_obj.reasons)]
-        if discontinuity_frames_ssim_indices:
-            valid_indices = [i for i in discontinuity_frames_ssim_indices if 0 < i < len(ssim_values)]
-            if valid_indices:
-                discontinuity_ssim_y_values = [ssim_values[i] for i in valid_indices]
-                plt.scatter(valid_indices, discontinuity_ssim_y_values, color='red', marker='X', s=100, zorder=5, label='Diskontinuitas Terdeteksi (SSIM)')
-
-        plt.title('Perubahan SSIM Antar Frame Sepanjang Waktu', fontsize=14, weight='bold')
-        plt.xlabel('Indeks Frame', fontsize=12)
-        plt.ylabel('Skor SSIM (0-1, Lebih Tinggi Lebih Mirip)', fontsize=12)
-        plt.ylim(0, 1.05)
-        plt.grid(True, linestyle=':', alpha=0.7)
-        plt.legend(loc='lower left', fontsize=10)
-        plt.tight_layout()
-        ssim_temporal_plot_path = out_dir / f"plot_ssim_temporal_{Path(result.video_path).stem}.png"
-        plt.savefig(ssim_temporal_plot_path, bbox_inches="tight", dpi=150)
-        plt.close()
-        result.plots['ssim_temporal'] = str(ssim_temporal_plot_path)
-
-    # Optical flow temporal plot
-    flow_values = [f.optical_flow_mag for f in result.frames if f.optical_flow_mag is not None]
-    if len(flow_values) > 1:
-        y_values_flow = flow_values[1:]
-        x_indices_flow = list(range(1, len(y_values_flow) + 1))
-
-        plt.figure(figsize=(15, 6))
-        plt.plot(x_indices_flow, y_values_flow, color='salmon', marker='.', linestyle='-', markersize=3, alpha=0.7)
-
-        discontinuity_frames_flow_indices = [f.index for f in result.frames if "Aliran Optik" in str(f.evidence_obj.reasons)]
-        if discontinuity_frames_flow_indices:
-            valid_indices_flow = [i for i in discontinuity_frames_flow_indices if 0 < i < len(flow_values)]
-            if valid_indices_flow:
-                discontinuity_flow_y_values = [flow_values[i] for i in valid_indices_flow]
-                plt.scatter(valid_indices_flow, discontinuity_flow_y_values, color='darkgreen', marker='o', s=100, zorder=5, label='Diskontinuitas Terdeteksi (Aliran Optik)')
-
-        flow_mags_for_z = [m for m in flow_values if m is not None and m > 0.0]
-        if len(flow_mags_for_z) > 1:
-            median_flow = np.median(flow_mags_for_z)
-            mad_flow = stats.median_abs_deviation(flow_mags_for_z)
-            mad_flow = 1e-9 if mad_flow == 0 else mad_flow
-            threshold_mag_upper = (CONFIG["OPTICAL_FLOW_Z_THRESH"] / 0.6745) * mad_flow + median_flow
-            plt.axhline(y=threshold_mag_upper, color='blue', linestyle='--', linewidth=1, label=f'Ambang Batas Atas Z-score')
-
-        plt.title('Perubahan Rata-rata Magnitudo Aliran Optik', fontsize=14, weight='bold')
-        plt.xlabel('Indeks Frame', fontsize=12)
-        plt.ylabel('Rata-rata Magnitudo Aliran Optik', fontsize=12)
-        plt.grid(True, linestyle=':', alpha=0.7)
-        plt.legend(loc='upper right', fontsize=10)
-        plt.tight_layout()
-        optical_flow_temporal_plot_path = out_dir / f"plot_optical_flow_temporal_{Path(result.video_path).stem}.png"
-        plt.savefig(optical_flow_temporal_plot_path, bbox_inches="tight", dpi=150)
-        plt.close()
-        result.plots['optical_flow_temporal'] = str(optical_flow_temporal_plot_path)
-
-    # Metrics histograms
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 4))
-    if len(ssim_values) > 1:
-        ssim_to_plot = [s for s in ssim_values[1:] if s is not None]
-        if ssim_to_plot:
-            ax1.hist(ssim_to_plot, bins=50, color='skyblue', edgecolor='black')
-        ax1.set_title("Distribusi Skor SSIM")
-        ax1.set_xlabel("Skor SSIM")
-        ax1.set_ylabel("Frekuensi")
-    if len(flow_values) > 1:
-        flow_to_plot = [f for f in flow_values[1:] if f is not None]
-        if flow_to_plot:
-            ax2.hist(flow_to_plot, bins=50, color='salmon', edgecolor='black')
-        ax2.set_title("Distribusi Aliran Optik")
-        ax2.set_xlabel("Rata-rata Pergerakan")
-        ax2.set_ylabel("Frekuensi")
-    plt.tight_layout()
-    metrics_histograms_plot_path = out_dir / f"plot_metrics_histograms_{Path(result.video_path).stem}.png"
-    plt.savefig(metrics_histograms_plot_path, dpi=100)
-    plt.close()
-    result.plots['metrics_histograms'] = str(metrics_histograms_plot_path)
-
-    # Simple temporal anomaly plot
-    plt.figure(figsize=(15, 6))
-    anomaly_data = {
-        'Duplikasi': {'x': [], 'color': 'orange', 'marker': 'o', 'level': 1.0},
-        'Penyisipan': {'x': [], 'color': 'red', 'marker': 'x', 'level': 0.9},
-        'Diskontinuitas': {'x': [], 'color': 'purple', 'marker': '|', 'level': 0.8}
-    }
-    for f in result.frames:
-        if f.type == "anomaly_duplication":
-            anomaly_data['Duplikasi']['x'].append(f.index)
-        elif f.type == "anomaly_insertion":
-            anomaly_data['Penyisipan']['x'].append(f.index)
-        elif f.type == "anomaly_discontinuity":
-            anomaly_data['Diskontinuitas']['x'].append(f.index)
-
-    for label, data in anomaly_data.items():
-        if data['x']:
-            plt.vlines(data['x'], 0, data['level'], colors=data['color'], lw=1.5, alpha=0.8)
-            plt.scatter(data['x'], np.full_like(data['x'], data['level'], dtype=float),
-                       c=data['color'], marker=data['marker'], s=40, label=label, zorder=5)
-
-    plt.ylim(-0.1, 1.2)
-    plt.yticks([0, 0.8, 0.9, 1.0], ['Asli', 'Diskontinuitas', 'Penyisipan', 'Duplikasi'])
-    plt.xlabel("Indeks Frame", fontsize=12)
-    plt.ylabel("Jenis Anomali Terdeteksi", fontsize=12)
-    plt.title(f"Peta Anomali Temporal untuk {Path(result.video_path).name}", fontsize=14, weight='bold')
-    plt.grid(True, axis='x', linestyle=':', alpha=0.7)
-
-    from matplotlib.lines import Line2D
-    plt.legend(handles=[Line2D([0], [0], color=d['color'], marker=d['marker'], linestyle='None', label=l)
-                        for l, d in anomaly_data.items() if d['x']], loc='upper right', fontsize=10)
-    plt.tight_layout()
-    temporal_plot_path = out_dir / f"plot_temporal_{Path(result.video_path).stem}.png"
-    plt.savefig(temporal_plot_path, bbox_inches="tight", dpi=150)
-    plt.close()
-    result.plots['temporal'] = str(temporal_plot_path)
+    # Plot-plot berikut saling independen; masing-masing membuat Figure sendiri
+    # sehingga aman dirender paralel. result.plots hanya ditulis di thread utama.
+    stem = Path(result.video_path).stem
+    plot_tasks = [
+        lambda: _plot_kmeans_temporal(color_clusters, stem, out_dir),
+        lambda: _plot_ssim_temporal(ssim_values, ssim_reason_indices, stem, out_dir),
+        lambda: _plot_optical_flow_temporal(flow_values, flow_reason_indices, stem, out_dir,
+                                            getattr(result, '_flow_z_threshold_upper', None)),
+        lambda: _plot_metrics_histograms(ssim_values, flow_values, stem, out_dir),
+        lambda: _plot_temporal_anomalies(anomaly_indices, result.video_path, out_dir),
+    ]
+    with ThreadPoolExecutor(max_workers=min(len(plot_tasks), os.cpu_count() or 1)) as ex:
+        plot_results = list(ex.map(lambda fn: fn(), plot_tasks))
+    for plot_result in plot_results:
+        if plot_result:
+            key, path = plot_result
+            result.plots[key] = str(path)
 
     log(f"  {Icons.SUCCESS} Tahap 4 Selesai - Analisis detail dan penilaian integritas telah lengkap.")
 
-# Helper function for calculating event severity
-def calculate_event_severity(event: dict) -> float:
-    """Calculate severity score for an anomaly event (0-1)."""
-    severity = 0.0
+# Base severity by type; kode terakhir adalah default untuk tipe tak dikenal
+_EVENT_TYPE_CODES = {
+    'anomaly_insertion': 0,
+    'anomaly_duplication': 1,
+    'anomaly_discontinuity': 2
+}
+_EVENT_TYPE_SEVERITY = np.array([0.8, 0.6, 0.5, 0.3], dtype=np.float64)
+
+# Adjust by confidence; kode terakhir adalah default ('N/A')
+_CONFIDENCE_CODES = {
+    'SANGAT TINGGI': 0,
+    'TINGGI': 1,
+    'SEDANG': 2,
+    'RENDAH': 3,
+    'N/A': 4
+}
+_CONFIDENCE_MULTIPLIER = np.array([1.2, 1.0, 0.8, 0.6, 0.5], dtype=np.float64)
+
+@njit(cache=True)
+def _aggregate_numeric(arr):
+    """Return (mean, std) of a float64 array."""
+    return arr.mean(), arr.std()
 
-    # Base severity by type
-    type_severity = {
-        'anomaly_insertion': 0.8,
-        'anomaly_duplication': 0.6,
-        'anomaly_discontinuity': 0.5
-    }
-    severity = type_severity.get(event.get('event', ''), 0.3)
-
-    # Adjust by confidence
-    confidence_multiplier = {
-        'SANGAT TINGGI': 1.2,
-        'TINGGI': 1.0,
-        'SEDANG': 0.8,
-        'RENDAH': 0.6,
-        'N/A': 0.5
-    }
-    severity *= confidence_multiplier.get(event.get('confidence', 'N/A'), 0.5)
+@njit(cache=True)
+def _event_severity_kernel(type_code, conf_code, duration, frame_count, type_severity, confidence_multiplier):
+    severity = type_severity[type_code] * confidence_multiplier[conf_code]
 
     # Adjust by duration (longer events are more severe)
-    duration = event.get('duration', 0)
     if duration > 5.0:
         severity *= 1.2
     elif duration > 2.0:
         severity *= 1.1
 
     # Adjust by frame count
-    frame_count = event.get('frame_count', 0)
     if frame_count > 10:
         severity *= 1.1
 
     # Normalize to 0-1 range
-    severity = min(1.0, max(0.0, severity))
-
-    return severity
-
-# --- TAHAP 5: PENYUSUNAN LAPORAN & VALIDASI FORENSIK ---
-def run_tahap_5_pelaporan_dan_validasi(result: AnalysisResult, out_dir: Path, baseline_result: AnalysisResult | None = None, include_simple: bool = True, include_technical: bool = True):
-    print_stage_banner(5, "Penyusunan Laporan & Validasi Forensik", Icons.REPORTING,
-                       "Menghasilkan laporan PDF, PNG, dan DOCX dengan fokus pada Analisis FERM.")
-
-    pdf_path = out_dir / f"laporan_forensik_{Path(result.video_path).stem}.pdf"
-    from reportlab.lib.pagesizes import A4 # Hapus F5 dari sini
-    from reportlab.lib.units import mm
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image as PlatypusImage, Table, TableStyle, PageBreak
-    from reportlab.lib import colors
-    import traceback
-    
-    F5 = (148*mm, 210*mm)
-    def get_encoder_info(metadata: dict) -> str:
-        return metadata.get('Video Stream', {}).get('Encoder', 'N/A')
-
-    def get_anomaly_explanation(event_type: str) -> str:
-        explanations = {
-            "Duplication": "Frame-frame ini adalah salinan identik dari frame sebelumnya. Dalam video asli, konten ini kemungkinan tidak diulang dan mungkin mengindikasikan manipulasi untuk memperpanjang durasi video atau menyembunyikan konten tertentu.",
-            "Insertion": "Frame-frame ini <b>tidak ditemukan</b> dalam video asli/baseline. Ini mengindikasikan penambahan konten baru yang tidak ada pada rekaman original, yang mungkin bertujuan mengubah narasi atau konteks video.",
-            "Discontinuity": "Terdeteksi 'patahan' atau transisi mendadak dalam aliran video. Hal ini mengindikasikan pemotongan bagian dari video asli, atau penyambungan konten dari sumber berbeda secara tidak mulus."
-        }
-        return explanations.get(event_type, "Jenis anomali tidak dikenal.")
-
-    def get_anomaly_implication(event_type: str) -> str:
-        implications = {
-            "Duplication": "Implikasi forensik dari duplikasi frame adalah kemungkinan adanya upaya untuk: (1) Memperpanjang durasi video secara artifisial, (2) Menutupi konten yang telah dihapus dengan mengulang konten yang ada, atau (3) Memanipulasi persepsi waktu dalam video tersebut.",
-            "Insertion": "Penyisipan frame asing ke dalam video memiliki implikasi serius, termasuk: (1) Mengubah narasi atau konteks asli video, (2) Menambahkan elemen visual yang tidak ada pada saat perekaman asli, atau (3) Memalsukan bukti visual dengan menambahkan konten dari sumber lain.",
-            "Discontinuity": "Diskontinuitas dalam video mengindikasikan: (1) Bagian tertentu dari video asli telah dihapus, (2) Konten dari sumber berbeda telah disambung secara tidak mulus, atau (3) Terjadi gangguan teknis selama proses pengambilan atau pengeditan video."
-        }
-        return implications.get(event_type, "Implikasi tidak dapat ditentukan untuk jenis anomali ini.")
-
-    def explain_metric(metric_name: str) -> str:
-        explanations = {
-            "optical_flow_z_score": "Ukuran lonjakan gerakan abnormal (Z-score > 4 = sangat abnormal). Nilai tinggi mengindikasikan perubahan gerakan yang drastis antar frame, yang jarang terjadi dalam video natural.",
-            "ssim_drop": "Ukuran penurunan kemiripan visual (> 0.25 = perubahan drastis). Menunjukkan seberapa berbeda sebuah frame dari frame sebelumnya secara struktural.",
-            "ssim_absolute_low": "Skor kemiripan yang sangat rendah (< 0.7 = sangat berbeda). Menandakan frame memiliki struktur visual yang jauh berbeda dari frame sekitarnya.",
-            "color_cluster_jump": "Perubahan adegan visual berdasarkan analisis warna K-Means. Mengindikasikan perpindahan dari satu 'klaster warna' ke klaster lain secara mendadak.",
-            "source_frame": "Frame asli dari duplikasi (nomor indeks frame). Menunjukkan frame mana yang menjadi sumber dari frame duplikasi.",
-            "ssim_to_source": "Skor kemiripan dengan frame asli (0-1, 1 = identik). Semakin tinggi nilai, semakin identik kedua frame tersebut.",
-            "sift_inliers": "Jumlah titik fitur unik yang cocok kuat (> 10 = duplikasi kuat). Mengindikasikan jumlah fitur spesifik yang teridentifikasi sama persis di kedua frame.",
-            "sift_good_matches": "Total kandidat titik fitur yang cocok. Menunjukkan jumlah keseluruhan fitur yang berpotensi cocok antar frame.",
-            "sift_inlier_ratio": "Rasio kecocokan valid (> 0.8 = duplikasi hampir pasti). Mengukur proporsi kecocokan fitur yang valid secara geometris.",
-            "ela_max_difference": "Tingkat perbedaan kompresi (0-255, > 100 = editing signifikan). Nilai tinggi mengindikasikan area dengan perbedaan kompresi yang mencolok, sering terjadi pada area yang telah diedit.",
-            "ela_suspicious_regions": "Jumlah area yang menunjukkan tanda-tanda editing. Mengindikasikan berapa banyak region dalam frame yang memiliki karakteristik editing digital."
-        }
-        return explanations.get(metric_name, "Metrik ini mengukur aspek spesifik dari karakteristik visual atau struktural frame.")
+    return min(1.0, max(0.0, severity))
+
+@njit(cache=True)
+def _event_severity_batch(type_codes, conf_codes, durations, frame_counts, type_severity, confidence_multiplier):
+    out = np.empty(type_codes.shape[0], dtype=np.float64)
+    for i in range(type_codes.shape[0]):
+        out[i] = _event_severity_kernel(type_codes[i], conf_codes[i], durations[i], frame_counts[i],
+                                        type_severity, confidence_multiplier)
+    return out
+
+def calculate_event_severities(events: list[dict]) -> np.ndarray:
+    """Severity (0-1) untuk banyak peristiwa sekaligus dalam satu panggilan kernel."""
+    n = len(events)
+    default_type, default_conf = len(_EVENT_TYPE_CODES), _CONFIDENCE_CODES['N/A']
+    type_codes = np.fromiter((_EVENT_TYPE_CODES.get(e.get('event', ''), default_type) for e in events), dtype=np.int64, count=n)
+    conf_codes = np.fromiter((_CONFIDENCE_CODES.get(e.get('confidence', 'N/A'), default_conf) for e in events), dtype=np.int64, count=n)
+    durations = np.fromiter((float(e.get('duration', 0)) for e in events), dtype=np.float64, count=n)
+    frame_counts = np.fromiter((int(e.get('frame_count', 0)) for e in events), dtype=np.int64, count=n)
+    return _event_severity_batch(type_codes, conf_codes, durations, frame_counts,
+                                 _EVENT_TYPE_SEVERITY, _CONFIDENCE_MULTIPLIER)
+
+def _build_f5_styles():
+    """Stylesheet laporan F5: ukuran dasar di-set dulu agar style turunan mewarisinya."""
+    styles = getSampleStyleSheet()
+    styles['Normal'].fontSize = 9
+    styles['Normal'].leading = 11
+    styles['h1'].fontSize = 16
+    styles['h2'].fontSize = 13
+    styles['h3'].fontSize = 11
 
-    def get_dfrws_phase_explanation(phase: int) -> str:
-        explanations = {
-            1: """<b>Identifikasi (Identification)</b> adalah tahap pertama dalam metodologi DFRWS, di mana sistem mengidentifikasi bukti potensial (video) dan metadata-nya. Tahap ini mencakup proses menentukan bukti digital yang relevan, memverifikasi keasliannya, dan mendokumentasikan informasi dasar tentang bukti tersebut.
+    custom_styles = [
+        ParagraphStyle(name='Code', fontName='Courier', fontSize=7, leading=9, wordWrap='break'),
+        ParagraphStyle(name='SubTitle', parent=styles['h2'], fontSize=11, textColor=colors.darkslategray),
+        ParagraphStyle(name='Justify', parent=styles['Normal'], alignment=4, fontSize=9, leading=11), # Justify
+        ParagraphStyle(name='H3-Box', parent=styles['h3'], fontSize=10, backColor=colors.lightgrey, padding=4, leading=12, leftIndent=4, borderPadding=2, textColor=colors.black),
+        ParagraphStyle(name='ExplanationBox', parent=styles['Normal'], fontSize=8, backColor='#FFF8DC', borderColor='#CCCCCC', borderWidth=1, borderPadding=6, leftIndent=8, rightIndent=8),
+        ParagraphStyle(name='DisclaimerBox', parent=styles['Normal'], fontSize=8, backColor='#F8F9FA', borderColor='#D1D5DB', borderWidth=1, borderPadding=6, leftIndent=8, rightIndent=8, textColor='#4B5563'),
+        ParagraphStyle(name='HighlightBox', parent=styles['Normal'], fontSize=8, backColor='#E8F4F8', borderColor='#B8E0E8', borderWidth=1, borderPadding=6, leftIndent=8, rightIndent=8),
+        ParagraphStyle(name='MethodologyBox', parent=styles['Normal'], fontSize=8, backColor='#F0F7FF', borderColor='#B9D3FA', borderWidth=1, borderPadding=6, leftIndent=8, rightIndent=8),
+        ParagraphStyle(name='SimplifiedExplanation', parent=styles['Normal'], fontSize=9, backColor='#E6F6E8', borderColor='#C3E6CB', borderWidth=1, borderPadding=6, leftIndent=8, rightIndent=8),
+        ParagraphStyle(name='TechnicalExplanation', parent=styles['Normal'], fontSize=8, backColor='#F0F2F6', borderColor='#D1D5DB', borderWidth=1, borderPadding=6, leftIndent=8, rightIndent=8, fontName='Courier'),
+        ParagraphStyle(name='SectionHeader', parent=styles['h3'], fontSize=12, textColor=colors.darkblue, spaceBefore=10, spaceAfter=5),
+        ParagraphStyle(name='Caption', parent=styles['Normal'], fontName='Helvetica-Oblique', fontSize=8, alignment=1, textColor=colors.darkslategray),
+    ]
+    for style in custom_styles:
+        try:
+            styles.add(style)
+        except KeyError:
+            pass  # Style bawaan dengan nama sama (mis. 'Code') dipertahankan
+    return styles
+
+_F5_STYLES = _build_f5_styles()
+
+class StreamingDocTemplate(BaseDocTemplate):
+    """Dokumen satu PageTemplate yang ditata per bagian dari generator, bukan dari satu story utuh."""
+
+    def __init__(self, filename, onPage=None, **kwargs):
+        super().__init__(filename, **kwargs)
+        self._calc()
+        frame = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id='normal')
+        template_kwargs = {'onPage': onPage} if onPage else {}
+        self.addPageTemplates([PageTemplate(id='Normal', frames=[frame], pagesize=self.pagesize, **template_kwargs)])
+
+    def build_sections(self, sections, gc_every=8):
+        """Seperti build(), tetapi flowable setiap bagian dilepas setelah ditata."""
+        self._startBuild()
+        for n, flowables in enumerate(sections, 1):
+            flowables = list(flowables)
+            while flowables:
+                self.clean_hanging()
+                self.handle_flowable(flowables)
+            del flowables
+            if n % gc_every == 0:
+                gc.collect()  # Bebaskan gambar/tabel bagian yang sudah ditulis
+        self._endBuild()
+
+# Penjelasan tahap DFRWS untuk laporan; (judul, implementasi) diurai sekali saat impor
+_DFRWS_EXPLANATIONS = {
+    1: """<b>Identifikasi (Identification)</b> adalah tahap pertama dalam metodologi DFRWS, di mana sistem mengidentifikasi bukti potensial (video) dan metadata-nya. Tahap ini mencakup proses menentukan bukti digital yang relevan, memverifikasi keasliannya, dan mendokumentasikan informasi dasar tentang bukti tersebut.
             
             Dalam analisis ini, tahap Identifikasi diimplementasikan melalui ekstraksi metadata komprehensif dari file video dan penghitungan hash SHA-256 untuk verifikasi integritas.""",
             
-            2: """<b>Preservasi (Preservation)</b> adalah tahap kedua yang fokus pada menjaga integritas bukti digital. Tujuannya adalah memastikan bukti tidak berubah selama proses analisis.
+    2: """<b>Preservasi (Preservation)</b> adalah tahap kedua yang fokus pada menjaga integritas bukti digital. Tujuannya adalah memastikan bukti tidak berubah selama proses analisis.
             
             Dalam analisis ini, preservasi dilakukan dengan menghitung nilai hash SHA-256 dari file asli dan menyimpan frame-frame asli tanpa modifikasi, sehingga selalu dapat dibandingkan dengan versi ternormalisasi yang digunakan untuk analisis.""",
             
-            3: """<b>Pengumpulan (Collection)</b> adalah tahap ketiga di mana data relevan diekstrak dari bukti untuk analisis lebih lanjut. Ini melibatkan pengumpulan informasi secara sistematis.
+    3: """<b>Pengumpulan (Collection)</b> adalah tahap ketiga di mana data relevan diekstrak dari bukti untuk analisis lebih lanjut. Ini melibatkan pengumpulan informasi secara sistematis.
             
             Dalam analisis ini, pengumpulan dilakukan melalui ekstraksi frame pada interval tetap, normalisasi warna untuk analisis konsisten, dan penghitungan nilai hash perceptual (pHash) untuk setiap frame.""",
             
-            4: """<b>Pemeriksaan (Examination)</b> adalah tahap keempat yang melibatkan penerapan metode teknis untuk menguji bukti secara mendalam, mencari anomali atau tanda-tanda manipulasi.
+    4: """<b>Pemeriksaan (Examination)</b> adalah tahap keempat yang melibatkan penerapan metode teknis untuk menguji bukti secara mendalam, mencari anomali atau tanda-tanda manipulasi.
             
             Dalam analisis ini, pemeriksaan dilakukan melalui analisis temporal (SSIM, Optical Flow), deteksi klaster warna dengan K-Means, analisis Error Level (ELA), dan pencocokan fitur (SIFT+RANSAC).""",
             
-            5: """<b>Analisis (Analysis)</b> adalah tahap kelima yang melibatkan interpretasi hasil dari tahap pemeriksaan, menghubungkan anomali yang ditemukan, dan membuat kesimpulan berdasarkan bukti yang ada.
+    5: """<b>Analisis (Analysis)</b> adalah tahap kelima yang melibatkan interpretasi hasil dari tahap pemeriksaan, menghubungkan anomali yang ditemukan, dan membuat kesimpulan berdasarkan bukti yang ada.
             
             Dalam analisis ini, tahap Analisis diimplementasikan melalui Localization Tampering (mengelompokkan anomali menjadi peristiwa koheren) dan penerapan Forensic Evidence Reliability Matrix (FERM) untuk menilai keandalan bukti secara objektif.""",
             
-            6: """<b>Pelaporan (Reporting)</b> adalah tahap terakhir di mana temuan analisis didokumentasikan secara formal dan komprehensif, menyajikan bukti dan kesimpulan dalam format yang dapat dimengerti.
+    6: """<b>Pelaporan (Reporting)</b> adalah tahap terakhir di mana temuan analisis didokumentasikan secara formal dan komprehensif, menyajikan bukti dan kesimpulan dalam format yang dapat dimengerti.
             
             Dalam analisis ini, tahap Pelaporan diimplementasikan melalui laporan ini, yang menyusun temuan dari semua tahap sebelumnya secara terstruktur dan sistematis, dengan visualisasi pendukung dan penjelasan detail."""
-        }
-        return explanations.get(phase, "Penjelasan tidak tersedia untuk tahap ini.")
+}
+_DFRWS_PARSED = {
+    phase: (txt.split('</b>')[0], txt.split("analisis ini,")[1].strip())
+    for phase, txt in _DFRWS_EXPLANATIONS.items()
+}
 
-    doc = SimpleDocTemplate(str(pdf_path), pagesize=F5,
-                          topMargin=10*mm, bottomMargin=10*mm,
-                          leftMargin=10*mm, rightMargin=10*mm)
-    styles = getSampleStyleSheet()
+# Teks penjelasan laporan per jenis anomali/metrik; murni fungsi dari kuncinya sehingga di-cache
+@lru_cache(maxsize=256)
+def get_anomaly_explanation(event_type: str) -> str:
+    explanations = {
+        "Duplication": "Frame-frame ini adalah salinan identik dari frame sebelumnya. Dalam video asli, konten ini kemungkinan tidak diulang dan mungkin mengindikasikan manipulasi untuk memperpanjang durasi video atau menyembunyikan konten tertentu.",
+        "Insertion": "Frame-frame ini <b>tidak ditemukan</b> dalam video asli/baseline. Ini mengindikasikan penambahan konten baru yang tidak ada pada rekaman original, yang mungkin bertujuan mengubah narasi atau konteks video.",
+        "Discontinuity": "Terdeteksi 'patahan' atau transisi mendadak dalam aliran video. Hal ini mengindikasikan pemotongan bagian dari video asli, atau penyambungan konten dari sumber berbeda secara tidak mulus."
+    }
+    return explanations.get(event_type, "Jenis anomali tidak dikenal.")
+
+@lru_cache(maxsize=256)
+def get_anomaly_implication(event_type: str) -> str:
+    implications = {
+        "Duplication": "Implikasi forensik dari duplikasi frame adalah kemungkinan adanya upaya untuk: (1) Memperpanjang durasi video secara artifisial, (2) Menutupi konten yang telah dihapus dengan mengulang konten yang ada, atau (3) Memanipulasi persepsi waktu dalam video tersebut.",
+        "Insertion": "Penyisipan frame asing ke dalam video memiliki implikasi serius, termasuk: (1) Mengubah narasi atau konteks asli video, (2) Menambahkan elemen visual yang tidak ada pada saat perekaman asli, atau (3) Memalsukan bukti visual dengan menambahkan konten dari sumber lain.",
+        "Discontinuity": "Diskontinuitas dalam video mengindikasikan: (1) Bagian tertentu dari video asli telah dihapus, (2) Konten dari sumber berbeda telah disambung secara tidak mulus, atau (3) Terjadi gangguan teknis selama proses pengambilan atau pengeditan video."
+    }
+    return implications.get(event_type, "Implikasi tidak dapat ditentukan untuk jenis anomali ini.")
+
+@lru_cache(maxsize=256)
+def explain_metric(metric_name: str) -> str:
+    explanations = {
+        "optical_flow_z_score": "Ukuran lonjakan gerakan abnormal (Z-score > 4 = sangat abnormal). Nilai tinggi mengindikasikan perubahan gerakan yang drastis antar frame, yang jarang terjadi dalam video natural.",
+        "ssim_drop": "Ukuran penurunan kemiripan visual (> 0.25 = perubahan drastis). Menunjukkan seberapa berbeda sebuah frame dari frame sebelumnya secara struktural.",
+        "ssim_absolute_low": "Skor kemiripan yang sangat rendah (< 0.7 = sangat berbeda). Menandakan frame memiliki struktur visual yang jauh berbeda dari frame sekitarnya.",
+        "color_cluster_jump": "Perubahan adegan visual berdasarkan analisis warna K-Means. Mengindikasikan perpindahan dari satu 'klaster warna' ke klaster lain secara mendadak.",
+        "source_frame": "Frame asli dari duplikasi (nomor indeks frame). Menunjukkan frame mana yang menjadi sumber dari frame duplikasi.",
+        "ssim_to_source": "Skor kemiripan dengan frame asli (0-1, 1 = identik). Semakin tinggi nilai, semakin identik kedua frame tersebut.",
+        "sift_inliers": "Jumlah titik fitur unik yang cocok kuat (> 10 = duplikasi kuat). Mengindikasikan jumlah fitur spesifik yang teridentifikasi sama persis di kedua frame.",
+        "sift_good_matches": "Total kandidat titik fitur yang cocok. Menunjukkan jumlah keseluruhan fitur yang berpotensi cocok antar frame.",
+        "sift_inlier_ratio": "Rasio kecocokan valid (> 0.8 = duplikasi hampir pasti). Mengukur proporsi kecocokan fitur yang valid secara geometris.",
+        "ela_max_difference": "Tingkat perbedaan kompresi (0-255, > 100 = editing signifikan). Nilai tinggi mengindikasikan area dengan perbedaan kompresi yang mencolok, sering terjadi pada area yang telah diedit.",
+        "ela_suspicious_regions": "Jumlah area yang menunjukkan tanda-tanda editing. Mengindikasikan berapa banyak region dalam frame yang memiliki karakteristik editing digital."
+    }
+    return explanations.get(metric_name, "Metrik ini mengukur aspek spesifik dari karakteristik visual atau struktural frame.")
 
-    # Menambahkan style baru untuk laporan yang lebih profesional dengan ukuran font yang disesuaikan untuk F5
-    if 'Code' not in styles:
-        styles.add(ParagraphStyle(name='Code', fontName='Courier', fontSize=7, leading=9, wordWrap='break'))
-    if 'SubTitle' not in styles:
-        styles.add(ParagraphStyle(name='SubTitle', parent=styles['h2'], fontSize=11, textColor=colors.darkslategray))
-    if 'Justify' not in styles:
-        styles.add(ParagraphStyle(name='Justify', parent=styles['Normal'], alignment=4, fontSize=9, leading=11)) # Justify
-    if 'H3-Box' not in styles:
-        styles.add(ParagraphStyle(name='H3-Box', parent=styles['h3'], fontSize=10, backColor=colors.lightgrey, padding=4, leading=12, leftIndent=4, borderPadding=2, textColor=colors.black))
-    if 'ExplanationBox' not in styles:
-        styles.add(ParagraphStyle(name='ExplanationBox', parent=styles['Normal'], fontSize=8, backColor='#FFF8DC', borderColor='#CCCCCC', borderWidth=1, borderPadding=6, leftIndent=8, rightIndent=8))
-    if 'DisclaimerBox' not in styles:
-        styles.add(ParagraphStyle(name='DisclaimerBox', parent=styles['Normal'], fontSize=8, backColor='#F8F9FA', borderColor='#D1D5DB', borderWidth=1, borderPadding=6, leftIndent=8, rightIndent=8, textColor='#4B5563'))
-    if 'HighlightBox' not in styles:
-        styles.add(ParagraphStyle(name='HighlightBox', parent=styles['Normal'], fontSize=8, backColor='#E8F4F8', borderColor='#B8E0E8', borderWidth=1, borderPadding=6, leftIndent=8, rightIndent=8))
-    if 'MethodologyBox' not in styles:
-        styles.add(ParagraphStyle(name='MethodologyBox', parent=styles['Normal'], fontSize=8, backColor='#F0F7FF', borderColor='#B9D3FA', borderWidth=1, borderPadding=6, leftIndent=8, rightIndent=8))
-    if 'SimplifiedExplanation' not in styles:
-        styles.add(ParagraphStyle(name='SimplifiedExplanation', parent=styles['Normal'], fontSize=9, backColor='#E6F6E8', borderColor='#C3E6CB', borderWidth=1, borderPadding=6, leftIndent=8, rightIndent=8))
-    if 'TechnicalExplanation' not in styles:
-        styles.add(ParagraphStyle(name='TechnicalExplanation', parent=styles['Normal'], fontSize=8, backColor='#F0F2F6', borderColor='#D1D5DB', borderWidth=1, borderPadding=6, leftIndent=8, rightIndent=8, fontName='Courier'))
-    if 'SectionHeader' not in styles:
-        styles.add(ParagraphStyle(name='SectionHeader', parent=styles['h3'], fontSize=12, textColor=colors.darkblue, spaceBefore=10, spaceAfter=5))
-    if 'Caption' not in styles:
-        styles.add(ParagraphStyle(name='Caption', parent=styles['Normal'], fontName='Helvetica-Oblique', fontSize=8, alignment=1, textColor=colors.darkslategray))
-
-    # Update styles yang sudah ada untuk ukuran F5
-    styles['Normal'].fontSize = 9
-    styles['Normal'].leading = 11
-    styles['h1'].fontSize = 16
-    styles['h2'].fontSize = 13
-    styles['h3'].fontSize = 11
+def _do_png_export(pdf_path: Path, out_dir: Path) -> tuple[list[str] | None, str | None]:
+    """Ekspor halaman PDF ke PNG; mengembalikan (daftar path, pesan jika dilewati/gagal)."""
+    try:
+        # Periksa dependensi
+        from export_utils import check_dependency, check_poppler_installation
+        if not (check_dependency('pdf2image') and check_poppler_installation()):
+            return None, "  ⚠️ Ekspor PNG dilewati. Periksa instalasi `pdf2image` dan `Poppler` (pastikan ada di PATH)."
+        from pdf2image import convert_from_path
+        png_output_dir = out_dir / "png_exports"
+        png_output_dir.mkdir(exist_ok=True)
+
+        # Poppler merender halaman secara paralel langsung ke disk; hanya path yang dikembalikan
+        rendered = convert_from_path(
+            str(pdf_path), dpi=200, # Turunkan DPI untuk kecepatan
+            fmt='png', output_folder=str(png_output_dir), output_file=f"{pdf_path.stem}_render",
+            paths_only=True, thread_count=max(2, (os.cpu_count() or 2) // 2),
+        )
+        png_paths = []
+        for i, rendered_path in enumerate(rendered):
+            png_path = png_output_dir / f"{pdf_path.stem}_page_{i+1}.png"
+            Path(rendered_path).replace(png_path)
+            png_paths.append(str(png_path)) # Simpan sebagai string
+        return png_paths, None
+    except Exception as png_err:
+        return None, f"  {Icons.ERROR} Gagal saat ekspor PNG: {png_err}"
+
+def _do_docx_export(result: AnalysisResult, out_dir: Path) -> tuple[Path | None, str | None]:
+    """Membuat laporan DOCX; mengembalikan (path, pesan jika dilewati/gagal)."""
+    try:
+        from export_utils import check_dependency, create_docx_backend
+        if not check_dependency('docx'):
+            return None, "  ⚠️ Ekspor DOCX dilewati. `python-docx` tidak terpasang."
+        docx_path = out_dir / f"{Path(result.video_path).stem}_report.docx"
+        return create_docx_backend(result, docx_path) or None, None
+    except Exception as docx_err:
+        return None, f"  {Icons.ERROR} Gagal saat membuat DOCX: {docx_err}"
+
+# --- TAHAP 5: PENYUSUNAN LAPORAN & VALIDASI FORENSIK ---
+def run_tahap_5_pelaporan_dan_validasi(result: AnalysisResult, out_dir: Path, baseline_result: AnalysisResult | None = None, include_simple: bool = True, include_technical: bool = True):
+    print_stage_banner(5, "Penyusunan Laporan & Validasi Forensik", Icons.REPORTING,
+                       "Menghasilkan laporan PDF, PNG, dan DOCX dengan fokus pada Analisis FERM.")
+
+    pdf_path = out_dir / f"laporan_forensik_{Path(result.video_path).stem}.pdf"
+    # Satu stempel waktu untuk seluruh laporan (header tiap halaman, sampul, validasi)
+    report_time = datetime.now()
+    report_time_str = report_time.strftime('%Y-%m-%d %H:%M:%S')
+    report_time_long = report_time.strftime('%d %B %Y, %H:%M:%S')
+    # Nama file berasal dari pengguna; di-escape sekali untuk semua markup Paragraph
+    video_name_markup = escape(Path(result.video_path).name)
+    from reportlab.lib.pagesizes import A4 # Hapus F5 dari sini
+    from reportlab.lib.units import mm
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image as PlatypusImage, Table, TableStyle, PageBreak
+    from reportlab.lib import colors
+    import traceback
+    
+    F5 = (148*mm, 210*mm)
+    def get_encoder_info(metadata: dict) -> str:
+        return metadata.get('Video Stream', {}).get('Encoder', 'N/A')
+
+    # Satu kali penelusuran direktori output untuk semua artefak gambar; path yang
+    # tidak ada di set (mis. di luar out_dir) tetap diperiksa langsung ke disk.
+    existing_artifacts = {
+        os.path.join(root, name)
+        for root, _, files in os.walk(out_dir)
+        for name in files if name.lower().endswith(('.png', '.jpg', '.jpeg'))
+    }
+    def artifact_exists(path) -> bool:
+        return bool(path) and (str(path) in existing_artifacts or os.path.isfile(path))
+
+    # Gambar per peristiwa diperkecil sekali ke ukuran slotnya (cache di out_dir/.cache/thumbs)
+    thumb_jobs = set()
+    for loc in result.localizations:
+        visualizations = loc.get('visualizations', {})
+        thumb_jobs.update(((loc.get('image'), 180, 101), (loc.get('ela_path'), 180, 101), (loc.get('sift_path'), 380, 117),
+                           (visualizations.get('ela_detailed'), 380, 131), (visualizations.get('sift_heatmap'), 380, 117)))
+    thumb_jobs = [(str(p), w, h) for p, w, h in thumb_jobs if isinstance(p, str) and artifact_exists(p)]
+    thumb_cache_dir = out_dir / ".cache" / "thumbs"
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        event_thumbs = dict(zip(thumb_jobs, ex.map(lambda job: _cached_thumb(*job, cache_dir=thumb_cache_dir), thumb_jobs)))
+
+    def report_image(path, **kwargs):
+        # Dimuat lazily oleh ReportLab saat digambar; tidak ada salinan byte yang hidup selama build
+        return PlatypusImage(str(path), **kwargs)
+
+    def event_image(path, width, height):
+        return report_image(event_thumbs.get((str(path), width, height), path), width=width, height=height, kind='proportional')
+
+    styles = _F5_STYLES
+
+    # Rata-rata kualitas pipeline dihitung sekali; tanpa penilaian langsung 'N/A' tanpa NumPy
+    pipeline_assessment = getattr(result, 'pipeline_assessment', None)
+    if pipeline_assessment:
+        quality_scores = np.fromiter((a['quality_score'] for a in pipeline_assessment.values()),
+                                     dtype=np.float64, count=len(pipeline_assessment))
+        pipeline_quality_str = f"{quality_scores.mean():.1f}%"
+    else:
+        pipeline_quality_str = 'N/A'
 
-    story = []
     def header_footer(canvas, doc):
         canvas.saveState()
         canvas.setFont('Helvetica', 8)
-        canvas.drawString(30, 30, f"Laporan VIFA-Pro | {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        canvas.drawString(30, 30, f"Laporan VIFA-Pro | {report_time_str}")
         canvas.drawRightString(A4[0] - 30, 30, f"Halaman {doc.page}")
         canvas.restoreState()
 
-    # --- HALAMAN SAMPUL ---
-    story.append(Paragraph("Laporan Analisis Forensik Video", styles['h1']))
-    story.append(Paragraph("Dihasilkan oleh Sistem VIFA-Pro", styles['SubTitle']))
-    story.append(Spacer(1, 12))
-    
-    # Tambahkan metadata dasar file
-    metadata_box = []
-    metadata_box.append(f"<b>Nama File:</b> {Path(result.video_path).name}")
-    metadata_box.append(f"<b>Tanggal Analisis:</b> {datetime.now().strftime('%d %B %Y, %H:%M:%S')}")
-    metadata_box.append(f"<b>Hash SHA-256:</b> {result.preservation_hash[:20]}...")
-    
-    # Tambahkan informasi dimensi dan durasi jika tersedia
-    if result.metadata.get('Video Stream'):
-        video_stream = result.metadata['Video Stream']
-        if 'Resolution' in video_stream:
-            metadata_box.append(f"<b>Resolusi:</b> {video_stream['Resolution']}")
-        if 'Frame Rate' in video_stream:
-            metadata_box.append(f"<b>Frame Rate:</b> {video_stream['Frame Rate']}")
-        if 'Duration' in result.metadata.get('Format', {}):
-            metadata_box.append(f"<b>Durasi:</b> {result.metadata['Format']['Duration']}")
-    
-    metadata_str = "<br/>".join(metadata_box)
-    story.append(Paragraph(f"<i>{metadata_str}</i>", styles['HighlightBox']))
-    story.append(Spacer(1, 24))
-
-    # --- RINGKASAN EKSEKUTIF ---
-    story.append(Paragraph("Ringkasan Eksekutif", styles['h2']))
-
-    reliability_assessment = result.forensic_evidence_matrix.get('conclusion', {}).get('reliability_assessment', 'Tidak Dapat Ditentukan')
-    summary_text = (f"Analisis komprehensif terhadap file <b>{Path(result.video_path).name}</b> telah selesai. "
-                    f"Berdasarkan <b>{len(result.localizations)} peristiwa anomali</b> yang terdeteksi, analisis "
-                    f"<b>Matriks Keandalan Bukti Forensik (FERM)</b> menghasilkan penilaian: <b>{reliability_assessment}</b>. "
-                    f"Metode utama yang digunakan adalah <b>Klasterisasi K-Means</b> dan <b>Localization Tampering</b> dengan dukungan "
-                    f"metode pendukung <b>Error Level Analysis (ELA)</b> dan <b>Scale-Invariant Feature Transform (SIFT)</b>.")
-    story.append(Paragraph(summary_text, styles['Justify']))
-    story.append(Spacer(1, 12))
-    
-    # Tambahkan disclaimer profesional
-    story.append(Paragraph("""<i><b>CATATAN PENTING:</b> Hasil analisis yang disajikan dalam laporan ini adalah produk dari sistem otomatis 
-                          forensik video. Meskipun dirancang menggunakan metodologi dan algoritma ilmiah, 
-                          semua temuan harus divalidasi dan diinterpretasikan lebih lanjut oleh ahli 
-                          forensik video yang berkualifikasi. Sistem hanya dapat mengidentifikasi anomali 
-                          berdasarkan pola statistik dan visual; interpretasi akhir tentang implikasi 
-                          forensik dan konteks faktual dari anomali tersebut memerlukan penilaian manusia.</i>""", 
-                          styles['DisclaimerBox']))
-    story.append(Spacer(1, 12))
-    
-    # Tambahkan ringkasan temuan kunci
-    if result.localizations:
-        story.append(Paragraph("<b>Temuan Kunci:</b>", styles['Normal']))
-        for atype, count in {k: sum(1 for loc in result.localizations if loc['event'] == f"anomaly_{k}") for k in ['duplication', 'insertion', 'discontinuity']}.items():
-            if count > 0:
-                story.append(Paragraph(f"• <b>{count} peristiwa {atype.capitalize()}</b> terdeteksi", styles['Normal']))
-    else:
-        story.append(Paragraph("<b>Temuan Kunci:</b> Tidak ditemukan anomali yang signifikan.", styles['Normal']))
-    
-    story.append(PageBreak())
-
-    # --- METODOLOGI DFRWS ---
-    story.append(Paragraph("Metodologi Analisis: Digital Forensics Research Workshop (DFRWS)", styles['h2']))
-    story.append(Paragraph("""Analisis forensik video ini menggunakan kerangka kerja Digital Forensics Research Workshop (DFRWS), 
-                          yang merupakan metodologi standar di bidang forensik digital. Kerangka kerja ini terdiri dari enam 
-                          tahap yang memastikan proses analisis yang sistematis, ilmiah, dan dapat dipertanggungjawabkan.""", styles['Justify']))
-    
-    # Buat tabel metodologi DFRWS
-    dfrws_data = [["<b>Tahap</b>", "<b>Implementasi dalam Analisis</b>"]]
-    for phase in range(1, 7):
-        dfrws_data.append([f"<b>{phase}. {get_dfrws_phase_explanation(phase).split('</b>')[0]}</b>", 
-                         get_dfrws_phase_explanation(phase).split("analisis ini,")[1].strip()])
-    
-    story.append(Table(dfrws_data, colWidths=[100, 280], style=TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.darkblue),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-        ('FONTNAME', (0,1), (0,-1), 'Helvetica-Bold')
-    ])))
-    
-    story.append(Spacer(1, 12))
-    story.append(Paragraph("""Laporan ini mengikuti struktur tahapan DFRWS, dengan setiap bagian selanjutnya mencerminkan tahap spesifik 
-                          dalam proses analisis forensik. Pembaca dapat melihat alur kerja analisis dari identifikasi awal 
-                          hingga pelaporan hasil akhir.""", styles['Justify']))
-    
-    story.append(PageBreak())
-    story.append(Paragraph("Detail Laporan Berdasarkan Tahapan Forensik", styles['h1']))
-
-    # --- TAHAP 1 PDF ---
-    story.append(Paragraph("Tahap 1: Identifikasi, Preservasi, dan Pengumpulan", styles['h2']))
-    story.append(Paragraph("""Tahap awal ini mencakup tiga elemen pertama dari metodologi DFRWS. Pada tahap ini, 
-                          sistem mengidentifikasi bukti video, menjaga integritasnya melalui hashing, dan mengumpulkan 
-                          data frame dari video untuk analisis selanjutnya.""", styles['Justify']))
-    
-    story.append(Paragraph("<b>1.1. Identifikasi & Preservasi Bukti</b>", styles['SectionHeader']))
-    story.append(Paragraph("""Identifikasi bukti melibatkan pengumpulan metadata komprehensif dari file video, 
-                          termasuk informasi teknis seperti codec, format, dan metadata tambahan yang mungkin 
-                          tersimpan dalam file. Preservasi dilakukan dengan menghitung nilai hash SHA-256 
-                          yang berfungsi sebagai 'sidik jari digital' untuk memverifikasi bahwa 
-                          file tidak berubah selama proses analisis.""", styles['Justify']))
-
-    # Tampilkan tabel metadata yang lebih rapi dan informatif
-    metadata_table_data = [["<b>Kategori</b>", "<b>Item</b>", "<b>Nilai</b>"]]
-    for category, items in result.metadata.items():
-        for i, (key, value) in enumerate(items.items()):
-            cat_name = f"<b>{category}</b>" if i == 0 else ""
-            metadata_table_data.append([Paragraph(cat_name, styles['Normal']), Paragraph(key, styles['Normal']), Paragraph(f"<code>{value}</code>", styles['Code'])])
-
-    table_style_cmds = [('BACKGROUND', (0,0), (-1,0), colors.darkblue),('TEXTCOLOR', (0,0), (-1,0), colors.white),('GRID', (0,0), (-1,-1), 0.5, colors.grey),('VALIGN', (0,0), (-1,-1), 'TOP')]
-    current_row = 1
-    for category, items in result.metadata.items():
-        if items and len(items) > 1: table_style_cmds.append(('SPAN', (0, current_row), (0, current_row + len(items) - 1)))
-        current_row += len(items)
-    story.append(Table(metadata_table_data, colWidths=[60, 100, 220], style=TableStyle(table_style_cmds)))
-    
-    # Tampilkan hash preservasi secara jelas
-    story.append(Spacer(1, 8))
-    story.append(Paragraph(f"<b>Hash SHA-256 Preservasi:</b> {result.preservation_hash}", styles['HighlightBox']))
-    story.append(Spacer(1, 12))
-
-    story.append(Paragraph("<b>1.2. Pengumpulan: Ekstraksi dan Normalisasi Frame</b>", styles['SectionHeader']))
-    story.append(Paragraph("""Sistem mengekstrak frame-frame pada interval reguler dari video. Setiap frame kemudian 
-                          dinormalisasi menggunakan histogram equalization untuk meningkatkan konsistensi analisis. 
-                          Normalisasi ini membantu mengurangi efek dari kondisi pencahayaan yang berbeda-beda 
-                          dan memungkinkan perbandingan yang lebih andal antara frame.""", styles['Justify']))
-    
-    # Penjelasan untuk orang awam
-    story.append(Paragraph("""<b>Penjelasan Sederhana:</b> Bayangkan Anda memiliki foto yang sebagian terlalu gelap dan sebagian terlalu terang. 
-                          Normalisasi adalah seperti 'menyeimbangkan' foto tersebut agar semua detail terlihat jelas, 
-                          seperti penyesuaian otomatis di aplikasi foto. Ini membuat sistem dapat 'melihat' lebih baik 
-                          perbedaan antara frame-frame video.""", styles['SimplifiedExplanation']))
-    
-    # Tampilkan contoh frame yang dinormalisasi
-    if result.frames and result.frames[0].img_path_comparison and Path(result.frames[0].img_path_comparison).exists():
-        story.append(PlatypusImage(result.frames[0].img_path_comparison, width=380, height=107, kind='proportional'))
-        story.append(Paragraph("Perbandingan frame asli (kiri) dengan frame yang telah dinormalisasi (kanan). Normalisasi meningkatkan kontras dan detail visual untuk analisis yang lebih konsisten.", styles['Caption']))
-    story.append(Spacer(1, 12))
-
-    story.append(Paragraph("<b>1.3. Metode Utama: Analisis Klasterisasi K-Means</b>", styles['SectionHeader']))
-    story.append(Paragraph("""Teknik K-Means digunakan untuk mengelompokkan frame-frame berdasarkan distribusi warna dominan mereka. 
-                          Ini memungkinkan sistem untuk mendeteksi perubahan adegan atau transisi visual yang signifikan.
-                          Setiap frame diklasifikasikan ke dalam salah satu dari beberapa 'klaster warna', dan perubahan
-                          mendadak dalam keanggotaan klaster dapat menandakan diskontinuitas video.""", styles['Justify']))
-    
-    # Penjelasan untuk orang awam
-    story.append(Paragraph("""<b>Penjelasan Sederhana:</b> K-Means bekerja seperti mengelompokkan foto-foto berdasarkan warna dominannya. 
-                          Misalnya, foto pantai dengan banyak biru dan putih akan masuk satu kelompok, sementara foto hutan dengan 
-                          dominasi hijau akan masuk kelompok lain. Jika dalam video terjadi perpindahan tiba-tiba dari satu kelompok 
-                          warna ke kelompok lain, ini mungkin menandakan adanya 'potongan' atau editing.""", styles['SimplifiedExplanation']))
-    
-    # Tampilkan distribusi K-Means
-    if result.kmeans_artifacts.get('distribution_plot_path') and Path(result.kmeans_artifacts['distribution_plot_path']).exists():
-        story.append(PlatypusImage(result.kmeans_artifacts['distribution_plot_path'], width=320, height=117, kind='proportional'))
-        story.append(Paragraph("Distribusi jumlah frame untuk setiap klaster warna yang teridentifikasi oleh algoritma K-Means.", styles['Caption']))
-    story.append(Spacer(1, 12))
-    
-    # Detail klaster yang ditemukan
-    story.append(Paragraph("<b>Detail Setiap Klaster Warna:</b>", styles['Normal']))
-    for cluster_info in result.kmeans_artifacts.get('clusters', []):
-        story.append(Paragraph(f"<b>Klaster {cluster_info['id']}</b> ({cluster_info['count']} frame)", styles['H3-Box']))
-
-        palette_img = PlatypusImage(cluster_info['palette_path'], width=150, height=38) if cluster_info.get('palette_path') and Path(cluster_info['palette_path']).exists() else Paragraph("N/A", styles['Normal'])
-        samples_img = PlatypusImage(cluster_info['samples_montage_path'], width=230, height=41) if cluster_info.get('samples_montage_path') and Path(cluster_info['samples_montage_path']).exists() else Paragraph("N/A", styles['Normal'])
-
-        cluster_data = [[Paragraph("Palet Warna Dominan", styles['Normal']), Paragraph("Contoh Frame (Asli)", styles['Normal'])],
-                        [palette_img, samples_img]]
-        story.append(Table(cluster_data, colWidths=[150, 230], style=TableStyle([('VALIGN', (0,0), (-1,-1), 'MIDDLE'), ('ALIGN', (0,0), (-1,-1), 'CENTER')])))
-        story.append(Spacer(1, 6))
-
-        # Interpretasi klaster
-        if cluster_info.get('count') > 0:
-            proportion = cluster_info['count'] / sum(c.get('count', 0) for c in result.kmeans_artifacts.get('clusters', []))
-            story.append(Paragraph(f"<i>Interpretasi: Klaster ini mewakili sekitar {proportion*100:.1f}% dari seluruh frame video, menunjukkan adegan dengan karakteristik warna yang konsisten.</i>", styles['Caption']))
-
-    story.append(PageBreak())
-
-    # --- TAHAP 2 PDF ---
-    story.append(Paragraph("Tahap 2: Pemeriksaan - Analisis Anomali Temporal", styles['h2']))
-    story.append(Paragraph("""Tahap ini melibatkan pemeriksaan mendalam terhadap hubungan antar frame berurutan 
-                          untuk mendeteksi diskontinuitas, pola yang tidak wajar, atau perubahan mendadak yang 
-                          dapat mengindikasikan manipulasi. Sistem menggunakan tiga metrik utama untuk analisis 
-                          temporal: perubahan klaster warna K-Means sepanjang waktu, kemiripan struktural (SSIM), 
-                          dan analisis aliran optik.""", styles['Justify']))
-    
-    story.append(Paragraph("<b>2.1. Visualisasi Klasterisasi K-Means Sepanjang Waktu</b>", styles['SectionHeader']))
-    story.append(Paragraph("""Visualisasi ini menunjukkan bagaimana frame-frame dikelompokkan ke dalam klaster warna 
-                          berbeda sepanjang alur video. Perpindahan mendadak dari satu klaster ke klaster lain 
-                          dapat mengindikasikan perubahan adegan yang tajam atau diskontinuitas dalam aliran visual.""", styles['Justify']))
-    
-    # Penjelasan untuk orang awam
-    story.append(Paragraph("""<b>Penjelasan Sederhana:</b> Grafik ini menunjukkan 'kelompok warna' untuk setiap frame dalam 
-                          video. Dalam video normal, perubahan kelompok biasanya terjadi secara bertahap atau pada momen 
-                          perpindahan adegan yang jelas. Lompatan tiba-tiba yang tidak teratur bisa menandakan bahwa 
-                          sebagian video telah dipotong atau ditambahkan.""", styles['SimplifiedExplanation']))
-    
-    # Tampilkan plot K-Means temporal
-    if result.plots.get('kmeans_temporal') and Path(result.plots['kmeans_temporal']).exists():
-        story.append(PlatypusImage(result.plots['kmeans_temporal'], width=380, height=142, kind='proportional'))
-        story.append(Paragraph("Visualisasi temporal klaster K-Means. Garis vertikal merah menandakan perpindahan klaster warna yang dapat mengindikasikan perubahan adegan.", styles['Caption']))
-    story.append(Spacer(1, 12))
-
-    story.append(Paragraph("<b>2.2. Analisis Structural Similarity Index (SSIM)</b>", styles['SectionHeader']))
-    story.append(Paragraph("""SSIM mengukur kemiripan struktural antara frame-frame berurutan. Nilai SSIM berkisar 
-                          dari 0 hingga 1, di mana 1 berarti identik sempurna dan 0 berarti tidak ada kemiripan sama sekali. 
-                          Penurunan tajam pada skor SSIM mengindikasikan perubahan visual yang signifikan yang bisa 
-                          menjadi tanda diskontinuitas atau manipulasi.""", styles['Justify']))
-    
-    # Penjelasan untuk orang awam
-    story.append(Paragraph("""<b>Penjelasan Sederhana:</b> SSIM adalah seperti mengukur seberapa mirip dua gambar berurutan. 
-                          Dalam video normal, frame berurutan biasanya sangat mirip, dengan perubahan kecil karena pergerakan. 
-                          Jika tiba-tiba dua frame berurutan sangat berbeda (nilai SSIM turun drastis), ini bisa menandakan 
-                          ada 'lompatan' tidak wajar dalam video - seperti halaman yang hilang dari buku.""", styles['SimplifiedExplanation']))
-    
-    # Tampilkan plot SSIM
-    if result.plots.get('ssim_temporal') and Path(result.plots['ssim_temporal']).exists():
-        story.append(PlatypusImage(result.plots['ssim_temporal'], width=380, height=142, kind='proportional'))
-        story.append(Paragraph("Grafik SSIM sepanjang video. Titik merah menandakan lokasi di mana terjadi penurunan SSIM yang mencurigakan.", styles['Caption']))
-    story.append(Spacer(1, 12))
-
-    story.append(Paragraph("<b>2.3. Analisis Aliran Optik (Optical Flow)</b>", styles['SectionHeader']))
-    story.append(Paragraph("""Aliran Optik mengukur pergerakan piksel antara frame berurutan, memungkinkan sistem 
-                          mendeteksi perubahan gerakan yang tidak wajar. Lonjakan besar dalam magnitudo aliran optik 
-                          dapat mengindikasikan transisi tajam yang tidak alami atau perpindahan konten yang mendadak.""", styles['Justify']))
-    
-    # Penjelasan untuk orang awam
-    story.append(Paragraph("""<b>Penjelasan Sederhana:</b> Aliran Optik mengukur 'gerakan' antara dua frame. Bayangkan 
-                          melacak gerakan objek atau kamera dari satu frame ke frame berikutnya. Dalam video asli, 
-                          gerakan biasanya mulus dan konsisten. Lonjakan besar berarti gerakan tiba-tiba yang tidak wajar, 
-                          seperti orang yang 'melompat' posisinya tanpa gerakan perantara - tanda potensial adanya 
-                          pemotongan atau penyuntingan.""", styles['SimplifiedExplanation']))
-    
-    # Tampilkan plot Optical Flow
-    if result.plots.get('optical_flow_temporal') and Path(result.plots['optical_flow_temporal']).exists():
-        story.append(PlatypusImage(result.plots['optical_flow_temporal'], width=380, height=142, kind='proportional'))
-        story.append(Paragraph("Grafik magnitudo Aliran Optik sepanjang video. Titik hijau menandakan lokasi dengan lonjakan gerakan yang tidak wajar.", styles['Caption']))
-    story.append(Spacer(1, 12))
-
-    # Jika ada analisis baseline, tampilkan juga
-    if baseline_result:
-        story.append(Paragraph("<b>2.4. Analisis Komparatif dengan Video Baseline</b>", styles['SectionHeader']))
-        insertion_events_count = len([loc for loc in result.localizations if loc['event'] == 'anomaly_insertion'])
-        story.append(Paragraph(f"Analisis ini membandingkan video yang diperiksa dengan video baseline yang dianggap sebagai referensi asli. Sistem mendeteksi <b>{insertion_events_count} peristiwa penyisipan</b> yang menunjukkan adanya frame-frame yang tidak ada dalam video baseline.", styles['Justify']))
+    def story_sections():
+        """Membangun story per bagian; setiap bagian (dipisah PageBreak) di-yield agar dapat
+        langsung ditata ke dokumen lalu dilepas dari memori."""
+        story = []
+        # --- HALAMAN SAMPUL ---
+        story.append(Paragraph("Laporan Analisis Forensik Video", styles['h1']))
+        story.append(Paragraph("Dihasilkan oleh Sistem VIFA-Pro", styles['SubTitle']))
+        story.append(Spacer(1, 12))
         
-        # Penjelasan untuk orang awam
-        story.append(Paragraph("""<b>Penjelasan Sederhana:</b> Ini seperti membandingkan dua dokumen untuk menemukan kalimat 
-                             yang ditambahkan. Sistem membandingkan setiap frame video dengan video baseline (asli) untuk 
-                             menemukan frame yang 'baru' dan tidak seharusnya ada di sana. Ini adalah bukti kuat adanya 
-                             manipulasi karena frame-frame tersebut jelas ditambahkan setelah perekaman asli.""", styles['SimplifiedExplanation']))
-
-    # Distribusi metrik sebagai histogram
-    if result.plots.get('metrics_histograms') and Path(result.plots['metrics_histograms']).exists():
-        story.append(Paragraph("<b>2.5. Distribusi Statistik Metrik Temporal</b>", styles['SectionHeader']))
-        story.append(Paragraph("""Histogram di bawah ini menunjukkan distribusi statistik dari nilai SSIM dan Aliran Optik 
-                             di seluruh video. Distribusi ini membantu mengidentifikasi nilai-nilai yang menonjol dari 
-                             pola normal, yang dapat mengindikasikan anomali.""", styles['Justify']))
-        story.append(PlatypusImage(result.plots['metrics_histograms'], width=380, height=110, kind='proportional'))
-        story.append(Paragraph("Histogram distribusi nilai SSIM (kiri) dan Aliran Optik (kanan). Nilai yang sangat jauh dari distribusi utama sering mengindikasikan anomali.", styles['Caption']))
-
-    story.append(PageBreak())
-
-    # --- TAHAP 3 PDF ---
-    story.append(Paragraph("Tahap 3: Analisis - Investigasi Detail Anomali", styles['h2']))
-    story.append(Paragraph("""Tahap ini menyatukan temuan dari analisis temporal untuk mengidentifikasi, mengkarakterisasi, 
-                          dan menginvestigasi anomali-anomali potensial secara mendalam. Sistem menerapkan metode pendukung 
-                          seperti Error Level Analysis (ELA) dan Scale-Invariant Feature Transform (SIFT) untuk 
-                          memeriksa frame-frame mencurigakan dengan lebih detail.""", styles['Justify']))
-
-    # Tambahkan ringkasan statistik
-    if result.statistical_summary:
-        story.append(Paragraph("<b>3.1. Ringkasan Statistik Investigasi</b>", styles['SectionHeader']))
-        story.append(Paragraph("""Statistik di bawah ini memberikan gambaran komprehensif tentang hasil analisis forensik, 
-                             termasuk jumlah anomali, proporsinya dalam video, dan bagaimana anomali tersebut 
-                             dikelompokkan secara temporal.""", styles['Justify']))
-        
-        stats_table = [
-            ["<b>Metrik</b>", "<b>Nilai</b>", "<b>Interpretasi</b>"],
-            ["Total Frame Dianalisis", str(result.statistical_summary['total_frames_analyzed']), "Jumlah total frame video yang diperiksa"],
-            ["Total Anomali Terdeteksi", str(result.statistical_summary['total_anomalies']), "Jumlah frame yang menunjukkan tanda-tanda manipulasi"],
-            ["Persentase Anomali", f"{result.statistical_summary.get('total_anomalies', 0)/result.statistical_summary.get('total_frames_analyzed', 1)*100:.1f}%", "Proporsi frame anomali terhadap seluruh video"],
-            ["Kluster Temporal Anomali", str(result.statistical_summary['temporal_clusters']), "Jumlah kelompok anomali yang terjadi berdekatan"],
-            ["Rata-rata Anomali per Kluster", f"{result.statistical_summary.get('average_anomalies_per_cluster', 0):.1f}", "Rata-rata jumlah anomali dalam satu kelompok"]
-        ]
-        story.append(Table(stats_table, colWidths=[130, 70, 180], style=TableStyle([
+        # Tambahkan metadata dasar file
+        metadata_box = []
+        metadata_box.append(f"<b>Nama File:</b> {video_name_markup}")
+        metadata_box.append(f"<b>Tanggal Analisis:</b> {report_time_long}")
+        metadata_box.append(f"<b>Hash SHA-256:</b> {result.preservation_hash[:20]}...")
+        
+        # Tambahkan informasi dimensi dan durasi jika tersedia
+        if result.metadata.get('Video Stream'):
+            video_stream = result.metadata['Video Stream']
+            if 'Resolution' in video_stream:
+                metadata_box.append(f"<b>Resolusi:</b> {video_stream['Resolution']}")
+            if 'Frame Rate' in video_stream:
+                metadata_box.append(f"<b>Frame Rate:</b> {video_stream['Frame Rate']}")
+            if 'Duration' in result.metadata.get('Format', {}):
+                metadata_box.append(f"<b>Durasi:</b> {result.metadata['Format']['Duration']}")
+        
+        metadata_str = "<br/>".join(metadata_box)
+        story.append(Paragraph(f"<i>{metadata_str}</i>", styles['HighlightBox']))
+        story.append(Spacer(1, 24))
+
+        # --- RINGKASAN EKSEKUTIF ---
+        story.append(Paragraph("Ringkasan Eksekutif", styles['h2']))
+
+        reliability_assessment = result.forensic_evidence_matrix.get('conclusion', {}).get('reliability_assessment', 'Tidak Dapat Ditentukan')
+        summary_text = (f"Analisis komprehensif terhadap file <b>{video_name_markup}</b> telah selesai. "
+                        f"Berdasarkan <b>{len(result.localizations)} peristiwa anomali</b> yang terdeteksi, analisis "
+                        f"<b>Matriks Keandalan Bukti Forensik (FERM)</b> menghasilkan penilaian: <b>{reliability_assessment}</b>. "
+                        f"Metode utama yang digunakan adalah <b>Klasterisasi K-Means</b> dan <b>Localization Tampering</b> dengan dukungan "
+                        f"metode pendukung <b>Error Level Analysis (ELA)</b> dan <b>Scale-Invariant Feature Transform (SIFT)</b>.")
+        story.append(Paragraph(summary_text, styles['Justify']))
+        story.append(Spacer(1, 12))
+        
+        # Tambahkan disclaimer profesional
+        story.append(Paragraph("""<i><b>CATATAN PENTING:</b> Hasil analisis yang disajikan dalam laporan ini adalah produk dari sistem otomatis 
+                              forensik video. Meskipun dirancang menggunakan metodologi dan algoritma ilmiah, 
+                              semua temuan harus divalidasi dan diinterpretasikan lebih lanjut oleh ahli 
+                              forensik video yang berkualifikasi. Sistem hanya dapat mengidentifikasi anomali 
+                              berdasarkan pola statistik dan visual; interpretasi akhir tentang implikasi 
+                              forensik dan konteks faktual dari anomali tersebut memerlukan penilaian manusia.</i>""", 
+                              styles['DisclaimerBox']))
+        story.append(Spacer(1, 12))
+        
+        # Tambahkan ringkasan temuan kunci
+        event_counts = Counter(loc['event'] for loc in result.localizations)
+        if result.localizations:
+            story.append(Paragraph("<b>Temuan Kunci:</b>", styles['Normal']))
+            for atype in ('duplication', 'insertion', 'discontinuity'):
+                count = event_counts.get(f'anomaly_{atype}', 0)
+                if count > 0:
+                    story.append(Paragraph(f"• <b>{count} peristiwa {atype.capitalize()}</b> terdeteksi", styles['Normal']))
+        else:
+            story.append(Paragraph("<b>Temuan Kunci:</b> Tidak ditemukan anomali yang signifikan.", styles['Normal']))
+        
+        story.append(PageBreak())
+        yield story
+        story = []
+
+        # --- METODOLOGI DFRWS ---
+        story.append(Paragraph("Metodologi Analisis: Digital Forensics Research Workshop (DFRWS)", styles['h2']))
+        story.append(Paragraph("""Analisis forensik video ini menggunakan kerangka kerja Digital Forensics Research Workshop (DFRWS), 
+                              yang merupakan metodologi standar di bidang forensik digital. Kerangka kerja ini terdiri dari enam 
+                              tahap yang memastikan proses analisis yang sistematis, ilmiah, dan dapat dipertanggungjawabkan.""", styles['Justify']))
+        
+        # Buat tabel metodologi DFRWS
+        dfrws_data = [["<b>Tahap</b>", "<b>Implementasi dalam Analisis</b>"]]
+        for phase, (phase_title, phase_impl) in _DFRWS_PARSED.items():
+            dfrws_data.append([f"<b>{phase}. {phase_title}</b>", phase_impl])
+        
+        story.append(Table(dfrws_data, colWidths=[100, 280], style=TableStyle([
             ('BACKGROUND', (0,0), (-1,0), colors.darkblue),
             ('TEXTCOLOR', (0,0), (-1,0), colors.white),
             ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
             ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-            ('VALIGN', (0,0), (-1,-1), 'MIDDLE')
+            ('FONTNAME', (0,1), (0,-1), 'Helvetica-Bold')
         ])))
+        
         story.append(Spacer(1, 12))
+        story.append(Paragraph("""Laporan ini mengikuti struktur tahapan DFRWS, dengan setiap bagian selanjutnya mencerminkan tahap spesifik 
+                              dalam proses analisis forensik. Pembaca dapat melihat alur kerja analisis dari identifikasi awal 
+                              hingga pelaporan hasil akhir.""", styles['Justify']))
+        
+        story.append(PageBreak())
+        yield story
+        story = []
+        story.append(Paragraph("Detail Laporan Berdasarkan Tahapan Forensik", styles['h1']))
+
+        # --- TAHAP 1 PDF ---
+        story.append(Paragraph("Tahap 1: Identifikasi, Preservasi, dan Pengumpulan", styles['h2']))
+        story.append(Paragraph("""Tahap awal ini mencakup tiga elemen pertama dari metodologi DFRWS. Pada tahap ini, 
+                              sistem mengidentifikasi bukti video, menjaga integritasnya melalui hashing, dan mengumpulkan 
+                              data frame dari video untuk analisis selanjutnya.""", styles['Justify']))
+        
+        story.append(Paragraph("<b>1.1. Identifikasi & Preservasi Bukti</b>", styles['SectionHeader']))
+        story.append(Paragraph("""Identifikasi bukti melibatkan pengumpulan metadata komprehensif dari file video, 
+                              termasuk informasi teknis seperti codec, format, dan metadata tambahan yang mungkin 
+                              tersimpan dalam file. Preservasi dilakukan dengan menghitung nilai hash SHA-256 
+                              yang berfungsi sebagai 'sidik jari digital' untuk memverifikasi bahwa 
+                              file tidak berubah selama proses analisis.""", styles['Justify']))
+
+        # Tampilkan tabel metadata yang lebih rapi dan informatif
+        # Sel kategori lanjutan (kosong) berbagi satu Paragraph
+        empty_cell = Paragraph("", styles['Normal'])
+        metadata_table_data = [["<b>Kategori</b>", "<b>Item</b>", "<b>Nilai</b>"]] + [
+            [Paragraph(f"<b>{category}</b>", styles['Normal']) if i == 0 else empty_cell,
+             Paragraph(key, styles['Normal']),
+             Paragraph(escape(str(value)), styles['Code'])]
+            for category, items in result.metadata.items()
+            for i, (key, value) in enumerate(items.items())
+        ]
 
-    # Tampilkan visualisasi ringkasan anomali
-    if result.plots.get('anomaly_summary') and Path(result.plots['anomaly_summary']).exists():
-        story.append(Paragraph("<b>3.2. Visualisasi Ringkasan Anomali</b>", styles['SectionHeader']))
-        story.append(Paragraph("""Visualisasi di bawah ini memberikan gambaran komprehensif tentang distribusi jenis 
-                             anomali, tingkat kepercayaan deteksi, dan bagaimana anomali tersebut terdistribusi 
-                             sepanjang timeline video.""", styles['Justify']))
-        story.append(PlatypusImage(result.plots['anomaly_summary'], width=380, height=255, kind='proportional'))
-        story.append(Paragraph("Ringkasan visual analisis anomali, menunjukkan distribusi jenis anomali, tingkat kepercayaan, timeline, dan statistik kunci.", styles['Caption']))
+        table_style_cmds = [('BACKGROUND', (0,0), (-1,0), colors.darkblue),('TEXTCOLOR', (0,0), (-1,0), colors.white),('GRID', (0,0), (-1,-1), 0.5, colors.grey),('VALIGN', (0,0), (-1,-1), 'TOP')]
+        item_counts = [len(items) for items in result.metadata.values()]
+        table_style_cmds.extend(('SPAN', (0, start), (0, start + n - 1))
+                                for start, n in zip(accumulate([1] + item_counts), item_counts) if n > 1)
+        story.append(Table(metadata_table_data, colWidths=[60, 100, 220], style=TableStyle(table_style_cmds)))
+        
+        # Tampilkan hash preservasi secara jelas
+        story.append(Spacer(1, 8))
+        story.append(Paragraph(f"<b>Hash SHA-256 Preservasi:</b> {result.preservation_hash}", styles['HighlightBox']))
         story.append(Spacer(1, 12))
 
-    # Detail setiap peristiwa anomali
-    if not result.localizations:
-        story.append(Paragraph("<b>3.3. Investigasi Anomali</b>", styles['SectionHeader']))
-        story.append(Paragraph("Tidak ditemukan anomali signifikan dalam video ini.", styles['Justify']))
-    else:
-        story.append(Paragraph("<b>3.3. Detail Setiap Peristiwa Anomali</b>", styles['SectionHeader']))
-        story.append(Paragraph(f"""Analisis menemukan <b>{len(result.localizations)} peristiwa anomali</b> dalam video. 
-                             Setiap peristiwa mewakili sekelompok frame berurutan yang menunjukkan karakteristik 
-                             serupa yang mengindikasikan potensi manipulasi. Detail setiap peristiwa 
-                             dan bukti pendukungnya diuraikan di bawah ini.""", styles['Justify']))
-
-        for i, loc in enumerate(result.localizations):
-            event_type = loc.get('event', 'unknown').replace('anomaly_', '').capitalize()
-            confidence = loc.get('confidence', 'N/A')
-
-            story.append(Paragraph(f"<b>Peristiwa #{i+1}: {event_type}</b> @ {loc.get('start_ts',0):.2f} - {loc.get('end_ts',0):.2f} detik", styles['H3-Box']))
-            story.append(Paragraph(f"<b>Durasi:</b> {loc.get('duration', 0):.2f} detik | <b>Tingkat Keparahan:</b> {loc.get('severity_score', 0):.2f}/1.0 | <b>Kepercayaan:</b> {confidence}", styles['Normal']))
+        story.append(Paragraph("<b>1.2. Pengumpulan: Ekstraksi dan Normalisasi Frame</b>", styles['SectionHeader']))
+        story.append(Paragraph("""Sistem mengekstrak frame-frame pada interval reguler dari video. Setiap frame kemudian 
+                              dinormalisasi menggunakan histogram equalization untuk meningkatkan konsistensi analisis. 
+                              Normalisasi ini membantu mengurangi efek dari kondisi pencahayaan yang berbeda-beda 
+                              dan memungkinkan perbandingan yang lebih andal antara frame.""", styles['Justify']))
+        
+        # Penjelasan untuk orang awam
+        story.append(Paragraph("""<b>Penjelasan Sederhana:</b> Bayangkan Anda memiliki foto yang sebagian terlalu gelap dan sebagian terlalu terang. 
+                              Normalisasi adalah seperti 'menyeimbangkan' foto tersebut agar semua detail terlihat jelas, 
+                              seperti penyesuaian otomatis di aplikasi foto. Ini membuat sistem dapat 'melihat' lebih baik 
+                              perbedaan antara frame-frame video.""", styles['SimplifiedExplanation']))
+        
+        # Tampilkan contoh frame yang dinormalisasi
+        comparison_img_path = (getattr(result.frames[0], 'img_path_comparison_thumb', None) or result.frames[0].img_path_comparison) if result.frames else None
+        if comparison_img_path and artifact_exists(comparison_img_path):
+            story.append(report_image(comparison_img_path, width=380, height=107, kind='proportional'))
+            story.append(Paragraph("Perbandingan frame asli (kiri) dengan frame yang telah dinormalisasi (kanan). Normalisasi meningkatkan kontras dan detail visual untuk analisis yang lebih konsisten.", styles['Caption']))
+        story.append(Spacer(1, 12))
+
+        story.append(Paragraph("<b>1.3. Metode Utama: Analisis Klasterisasi K-Means</b>", styles['SectionHeader']))
+        story.append(Paragraph("""Teknik K-Means digunakan untuk mengelompokkan frame-frame berdasarkan distribusi warna dominan mereka. 
+                              Ini memungkinkan sistem untuk mendeteksi perubahan adegan atau transisi visual yang signifikan.
+                              Setiap frame diklasifikasikan ke dalam salah satu dari beberapa 'klaster warna', dan perubahan
+                              mendadak dalam keanggotaan klaster dapat menandakan diskontinuitas video.""", styles['Justify']))
+        
+        # Penjelasan untuk orang awam
+        story.append(Paragraph("""<b>Penjelasan Sederhana:</b> K-Means bekerja seperti mengelompokkan foto-foto berdasarkan warna dominannya. 
+                              Misalnya, foto pantai dengan banyak biru dan putih akan masuk satu kelompok, sementara foto hutan dengan 
+                              dominasi hijau akan masuk kelompok lain. Jika dalam video terjadi perpindahan tiba-tiba dari satu kelompok 
+                              warna ke kelompok lain, ini mungkin menandakan adanya 'potongan' atau editing.""", styles['SimplifiedExplanation']))
+        
+        # Tampilkan distribusi K-Means
+        if result.kmeans_artifacts.get('distribution_plot_path') and artifact_exists(result.kmeans_artifacts['distribution_plot_path']):
+            story.append(report_image(result.kmeans_artifacts['distribution_plot_path'], width=320, height=117, kind='proportional'))
+            story.append(Paragraph("Distribusi jumlah frame untuk setiap klaster warna yang teridentifikasi oleh algoritma K-Means.", styles['Caption']))
+        story.append(Spacer(1, 12))
+        
+        # Detail klaster yang ditemukan
+        story.append(Paragraph("<b>Detail Setiap Klaster Warna:</b>", styles['Normal']))
+        kmeans_clusters = result.kmeans_artifacts.get('clusters', [])
+        total_cluster_count = sum(c.get('count', 0) for c in kmeans_clusters) or 1
+        for cluster_info in kmeans_clusters:
+            story.append(Paragraph(f"<b>Klaster {cluster_info['id']}</b> ({cluster_info['count']} frame)", styles['H3-Box']))
+
+            palette_img = report_image(cluster_info['palette_path'], width=150, height=38) if cluster_info.get('palette_path') and artifact_exists(cluster_info['palette_path']) else Paragraph("N/A", styles['Normal'])
+            samples_path = cluster_info.get('samples_montage_thumb_path') or cluster_info.get('samples_montage_path')
+            samples_img = report_image(samples_path, width=230, height=41) if samples_path and artifact_exists(samples_path) else Paragraph("N/A", styles['Normal'])
+
+            cluster_data = [[Paragraph("Palet Warna Dominan", styles['Normal']), Paragraph("Contoh Frame (Asli)", styles['Normal'])],
+                            [palette_img, samples_img]]
+            story.append(Table(cluster_data, colWidths=[150, 230], style=TableStyle([('VALIGN', (0,0), (-1,-1), 'MIDDLE'), ('ALIGN', (0,0), (-1,-1), 'CENTER')])))
+            story.append(Spacer(1, 6))
+
+            # Interpretasi klaster
+            if cluster_info.get('count') > 0:
+                proportion = cluster_info['count'] / total_cluster_count
+                story.append(Paragraph(f"<i>Interpretasi: Klaster ini mewakili sekitar {proportion*100:.1f}% dari seluruh frame video, menunjukkan adegan dengan karakteristik warna yang konsisten.</i>", styles['Caption']))
+
+        story.append(PageBreak())
+        yield story
+        story = []
+
+        # --- TAHAP 2 PDF ---
+        story.append(Paragraph("Tahap 2: Pemeriksaan - Analisis Anomali Temporal", styles['h2']))
+        story.append(Paragraph("""Tahap ini melibatkan pemeriksaan mendalam terhadap hubungan antar frame berurutan 
+                              untuk mendeteksi diskontinuitas, pola yang tidak wajar, atau perubahan mendadak yang 
+                              dapat mengindikasikan manipulasi. Sistem menggunakan tiga metrik utama untuk analisis 
+                              temporal: perubahan klaster warna K-Means sepanjang waktu, kemiripan struktural (SSIM), 
+                              dan analisis aliran optik.""", styles['Justify']))
+        
+        story.append(Paragraph("<b>2.1. Visualisasi Klasterisasi K-Means Sepanjang Waktu</b>", styles['SectionHeader']))
+        story.append(Paragraph("""Visualisasi ini menunjukkan bagaimana frame-frame dikelompokkan ke dalam klaster warna 
+                              berbeda sepanjang alur video. Perpindahan mendadak dari satu klaster ke klaster lain 
+                              dapat mengindikasikan perubahan adegan yang tajam atau diskontinuitas dalam aliran visual.""", styles['Justify']))
+        
+        # Penjelasan untuk orang awam
+        story.append(Paragraph("""<b>Penjelasan Sederhana:</b> Grafik ini menunjukkan 'kelompok warna' untuk setiap frame dalam 
+                              video. Dalam video normal, perubahan kelompok biasanya terjadi secara bertahap atau pada momen 
+                              perpindahan adegan yang jelas. Lompatan tiba-tiba yang tidak teratur bisa menandakan bahwa 
+                              sebagian video telah dipotong atau ditambahkan.""", styles['SimplifiedExplanation']))
+        
+        # Tampilkan plot K-Means temporal
+        if result.plots.get('kmeans_temporal') and artifact_exists(result.plots['kmeans_temporal']):
+            story.append(report_image(result.plots['kmeans_temporal'], width=380, height=142, kind='proportional'))
+            story.append(Paragraph("Visualisasi temporal klaster K-Means. Garis vertikal merah menandakan perpindahan klaster warna yang dapat mengindikasikan perubahan adegan.", styles['Caption']))
+        story.append(Spacer(1, 12))
+
+        story.append(Paragraph("<b>2.2. Analisis Structural Similarity Index (SSIM)</b>", styles['SectionHeader']))
+        story.append(Paragraph("""SSIM mengukur kemiripan struktural antara frame-frame berurutan. Nilai SSIM berkisar 
+                              dari 0 hingga 1, di mana 1 berarti identik sempurna dan 0 berarti tidak ada kemiripan sama sekali. 
+                              Penurunan tajam pada skor SSIM mengindikasikan perubahan visual yang signifikan yang bisa 
+                              menjadi tanda diskontinuitas atau manipulasi.""", styles['Justify']))
+        
+        # Penjelasan untuk orang awam
+        story.append(Paragraph("""<b>Penjelasan Sederhana:</b> SSIM adalah seperti mengukur seberapa mirip dua gambar berurutan. 
+                              Dalam video normal, frame berurutan biasanya sangat mirip, dengan perubahan kecil karena pergerakan. 
+                              Jika tiba-tiba dua frame berurutan sangat berbeda (nilai SSIM turun drastis), ini bisa menandakan 
+                              ada 'lompatan' tidak wajar dalam video - seperti halaman yang hilang dari buku.""", styles['SimplifiedExplanation']))
+        
+        # Tampilkan plot SSIM
+        if result.plots.get('ssim_temporal') and artifact_exists(result.plots['ssim_temporal']):
+            story.append(report_image(result.plots['ssim_temporal'], width=380, height=142, kind='proportional'))
+            story.append(Paragraph("Grafik SSIM sepanjang video. Titik merah menandakan lokasi di mana terjadi penurunan SSIM yang mencurigakan.", styles['Caption']))
+        story.append(Spacer(1, 12))
+
+        story.append(Paragraph("<b>2.3. Analisis Aliran Optik (Optical Flow)</b>", styles['SectionHeader']))
+        story.append(Paragraph("""Aliran Optik mengukur pergerakan piksel antara frame berurutan, memungkinkan sistem 
+                              mendeteksi perubahan gerakan yang tidak wajar. Lonjakan besar dalam magnitudo aliran optik 
+                              dapat mengindikasikan transisi tajam yang tidak alami atau perpindahan konten yang mendadak.""", styles['Justify']))
+        
+        # Penjelasan untuk orang awam
+        story.append(Paragraph("""<b>Penjelasan Sederhana:</b> Aliran Optik mengukur 'gerakan' antara dua frame. Bayangkan 
+                              melacak gerakan objek atau kamera dari satu frame ke frame berikutnya. Dalam video asli, 
+                              gerakan biasanya mulus dan konsisten. Lonjakan besar berarti gerakan tiba-tiba yang tidak wajar, 
+                              seperti orang yang 'melompat' posisinya tanpa gerakan perantara - tanda potensial adanya 
+                              pemotongan atau penyuntingan.""", styles['SimplifiedExplanation']))
+        
+        # Tampilkan plot Optical Flow
+        if result.plots.get('optical_flow_temporal') and artifact_exists(result.plots['optical_flow_temporal']):
+            story.append(report_image(result.plots['optical_flow_temporal'], width=380, height=142, kind='proportional'))
+            story.append(Paragraph("Grafik magnitudo Aliran Optik sepanjang video. Titik hijau menandakan lokasi dengan lonjakan gerakan yang tidak wajar.", styles['Caption']))
+        story.append(Spacer(1, 12))
+
+        # Jika ada analisis baseline, tampilkan juga
+        if baseline_result:
+            story.append(Paragraph("<b>2.4. Analisis Komparatif dengan Video Baseline</b>", styles['SectionHeader']))
+            insertion_events_count = event_counts.get('anomaly_insertion', 0)
+            story.append(Paragraph(f"Analisis ini membandingkan video yang diperiksa dengan video baseline yang dianggap sebagai referensi asli. Sistem mendeteksi <b>{insertion_events_count} peristiwa penyisipan</b> yang menunjukkan adanya frame-frame yang tidak ada dalam video baseline.", styles['Justify']))
             
-            # Penjelasan lebih kaya
-            story.append(Paragraph("<b>Penjelasan Umum:</b>", styles['Normal']))
-            story.append(Paragraph(get_anomaly_explanation(event_type), styles['SimplifiedExplanation']))
-            story.append(Paragraph("<b>Implikasi Forensik:</b>", styles['Normal']))
-            story.append(Paragraph(get_anomaly_implication(event_type), styles['HighlightBox']))
-
-            # Penjelasan detail jika tersedia
-            if loc.get('explanations'):
-                story.append(Spacer(1, 6))
-                story.append(Paragraph("<b>Analisis Detail:</b>", styles['Normal']))
-                for exp_type, exp_data in loc['explanations'].items():
-                    if isinstance(exp_data, dict):
-                        story.append(Paragraph(f"<b>{exp_type.replace('_', ' ').title()}:</b>", styles['Normal']))
-                        if include_simple and exp_data.get('simple_explanation'):
-                            story.append(Paragraph(f"<i>Penjelasan Sederhana:</i> {exp_data['simple_explanation']}", styles['SimplifiedExplanation']))
-                            story.append(Spacer(1, 4))
-                        if include_technical and exp_data.get('technical_explanation'):
-                            story.append(Paragraph(f"<i>Penjelasan Teknis:</i> {exp_data['technical_explanation']}", styles['TechnicalExplanation']))
-                            story.append(Spacer(1, 4))
-
-            # Tabel bukti teknis
-            story.append(Paragraph("<b>Bukti Teknis Pendukung:</b>", styles['Normal']))
-            tech_data = [["<b>Metrik</b>", "<b>Nilai</b>", "<b>Interpretasi</b>"]]
-            tech_data.append(["Tingkat Kepercayaan", f"<b>{confidence}</b>", "Keyakinan sistem terhadap anomali ini"])
-
-            if isinstance(loc.get('metrics'), dict):
-                for key, val in loc.get('metrics', {}).items():
-                    interpretation = explain_metric(key)
-                    tech_data.append([key.replace('_', ' ').title(), Paragraph(str(val), styles['Code']), Paragraph(interpretation, styles['Normal'])])
-
-            story.append(Table(tech_data, colWidths=[100, 70, 210], style=TableStyle([
+            # Penjelasan untuk orang awam
+            story.append(Paragraph("""<b>Penjelasan Sederhana:</b> Ini seperti membandingkan dua dokumen untuk menemukan kalimat 
+                                 yang ditambahkan. Sistem membandingkan setiap frame video dengan video baseline (asli) untuk 
+                                 menemukan frame yang 'baru' dan tidak seharusnya ada di sana. Ini adalah bukti kuat adanya 
+                                 manipulasi karena frame-frame tersebut jelas ditambahkan setelah perekaman asli.""", styles['SimplifiedExplanation']))
+
+        # Distribusi metrik sebagai histogram
+        if result.plots.get('metrics_histograms') and artifact_exists(result.plots['metrics_histograms']):
+            story.append(Paragraph("<b>2.5. Distribusi Statistik Metrik Temporal</b>", styles['SectionHeader']))
+            story.append(Paragraph("""Histogram di bawah ini menunjukkan distribusi statistik dari nilai SSIM dan Aliran Optik 
+                                 di seluruh video. Distribusi ini membantu mengidentifikasi nilai-nilai yang menonjol dari 
+                                 pola normal, yang dapat mengindikasikan anomali.""", styles['Justify']))
+            story.append(report_image(result.plots['metrics_histograms'], width=380, height=110, kind='proportional'))
+            story.append(Paragraph("Histogram distribusi nilai SSIM (kiri) dan Aliran Optik (kanan). Nilai yang sangat jauh dari distribusi utama sering mengindikasikan anomali.", styles['Caption']))
+
+        story.append(PageBreak())
+        yield story
+        story = []
+
+        # --- TAHAP 3 PDF ---
+        story.append(Paragraph("Tahap 3: Analisis - Investigasi Detail Anomali", styles['h2']))
+        story.append(Paragraph("""Tahap ini menyatukan temuan dari analisis temporal untuk mengidentifikasi, mengkarakterisasi, 
+                              dan menginvestigasi anomali-anomali potensial secara mendalam. Sistem menerapkan metode pendukung 
+                              seperti Error Level Analysis (ELA) dan Scale-Invariant Feature Transform (SIFT) untuk 
+                              memeriksa frame-frame mencurigakan dengan lebih detail.""", styles['Justify']))
+
+        # Tambahkan ringkasan statistik
+        if result.statistical_summary:
+            story.append(Paragraph("<b>3.1. Ringkasan Statistik Investigasi</b>", styles['SectionHeader']))
+            story.append(Paragraph("""Statistik di bawah ini memberikan gambaran komprehensif tentang hasil analisis forensik, 
+                                 termasuk jumlah anomali, proporsinya dalam video, dan bagaimana anomali tersebut 
+                                 dikelompokkan secara temporal.""", styles['Justify']))
+            
+            stats_table = [
+                ["<b>Metrik</b>", "<b>Nilai</b>", "<b>Interpretasi</b>"],
+                ["Total Frame Dianalisis", str(result.statistical_summary['total_frames_analyzed']), "Jumlah total frame video yang diperiksa"],
+                ["Total Anomali Terdeteksi", str(result.statistical_summary['total_anomalies']), "Jumlah frame yang menunjukkan tanda-tanda manipulasi"],
+                ["Persentase Anomali", f"{result.statistical_summary.get('total_anomalies', 0)/result.statistical_summary.get('total_frames_analyzed', 1)*100:.1f}%", "Proporsi frame anomali terhadap seluruh video"],
+                ["Kluster Temporal Anomali", str(result.statistical_summary['temporal_clusters']), "Jumlah kelompok anomali yang terjadi berdekatan"],
+                ["Rata-rata Anomali per Kluster", f"{result.statistical_summary.get('average_anomalies_per_cluster', 0):.1f}", "Rata-rata jumlah anomali dalam satu kelompok"]
+            ]
+            story.append(Table(stats_table, colWidths=[130, 70, 180], style=TableStyle([
                 ('BACKGROUND', (0,0), (-1,0), colors.darkblue),
                 ('TEXTCOLOR', (0,0), (-1,0), colors.white),
                 ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+                ('ALIGN', (0,0), (-1,-1), 'LEFT'),
                 ('VALIGN', (0,0), (-1,-1), 'MIDDLE')
             ])))
-            story.append(Spacer(1, 8))
-
-            # Bukti visual (frame sampel, ELA, SIFT)
-            story.append(Paragraph("<b>Bukti Visual:</b>", styles['Normal']))
-            
-            # Row 1: Frame asli dan ELA
-            v_headers, v_evidence = [], []
-            if loc.get('image') and Path(loc['image']).exists():
-                v_headers.append("<b>Sampel Frame (Asli)</b>")
-                v_evidence.append(PlatypusImage(loc['image'], width=180, height=101, kind='proportional'))
-            if loc.get('ela_path') and Path(loc['ela_path']).exists():
-                v_headers.append("<b>Analisis Kompresi (ELA)</b>")
-                v_evidence.append(PlatypusImage(loc['ela_path'], width=180, height=101, kind='proportional'))
-            
-            if v_evidence:
-                story.append(Table([v_headers, v_evidence], colWidths=[190]*len(v_headers), style=[('ALIGN',(0,0),(-1,-1),'CENTER')]))
-                story.append(Paragraph("Kiri: Frame dari lokasi anomali. Kanan: Error Level Analysis menunjukkan area dengan level kompresi berbeda (terang = potensi manipulasi).", styles['Caption']))
-                story.append(Spacer(1, 6))
-
-            # Visualisasi tambahan (ELA detail, SIFT heatmap)
-            if loc.get('visualizations'):
-                if loc['visualizations'].get('ela_detailed') and Path(loc['visualizations']['ela_detailed']).exists():
-                    story.append(PlatypusImage(loc['visualizations']['ela_detailed'], width=380, height=131, kind='proportional'))
-                    story.append(Paragraph("Analisis ELA Detail: Perbandingan frame asli (kiri) dengan visualisasi ELA (kanan). Kotak merah menandai area dengan potensi manipulasi.", styles['Caption']))
+            story.append(Spacer(1, 12))
+
+        # Tampilkan visualisasi ringkasan anomali
+        if result.plots.get('anomaly_summary') and artifact_exists(result.plots['anomaly_summary']):
+            story.append(Paragraph("<b>3.2. Visualisasi Ringkasan Anomali</b>", styles['SectionHeader']))
+            story.append(Paragraph("""Visualisasi di bawah ini memberikan gambaran komprehensif tentang distribusi jenis 
+                                 anomali, tingkat kepercayaan deteksi, dan bagaimana anomali tersebut terdistribusi 
+                                 sepanjang timeline video.""", styles['Justify']))
+            story.append(report_image(result.plots['anomaly_summary'], width=380, height=255, kind='proportional'))
+            story.append(Paragraph("Ringkasan visual analisis anomali, menunjukkan distribusi jenis anomali, tingkat kepercayaan, timeline, dan statistik kunci.", styles['Caption']))
+            story.append(Spacer(1, 12))
+
+        # Detail setiap peristiwa anomali
+        if not result.localizations:
+            story.append(Paragraph("<b>3.3. Investigasi Anomali</b>", styles['SectionHeader']))
+            story.append(Paragraph("Tidak ditemukan anomali signifikan dalam video ini.", styles['Justify']))
+        else:
+            story.append(Paragraph("<b>3.3. Detail Setiap Peristiwa Anomali</b>", styles['SectionHeader']))
+            story.append(Paragraph(f"""Analisis menemukan <b>{len(result.localizations)} peristiwa anomali</b> dalam video. 
+                                 Setiap peristiwa mewakili sekelompok frame berurutan yang menunjukkan karakteristik 
+                                 serupa yang mengindikasikan potensi manipulasi. Detail setiap peristiwa 
+                                 dan bukti pendukungnya diuraikan di bawah ini.""", styles['Justify']))
+
+            # Style dan template teks per peristiwa di-resolve sekali di luar loop
+            style_normal, style_simple, style_caption, style_highlight = (
+                styles[k] for k in ('Normal', 'SimplifiedExplanation', 'Caption', 'HighlightBox'))
+            style_h3_box, style_technical, style_justify, style_code = (
+                styles[k] for k in ('H3-Box', 'TechnicalExplanation', 'Justify', 'Code'))
+            event_header_tmpl = "<b>Peristiwa #{}: {}</b> @ {:.2f} - {:.2f} detik"
+            event_summary_tmpl = "<b>Durasi:</b> {:.2f} detik | <b>Tingkat Keparahan:</b> {:.2f}/1.0 | <b>Kepercayaan:</b> {}"
+            exp_title_tmpl = "<b>{}:</b>"
+            explain = explain_metric
+            exp_blocks = (  # (kunci penjelasan, aktif, template, style) untuk blok penjelasan per jenis bukti
+                ('simple_explanation', include_simple, "<i>Penjelasan Sederhana:</i> {}", style_simple),
+                ('technical_explanation', include_technical, "<i>Penjelasan Teknis:</i> {}", style_technical),
+            )
+
+            for i, loc in enumerate(result.localizations):
+                event_type = loc.get('event', 'unknown').replace('anomaly_', '').capitalize()
+                confidence = loc.get('confidence', 'N/A')
+
+                story.append(Paragraph(event_header_tmpl.format(i + 1, event_type, loc.get('start_ts', 0), loc.get('end_ts', 0)), style_h3_box))
+                story.append(Paragraph(event_summary_tmpl.format(loc.get('duration', 0), loc.get('severity_score', 0), confidence), style_normal))
+                
+                # Penjelasan lebih kaya
+                story.append(Paragraph("<b>Penjelasan Umum:</b>", style_normal))
+                story.append(Paragraph(get_anomaly_explanation(event_type), style_simple))
+                story.append(Paragraph("<b>Implikasi Forensik:</b>", style_normal))
+                story.append(Paragraph(get_anomaly_implication(event_type), style_highlight))
+
+                # Penjelasan detail jika tersedia
+                if loc.get('explanations'):
                     story.append(Spacer(1, 6))
-                    
-                if loc['visualizations'].get('sift_heatmap') and Path(loc['visualizations']['sift_heatmap']).exists():
-                    story.append(PlatypusImage(loc['visualizations']['sift_heatmap'], width=380, height=117, kind='proportional'))
-                    story.append(Paragraph("Heatmap SIFT: Visualisasi kepadatan titik-titik fitur yang cocok, menunjukkan area dengan kecocokan tinggi (merah) vs. rendah (biru).", styles['Caption']))
+                    story.append(Paragraph("<b>Analisis Detail:</b>", style_normal))
+                    for exp_type, exp_data in loc['explanations'].items():
+                        if isinstance(exp_data, dict):
+                            story.append(Paragraph(exp_title_tmpl.format(exp_type.replace('_', ' ').title()), style_normal))
+                            for exp_key, enabled, tmpl, style in exp_blocks:
+                                if enabled and exp_data.get(exp_key):
+                                    story.append(Paragraph(tmpl.format(exp_data[exp_key]), style))
+                                    story.append(Spacer(1, 4))
+
+                # Tabel bukti teknis
+                story.append(Paragraph("<b>Bukti Teknis Pendukung:</b>", style_normal))
+                tech_data = [["<b>Metrik</b>", "<b>Nilai</b>", "<b>Interpretasi</b>"]]
+                tech_data.append(["Tingkat Kepercayaan", f"<b>{confidence}</b>", "Keyakinan sistem terhadap anomali ini"])
+
+                metrics = loc.get('metrics')
+                if isinstance(metrics, dict):
+                    tech_data.extend([[key.replace('_', ' ').title(), Paragraph(escape(str(val)), style_code), Paragraph(explain(key), style_normal)]
+                                      for key, val in metrics.items()])
+
+                story.append(Table(tech_data, colWidths=[100, 70, 210], style=TableStyle([
+                    ('BACKGROUND', (0,0), (-1,0), colors.darkblue),
+                    ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+                    ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+                    ('VALIGN', (0,0), (-1,-1), 'MIDDLE')
+                ])))
+                story.append(Spacer(1, 8))
+
+                # Bukti visual (frame sampel, ELA, SIFT)
+                story.append(Paragraph("<b>Bukti Visual:</b>", style_normal))
+                
+                # Row 1: Frame asli dan ELA
+                v_headers, v_evidence = [], []
+                if loc.get('image') and artifact_exists(loc['image']):
+                    v_headers.append("<b>Sampel Frame (Asli)</b>")
+                    v_evidence.append(event_image(loc['image'], 180, 101))
+                if loc.get('ela_path') and artifact_exists(loc['ela_path']):
+                    v_headers.append("<b>Analisis Kompresi (ELA)</b>")
+                    v_evidence.append(event_image(loc['ela_path'], 180, 101))
+                
+                if v_evidence:
+                    story.append(Table([v_headers, v_evidence], colWidths=[190]*len(v_headers), style=[('ALIGN',(0,0),(-1,-1),'CENTER')]))
+                    story.append(Paragraph("Kiri: Frame dari lokasi anomali. Kanan: Error Level Analysis menunjukkan area dengan level kompresi berbeda (terang = potensi manipulasi).", style_caption))
                     story.append(Spacer(1, 6))
-                    
-            if loc.get('sift_path') and Path(loc.get('sift_path')).exists():
-                story.append(PlatypusImage(loc.get('sift_path'), width=380, height=117, kind='proportional'))
-                story.append(Paragraph("Bukti Pencocokan Fitur (SIFT+RANSAC): Garis hijau menghubungkan fitur-fitur yang cocok antara dua frame, menunjukkan bukti duplikasi.", styles['Caption']))
-                story.append(Spacer(1, 6))
-
-            # Implikasi forensik dari kombinasi bukti
-            if loc.get('explanations'):
-                implications = []
-                for exp in loc['explanations'].values():
-                    if isinstance(exp, dict) and exp.get('implications'):
-                        implications.append(exp['implications'])
-                if implications:
-                    story.append(Paragraph("<b>Kesimpulan Forensik:</b>", styles['Normal']))
-                    for imp in set(implications):
-                        story.append(Paragraph(f"• {imp}", styles['Justify']))
-            
-            story.append(Spacer(1, 20))
-
-    story.append(PageBreak())
 
-    # --- TAHAP 4 PDF ---
-    story.append(Paragraph("Tahap 4: Penilaian Keandalan Bukti dan Lokalisasi", styles['h2']))
-    story.append(Paragraph("""Tahap ini mengevaluasi kekuatan dan keandalan bukti yang ditemukan dalam tahap-tahap sebelumnya. 
-                          Sistem menilai seberapa kuat bukti forensik, seberapa terlokalisasi anomali, dan 
-                          menghasilkan penilaian akhir tentang reliabilitas bukti menggunakan kerangka kerja 
-                          Forensic Evidence Reliability Matrix (FERM).""", styles['Justify']))
+                # Visualisasi tambahan (ELA detail, SIFT heatmap)
+                if loc.get('visualizations'):
+                    if loc['visualizations'].get('ela_detailed') and artifact_exists(loc['visualizations']['ela_detailed']):
+                        story.append(event_image(loc['visualizations']['ela_detailed'], 380, 131))
+                        story.append(Paragraph("Analisis ELA Detail: Perbandingan frame asli (kiri) dengan visualisasi ELA (kanan). Kotak merah menandai area dengan potensi manipulasi.", style_caption))
+                        story.append(Spacer(1, 6))
+                        
+                    if loc['visualizations'].get('sift_heatmap') and artifact_exists(loc['visualizations']['sift_heatmap']):
+                        story.append(event_image(loc['visualizations']['sift_heatmap'], 380, 117))
+                        story.append(Paragraph("Heatmap SIFT: Visualisasi kepadatan titik-titik fitur yang cocok, menunjukkan area dengan kecocokan tinggi (merah) vs. rendah (biru).", style_caption))
+                        story.append(Spacer(1, 6))
+                        
+                if loc.get('sift_path') and artifact_exists(loc.get('sift_path')):
+                    story.append(event_image(loc.get('sift_path'), 380, 117))
+                    story.append(Paragraph("Bukti Pencocokan Fitur (SIFT+RANSAC): Garis hijau menghubungkan fitur-fitur yang cocok antara dua frame, menunjukkan bukti duplikasi.", style_caption))
+                    story.append(Spacer(1, 6))
 
-    story.append(Paragraph("<b>4.1. Analisis Matriks Keandalan Bukti Forensik (FERM)</b>", styles['SectionHeader']))
-    story.append(Paragraph("""FERM adalah pendekatan multi-dimensi untuk menilai keandalan bukti forensik, 
-                          yang mempertimbangkan faktor-faktor seperti kekuatan bukti, karakteristik anomali, 
-                          dan analisis kausalitas. Ini memberikan kesimpulan yang lebih dapat dipertanggungjawabkan 
-                          daripada skor integritas tunggal.""", styles['Justify']))
+                # Implikasi forensik dari kombinasi bukti
+                if loc.get('explanations'):
+                    implications = {exp['implications'] for exp in loc['explanations'].values()
+                                    if isinstance(exp, dict) and exp.get('implications')}
+                    if implications:
+                        story.append(Paragraph("<b>Kesimpulan Forensik:</b>", style_normal))
+                        story.append(Paragraph('<br/>'.join(f"• {imp}" for imp in implications), style_justify))
+                
+                story.append(Spacer(1, 20))
+                # Serahkan setiap peristiwa sebagai bagian sendiri agar segera ditata dan dilepas
+                yield story
+                story = []
+
+        story.append(PageBreak())
+        yield story
+        story = []
+
+        # --- TAHAP 4 PDF ---
+        story.append(Paragraph("Tahap 4: Penilaian Keandalan Bukti dan Lokalisasi", styles['h2']))
+        story.append(Paragraph("""Tahap ini mengevaluasi kekuatan dan keandalan bukti yang ditemukan dalam tahap-tahap sebelumnya. 
+                              Sistem menilai seberapa kuat bukti forensik, seberapa terlokalisasi anomali, dan 
+                              menghasilkan penilaian akhir tentang reliabilitas bukti menggunakan kerangka kerja 
+                              Forensic Evidence Reliability Matrix (FERM).""", styles['Justify']))
+
+        story.append(Paragraph("<b>4.1. Analisis Matriks Keandalan Bukti Forensik (FERM)</b>", styles['SectionHeader']))
+        story.append(Paragraph("""FERM adalah pendekatan multi-dimensi untuk menilai keandalan bukti forensik, 
+                              yang mempertimbangkan faktor-faktor seperti kekuatan bukti, karakteristik anomali, 
+                              dan analisis kausalitas. Ini memberikan kesimpulan yang lebih dapat dipertanggungjawabkan 
+                              daripada skor integritas tunggal.""", styles['Justify']))
+
+        # Tampilkan penilaian keandalan bukti
+        reliability = result.forensic_evidence_matrix['conclusion']['reliability_assessment']
+        reliability_style = "color: #155724; background-color: #d4edda; padding: 10px; border-radius: 5px; font-weight: bold;" if "Tinggi" in reliability else "color: #856404; background-color: #fff3cd; padding: 10px; border-radius: 5px; font-weight: bold;" if "Sedang" in reliability else "color: #721c24; background-color: #f8d7da; padding: 10px; border-radius: 5px; font-weight: bold;"
+        
+    # Pendekatan menggunakan tabel dengan style
 
-    # Tampilkan penilaian keandalan bukti
-    reliability = result.forensic_evidence_matrix['conclusion']['reliability_assessment']
-    reliability_style = "color: #155724; background-color: #d4edda; padding: 10px; border-radius: 5px; font-weight: bold;" if "Tinggi" in reliability else "color: #856404; background-color: #fff3cd; padding: 10px; border-radius: 5px; font-weight: bold;" if "Sedang" in reliability else "color: #721c24; background-color: #f8d7da; padding: 10px; border-radius: 5px; font-weight: bold;"
-    
-# Pendekatan menggunakan tabel dengan style
+    # Ganti kode yang bermasalah:
+    # story.append(Paragraph(f"<b>Penilaian Keandalan Bukti:</b> <span style='{reliability_style}'>{reliability}</span>", styles['Normal']))
 
-# Ganti kode yang bermasalah:
-# story.append(Paragraph(f"<b>Penilaian Keandalan Bukti:</b> <span style='{reliability_style}'>{reliability}</span>", styles['Normal']))
+        story.append(Paragraph("<b>Penilaian Keandalan Bukti:</b>", styles['Normal']))
 
-    story.append(Paragraph("<b>Penilaian Keandalan Bukti:</b>", styles['Normal']))
+        # Tentukan warna background berdasarkan tingkat reliability
+        if "Tinggi" in reliability:
+            bg_color = colors.lightgreen
+            text_color = colors.darkgreen
+        elif "Sedang" in reliability:
+            bg_color = colors.lightyellow
+            text_color = colors.darkgoldenrod
+        else:
+            bg_color = colors.mistyrose
+            text_color = colors.darkred
+
+        # Buat tabel dengan styling
+        reliability_table = Table([[reliability]], colWidths=[300])
+        reliability_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (0, 0), bg_color),
+            ('TEXTCOLOR', (0, 0), (0, 0), text_color),
+            ('ALIGN', (0, 0), (0, 0), 'CENTER'),
+            ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
+            ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (0, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (0, 0), 8),
+            ('TOPPADDING', (0, 0), (0, 0), 8),
+            ('ROUNDEDCORNERS', [5, 5, 5, 5]),
+        ]))
+
+        story.append(reliability_table)
+        story.append(Spacer(1, 12)) 
+
+        # Tampilkan visualisasi FERM jika tersedia
+        if result.plots.get('ferm_evidence_strength') and artifact_exists(result.plots['ferm_evidence_strength']):
+            story.append(report_image(result.plots['ferm_evidence_strength'], width=380, height=234, kind='proportional'))
+            story.append(Paragraph("Heatmap Kekuatan Bukti FERM: Menunjukkan efektivitas relatif dari berbagai metode deteksi untuk setiap jenis anomali.", styles['Caption']))
+            story.append(Spacer(1, 12))
+            
+        if result.plots.get('ferm_reliability') and artifact_exists(result.plots['ferm_reliability']):
+            story.append(report_image(result.plots['ferm_reliability'], width=380, height=204, kind='proportional'))
+            story.append(Paragraph("Grafik Faktor Reliabilitas: Menunjukkan faktor-faktor yang berkontribusi positif atau negatif terhadap penilaian keandalan bukti keseluruhan.", styles['Caption']))
+            story.append(Spacer(1, 12))
+
+        # Temuan utama FERM
+        primary_findings = result.forensic_evidence_matrix['conclusion']['primary_findings']
+        if primary_findings:
+            story.append(Paragraph("<b>Temuan Utama FERM:</b>", styles['Normal']))
+            for i, finding in enumerate(primary_findings):
+                story.append(Paragraph(f"<b>{i+1}. {finding['finding']}</b> (Kepercayaan: {finding['confidence']})", styles['Normal']))
+                story.append(Paragraph(f"<i>Interpretasi:</i> {finding['interpretation']}", styles['ExplanationBox']))
+                story.append(Spacer(1, 6))
 
-    # Tentukan warna background berdasarkan tingkat reliability
-    if "Tinggi" in reliability:
-        bg_color = colors.lightgreen
-        text_color = colors.darkgreen
-    elif "Sedang" in reliability:
-        bg_color = colors.lightyellow
-        text_color = colors.darkgoldenrod
-    else:
-        bg_color = colors.mistyrose
-        text_color = colors.darkred
-
-    # Buat tabel dengan styling
-    reliability_table = Table([[reliability]], colWidths=[300])
-    reliability_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, 0), bg_color),
-        ('TEXTCOLOR', (0, 0), (0, 0), text_color),
-        ('ALIGN', (0, 0), (0, 0), 'CENTER'),
-        ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
-        ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (0, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (0, 0), 8),
-        ('TOPPADDING', (0, 0), (0, 0), 8),
-        ('ROUNDEDCORNERS', [5, 5, 5, 5]),
-    ]))
-
-    story.append(reliability_table)
-    story.append(Spacer(1, 12)) 
-
-    # Tampilkan visualisasi FERM jika tersedia
-    if result.plots.get('ferm_evidence_strength') and Path(result.plots['ferm_evidence_strength']).exists():
-        story.append(PlatypusImage(result.plots['ferm_evidence_strength'], width=380, height=234, kind='proportional'))
-        story.append(Paragraph("Heatmap Kekuatan Bukti FERM: Menunjukkan efektivitas relatif dari berbagai metode deteksi untuk setiap jenis anomali.", styles['Caption']))
-        story.append(Spacer(1, 12))
+        # Rekomendasi tindakan
+        recommended_actions = result.forensic_evidence_matrix['conclusion']['recommended_actions']
+        if recommended_actions:
+            story.append(Paragraph("<b>Rekomendasi Tindakan Lanjutan:</b>", styles['Normal']))
+            for action in recommended_actions:
+                story.append(Paragraph(f"• {action}", styles['Justify']))
+            story.append(Spacer(1, 12))
+
+        story.append(Paragraph("<b>4.2. Hasil Localization Tampering</b>", styles['SectionHeader']))
+        story.append(Paragraph("""Localization Tampering adalah teknik untuk mengelompokkan frame-frame anomali yang berdekatan 
+                              menjadi 'peristiwa' yang koheren, sehingga memudahkan interpretasi hasil forensik. 
+                              Peta di bawah ini memberikan gambaran visual tentang di mana dan bagaimana manipulasi 
+                              potensial terjadi dalam video.""", styles['Justify']))
         
-    if result.plots.get('ferm_reliability') and Path(result.plots['ferm_reliability']).exists():
-        story.append(PlatypusImage(result.plots['ferm_reliability'], width=380, height=204, kind='proportional'))
-        story.append(Paragraph("Grafik Faktor Reliabilitas: Menunjukkan faktor-faktor yang berkontribusi positif atau negatif terhadap penilaian keandalan bukti keseluruhan.", styles['Caption']))
+        # Penjelasan untuk orang awam
+        story.append(Paragraph("""<b>Penjelasan Sederhana:</b> Bayangkan ini seperti peta yang menunjukkan 'lokasi masalah' 
+                              dalam video. Alih-alih hanya menunjukkan frame individual, peta ini mengelompokkan frame-frame 
+                              bermasalah yang berdekatan menjadi 'kejadian' yang lebih bermakna - seperti menandai 
+                              halaman-halaman bermasalah dalam buku, bukan hanya kata-kata individual.""", styles['SimplifiedExplanation']))
+        
+        # Tampilkan peta lokalisasi
+        if result.plots.get('enhanced_localization_map') and artifact_exists(result.plots['enhanced_localization_map']):
+            story.append(report_image(result.plots['enhanced_localization_map'], width=380, height=255, kind='proportional'))
+            story.append(Paragraph("Peta lokalisasi tampering dengan timeline, statistik, dan tingkat kepercayaan, menunjukkan di mana dan bagaimana manipulasi potensial terjadi dalam video.", styles['Caption']))
         story.append(Spacer(1, 12))
 
-    # Temuan utama FERM
-    primary_findings = result.forensic_evidence_matrix['conclusion']['primary_findings']
-    if primary_findings:
-        story.append(Paragraph("<b>Temuan Utama FERM:</b>", styles['Normal']))
-        for i, finding in enumerate(primary_findings):
-            story.append(Paragraph(f"<b>{i+1}. {finding['finding']}</b> (Kepercayaan: {finding['confidence']})", styles['Normal']))
-            story.append(Paragraph(f"<i>Interpretasi:</i> {finding['interpretation']}", styles['ExplanationBox']))
-            story.append(Spacer(1, 6))
-
-    # Rekomendasi tindakan
-    recommended_actions = result.forensic_evidence_matrix['conclusion']['recommended_actions']
-    if recommended_actions:
-        story.append(Paragraph("<b>Rekomendasi Tindakan Lanjutan:</b>", styles['Normal']))
-        for action in recommended_actions:
-            story.append(Paragraph(f"• {action}", styles['Justify']))
+        story.append(Paragraph("<b>4.3. Penilaian Kualitas Pipeline Forensik</b>", styles['SectionHeader']))
+        story.append(Paragraph("""Bagian ini mengevaluasi kualitas dan kelengkapan setiap tahap dalam pipeline analisis forensik. 
+                              Penilaian ini membantu memahami keandalan keseluruhan proses analisis dan mengidentifikasi 
+                              area yang mungkin memerlukan investigasi lebih lanjut.""", styles['Justify']))
+        
+        # Tabel penilaian pipeline
+        pipeline_data = [["<b>Tahap</b>", "<b>Status</b>", "<b>Quality Score</b>", "<b>Catatan</b>"]]
+        for stage_id, assessment in result.pipeline_assessment.items():
+            issues_text = ", ".join(assessment['issues']) if assessment['issues'] else "Tidak ada masalah"
+            pipeline_data.append([
+                Paragraph(assessment['nama'], styles['Normal']),
+                Paragraph(assessment['status'].capitalize(), styles['Normal']),
+                Paragraph(f"{assessment['quality_score']}%", styles['Normal']),
+                Paragraph(issues_text, styles['Normal'])
+            ])
+        story.append(Table(pipeline_data, colWidths=[95, 60, 60, 165], style=TableStyle([
+            ('BACKGROUND', (0,0), (-1,0), colors.darkblue), ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+            ('GRID', (0,0), (-1,-1), 0.5, colors.grey), ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+            ('VALIGN', (0,0), (-1,-1), 'MIDDLE')])))
         story.append(Spacer(1, 12))
 
-    story.append(Paragraph("<b>4.2. Hasil Localization Tampering</b>", styles['SectionHeader']))
-    story.append(Paragraph("""Localization Tampering adalah teknik untuk mengelompokkan frame-frame anomali yang berdekatan 
-                          menjadi 'peristiwa' yang koheren, sehingga memudahkan interpretasi hasil forensik. 
-                          Peta di bawah ini memberikan gambaran visual tentang di mana dan bagaimana manipulasi 
-                          potensial terjadi dalam video.""", styles['Justify']))
-    
-    # Penjelasan untuk orang awam
-    story.append(Paragraph("""<b>Penjelasan Sederhana:</b> Bayangkan ini seperti peta yang menunjukkan 'lokasi masalah' 
-                          dalam video. Alih-alih hanya menunjukkan frame individual, peta ini mengelompokkan frame-frame 
-                          bermasalah yang berdekatan menjadi 'kejadian' yang lebih bermakna - seperti menandai 
-                          halaman-halaman bermasalah dalam buku, bukan hanya kata-kata individual.""", styles['SimplifiedExplanation']))
-    
-    # Tampilkan peta lokalisasi
-    if result.plots.get('enhanced_localization_map') and Path(result.plots['enhanced_localization_map']).exists():
-        story.append(PlatypusImage(result.plots['enhanced_localization_map'], width=380, height=255, kind='proportional'))
-        story.append(Paragraph("Peta lokalisasi tampering dengan timeline, statistik, dan tingkat kepercayaan, menunjukkan di mana dan bagaimana manipulasi potensial terjadi dalam video.", styles['Caption']))
-    story.append(Spacer(1, 12))
-
-    story.append(Paragraph("<b>4.3. Penilaian Kualitas Pipeline Forensik</b>", styles['SectionHeader']))
-    story.append(Paragraph("""Bagian ini mengevaluasi kualitas dan kelengkapan setiap tahap dalam pipeline analisis forensik. 
-                          Penilaian ini membantu memahami keandalan keseluruhan proses analisis dan mengidentifikasi 
-                          area yang mungkin memerlukan investigasi lebih lanjut.""", styles['Justify']))
-    
-    # Tabel penilaian pipeline
-    pipeline_data = [["<b>Tahap</b>", "<b>Status</b>", "<b>Quality Score</b>", "<b>Catatan</b>"]]
-    for stage_id, assessment in result.pipeline_assessment.items():
-        issues_text = ", ".join(assessment['issues']) if assessment['issues'] else "Tidak ada masalah"
-        pipeline_data.append([
-            Paragraph(assessment['nama'], styles['Normal']),
-            Paragraph(assessment['status'].capitalize(), styles['Normal']),
-            Paragraph(f"{assessment['quality_score']}%", styles['Normal']),
-            Paragraph(issues_text, styles['Normal'])
+        # Infografis penjelasan anomali
+        if result.plots.get('anomaly_infographic') and artifact_exists(result.plots['anomaly_infographic']):
+            story.append(Paragraph("<b>4.4. Infografis Penjelasan Anomali</b>", styles['SectionHeader']))
+            story.append(Paragraph("""Infografis di bawah ini memberikan penjelasan visual tentang berbagai jenis anomali 
+                                 yang dapat dideteksi oleh sistem, termasuk definisi sederhana, metode deteksi, dan implikasi 
+                                 forensik. Ini membantu pengguna non-teknis memahami temuan-temuan dalam laporan.""", styles['Justify']))
+            story.append(report_image(result.plots['anomaly_infographic'], width=380, height=238, kind='proportional'))
+            story.append(Paragraph("Infografis yang menjelaskan setiap jenis anomali dengan bahasa sederhana, metode deteksi, dan implikasi forensiknya.", styles['Caption']))
+
+        story.append(PageBreak())
+        yield story
+        story = []
+
+        # --- TAHAP 5 PDF ---
+        story.append(Paragraph("Tahap 5: Validasi Forensik dan Kesimpulan", styles['h2']))
+        story.append(Paragraph("""Tahap terakhir dari proses analisis menvalidasi temuan dari tahap-tahap sebelumnya dan
+                              menyajikan kesimpulan akhir. Tahap ini memastikan semua temuan didokumentasikan dengan benar
+                              dan disajikan dalam konteks yang sesuai untuk interpretasi.""", styles['Justify']))
+        
+        # Validasi forensik
+        validation_data = [
+            ["<b>Item Validasi</b>", "<b>Detail</b>"],
+            ["File Bukti", Paragraph(f"<code>{video_name_markup}</code>", styles['Code'])],
+            ["Hash Preservasi (SHA-256)", Paragraph(f"<code>{result.preservation_hash}</code>", styles['Code'])],
+            ["Waktu Analisis", f"{report_time_str} UTC"],
+            ["Metodologi Utama", "K-Means, Localization Tampering"],
+            ["Metode Pendukung", "ELA, SIFT+RANSAC, SSIM, Optical Flow"],
+            ["Pustaka Kunci", "OpenCV, scikit-learn, scikit-image, Pillow, ReportLab"],
+            ["Penilaian Reliabilitas", f"{result.forensic_evidence_matrix['conclusion']['reliability_assessment']}"],
+            ["Total Anomali", f"{result.summary['total_anomaly']} dari {result.summary['total_frames']} frame"],
+            ["Pipeline Quality", pipeline_quality_str]
+        ]
+        story.append(Table(validation_data, colWidths=[130, 250], style=TableStyle([
+            ('BACKGROUND', (0,0), (-1,0), colors.darkblue),('TEXTCOLOR', (0,0), (-1,0), colors.white),
+            ('GRID', (0,0), (-1,-1), 0.5, colors.grey), ('VALIGN', (0,0), (-1,-1), 'MIDDLE')
+        ])))
+
+        story.append(Spacer(1, 24))
+        story.append(Paragraph("Kesimpulan", styles['h2']))
+        
+        # Kesimpulan yang lebih kaya
+        conclusion_elements = [
+            f"Berdasarkan analisis forensik 5 tahap yang telah dilakukan, video \"{Path(result.video_path).name}\"",
+            f"memiliki penilaian reliabilitas \"{result.forensic_evidence_matrix['conclusion']['reliability_assessment']}\"."
+        ]
+        
+        if len(result.localizations) > 0:
+            conclusion_elements.append(f"Sistem telah mendeteksi {len(result.localizations)} peristiwa anomali yang memerlukan perhatian.")
+            
+            # Hitung persentase setiap jenis anomali
+            atype_counts = Counter(loc['event'].removeprefix('anomaly_') for loc in result.localizations)
+            
+            # Tambahkan detail jenis anomali yang signifikan
+            if atype_counts:
+                most_common = atype_counts.most_common(1)[0]
+                conclusion_elements.append(f"Jenis anomali yang paling banyak ditemukan adalah '{most_common[0].capitalize()}' ({most_common[1]} peristiwa).")
+        else:
+            conclusion_elements.append("Sistem tidak mendeteksi adanya peristiwa anomali yang signifikan dalam video ini.")
+        
+        conclusion_elements.extend([
+            f"Metode utama K-Means dan Localization Tampering berhasil mengidentifikasi pola-pola anomali,",
+            f"sementara metode pendukung ELA dan SIFT memberikan validasi tambahan terhadap temuan tersebut.",
+            f"Analisis FERM menunjukkan {len(result.forensic_evidence_matrix['conclusion']['primary_findings'])} temuan utama",
+            f"dengan rekomendasi tindak lanjut spesifik untuk meningkatkan kepastian hasil investigasi."
         ])
-    story.append(Table(pipeline_data, colWidths=[95, 60, 60, 165], style=TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.darkblue), ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.grey), ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE')])))
-    story.append(Spacer(1, 12))
-
-    # Infografis penjelasan anomali
-    if result.plots.get('anomaly_infographic') and Path(result.plots['anomaly_infographic']).exists():
-        story.append(Paragraph("<b>4.4. Infografis Penjelasan Anomali</b>", styles['SectionHeader']))
-        story.append(Paragraph("""Infografis di bawah ini memberikan penjelasan visual tentang berbagai jenis anomali 
-                             yang dapat dideteksi oleh sistem, termasuk definisi sederhana, metode deteksi, dan implikasi 
-                             forensik. Ini membantu pengguna non-teknis memahami temuan-temuan dalam laporan.""", styles['Justify']))
-        story.append(PlatypusImage(result.plots['anomaly_infographic'], width=380, height=238, kind='proportional'))
-        story.append(Paragraph("Infografis yang menjelaskan setiap jenis anomali dengan bahasa sederhana, metode deteksi, dan implikasi forensiknya.", styles['Caption']))
-
-    story.append(PageBreak())
-
-    # --- TAHAP 5 PDF ---
-    story.append(Paragraph("Tahap 5: Validasi Forensik dan Kesimpulan", styles['h2']))
-    story.append(Paragraph("""Tahap terakhir dari proses analisis menvalidasi temuan dari tahap-tahap sebelumnya dan
-                          menyajikan kesimpulan akhir. Tahap ini memastikan semua temuan didokumentasikan dengan benar
-                          dan disajikan dalam konteks yang sesuai untuk interpretasi.""", styles['Justify']))
-    
-    # Validasi forensik
-    avg_pipeline_quality = np.mean([a['quality_score'] for a in result.pipeline_assessment.values()]) if hasattr(result, 'pipeline_assessment') and result.pipeline_assessment else 'N/A'
-    validation_data = [
-        ["<b>Item Validasi</b>", "<b>Detail</b>"],
-        ["File Bukti", Paragraph(f"<code>{Path(result.video_path).name}</code>", styles['Code'])],
-        ["Hash Preservasi (SHA-256)", Paragraph(f"<code>{result.preservation_hash}</code>", styles['Code'])],
-        ["Waktu Analisis", datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')],
-        ["Metodologi Utama", "K-Means, Localization Tampering"],
-        ["Metode Pendukung", "ELA, SIFT+RANSAC, SSIM, Optical Flow"],
-        ["Pustaka Kunci", "OpenCV, scikit-learn, scikit-image, Pillow, ReportLab"],
-        ["Penilaian Reliabilitas", f"{result.forensic_evidence_matrix['conclusion']['reliability_assessment']}"],
-        ["Total Anomali", f"{result.summary['total_anomaly']} dari {result.summary['total_frames']} frame"],
-        ["Pipeline Quality", f"{avg_pipeline_quality:.1f}%" if isinstance(avg_pipeline_quality, (float, int)) else "N/A"]
-    ]
-    story.append(Table(validation_data, colWidths=[130, 250], style=TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.darkblue),('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.grey), ('VALIGN', (0,0), (-1,-1), 'MIDDLE')
-    ])))
-
-    story.append(Spacer(1, 24))
-    story.append(Paragraph("Kesimpulan", styles['h2']))
-    
-    # Kesimpulan yang lebih kaya
-    conclusion_elements = [
-        f"Berdasarkan analisis forensik 5 tahap yang telah dilakukan, video \"{Path(result.video_path).name}\"",
-        f"memiliki penilaian reliabilitas \"{result.forensic_evidence_matrix['conclusion']['reliability_assessment']}\"."
-    ]
-    
-    if len(result.localizations) > 0:
-        conclusion_elements.append(f"Sistem telah mendeteksi {len(result.localizations)} peristiwa anomali yang memerlukan perhatian.")
         
-        # Hitung persentase setiap jenis anomali
-        atype_counts = {}
-        for loc in result.localizations:
-            atype = loc['event'].replace('anomaly_', '')
-            atype_counts[atype] = atype_counts.get(atype, 0) + 1
+        # Tambahkan disclaimer pentingnya analisis manusia
+        conclusion_elements.extend([
+            "",
+            "PENTING: Hasil analisis ini adalah produk dari sistem otomatis, dan meskipun menggunakan metodologi DFRWS",
+            "yang diakui secara profesional, penting untuk dipahami bahwa penilaian akhir dan interpretasi",
+            "temuan memerlukan validasi dan analisis lebih lanjut oleh ahli forensik video berkualifikasi.",
+            "Sistem hanya menganalisis temuan yang terdeteksi melalui algoritma; interpretasi kontekstual dan legal",
+            "dari temuan tersebut berada di luar kemampuan sistem dan memerlukan penilaian manusia."
+        ])
         
-        # Tambahkan detail jenis anomali yang signifikan
-        if atype_counts:
-            most_common = max(atype_counts.items(), key=lambda x: x[1])
-            conclusion_elements.append(f"Jenis anomali yang paling banyak ditemukan adalah '{most_common[0].capitalize()}' ({most_common[1]} peristiwa).")
-    else:
-        conclusion_elements.append("Sistem tidak mendeteksi adanya peristiwa anomali yang signifikan dalam video ini.")
-    
-    conclusion_elements.extend([
-        f"Metode utama K-Means dan Localization Tampering berhasil mengidentifikasi pola-pola anomali,",
-        f"sementara metode pendukung ELA dan SIFT memberikan validasi tambahan terhadap temuan tersebut.",
-        f"Analisis FERM menunjukkan {len(result.forensic_evidence_matrix['conclusion']['primary_findings'])} temuan utama",
-        f"dengan rekomendasi tindak lanjut spesifik untuk meningkatkan kepastian hasil investigasi."
-    ])
-    
-    # Tambahkan disclaimer pentingnya analisis manusia
-    conclusion_elements.extend([
-        "",
-        "PENTING: Hasil analisis ini adalah produk dari sistem otomatis, dan meskipun menggunakan metodologi DFRWS",
-        "yang diakui secara profesional, penting untuk dipahami bahwa penilaian akhir dan interpretasi",
-        "temuan memerlukan validasi dan analisis lebih lanjut oleh ahli forensik video berkualifikasi.",
-        "Sistem hanya menganalisis temuan yang terdeteksi melalui algoritma; interpretasi kontekstual dan legal",
-        "dari temuan tersebut berada di luar kemampuan sistem dan memerlukan penilaian manusia."
-    ])
-    
-    story.append(Paragraph("\n".join(conclusion_elements), styles['Justify']))
+        # Baris di-escape (nama file video berasal dari pengguna); elemen kosong menandai pergantian paragraf.
+        # Baris dalam satu paragraf disambung spasi karena banyak kalimat terpotong antar elemen.
+        justify = styles['Justify']
+        conclusion_paragraphs = [[]]
+        for line in conclusion_elements:
+            if line:
+                conclusion_paragraphs[-1].append(escape(line))
+            else:
+                conclusion_paragraphs.append([])
+        story.append(Paragraph('<br/><br/>'.join(' '.join(lines) for lines in conclusion_paragraphs), justify))
+        yield story
+
+    # Error saat menyusun isi laporan diteruskan ke pemanggil; hanya kegagalan render PDF yang dianggap FATAL
+    story_errors = []
+    def tracked_sections():
+        try:
+            yield from story_sections()
+        except Exception as e:
+            story_errors.append(e)
+            raise
 
     log(f"  {Icons.INFO} Membangun laporan PDF naratif...")
     try:
-        doc.build(story, onFirstPage=header_footer, onLaterPages=header_footer)
+        # Tulis ke file .part lewat buffer 5 MB; baru dipindah ke pdf_path setelah build selesai
+        part_path = pdf_path.with_suffix('.pdf.part')
+        try:
+            with open(part_path, 'wb', buffering=5 * 1024 * 1024) as pdf_fh:
+                doc = StreamingDocTemplate(pdf_fh, onPage=header_footer, pagesize=F5,
+                                           topMargin=10*mm, bottomMargin=10*mm,
+                                           leftMargin=10*mm, rightMargin=10*mm)
+                doc.build_sections(tracked_sections())
+            part_path.replace(pdf_path)
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
         result.pdf_report_path = pdf_path
         log(f"  ✅ Laporan PDF berhasil dibuat: {pdf_path.name}")
 
-        # --- EKSPOR PNG ---
-        log(f"  {Icons.INFO} Mencoba mengekspor ke PNG...")
-        try:
-            # Periksa dependensi
-            from export_utils import check_dependency, check_poppler_installation
-            if check_dependency('pdf2image') and check_poppler_installation():
-                from pdf2image import convert_from_path
-                png_output_dir = out_dir / "png_exports"
-                png_output_dir.mkdir(exist_ok=True)
-                
-                images = convert_from_path(str(pdf_path), dpi=200) # Turunkan DPI untuk kecepatan
-                png_paths = []
-                for i, image in enumerate(images):
-                    png_path = png_output_dir / f"{pdf_path.stem}_page_{i+1}.png"
-                    image.save(png_path, 'PNG')
-                    png_paths.append(str(png_path)) # Simpan sebagai string
-                result.png_export_paths = png_paths
-                log(f"  ✅ Berhasil mengekspor {len(png_paths)} halaman PNG.")
-            else:
-                log("  ⚠️ Ekspor PNG dilewati. Periksa instalasi `pdf2image` dan `Poppler` (pastikan ada di PATH).")
-        except Exception as png_err:
-            log(f"  {Icons.ERROR} Gagal saat ekspor PNG: {png_err}")
-            
-        # --- BUAT DOCX ---
-        log(f"  {Icons.INFO} Mencoba membuat laporan DOCX...")
-        try:
-            from export_utils import check_dependency, create_docx_backend
-            if check_dependency('docx'):
-                docx_filename = f"{Path(result.video_path).stem}_report.docx"
-                docx_path = out_dir / docx_filename
-                
-                # Buat atribut timestamp di result untuk DOCX
-                result.analysis_timestamp = datetime.now()
-                
-                created_path = create_docx_backend(result, docx_path)
-                if created_path:
-                    result.docx_report_path = str(created_path) # Simpan sebagai string
-                    log(f"  ✅ Laporan DOCX berhasil dibuat: {created_path.name}")
-            else:
-                log("  ⚠️ Ekspor DOCX dilewati. `python-docx` tidak terpasang.")
-        except Exception as docx_err:
-            log(f"  {Icons.ERROR} Gagal saat membuat DOCX: {docx_err}")
+        # --- EKSPOR PNG & DOCX (paralel; keduanya hanya membaca hasil yang sudah final) ---
+        log(f"  {Icons.INFO} Mencoba mengekspor ke PNG dan membuat laporan DOCX...")
+        result.analysis_timestamp = report_time  # Atribut timestamp di result untuk DOCX
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            fut_png = ex.submit(_do_png_export, pdf_path, out_dir)
+            fut_docx = ex.submit(_do_docx_export, result, out_dir)
+            png_paths, png_msg = fut_png.result()
+            docx_path, docx_msg = fut_docx.result()
+
+        if png_paths is not None:
+            result.png_export_paths = png_paths
+            log(f"  ✅ Berhasil mengekspor {len(png_paths)} halaman PNG.")
+        else:
+            log(png_msg)
+        if docx_path is not None:
+            result.docx_report_path = str(docx_path) # Simpan sebagai string
+            log(f"  ✅ Laporan DOCX berhasil dibuat: {docx_path.name}")
+        elif docx_msg:
+            log(docx_msg)
             
     except Exception as e:
+        if story_errors:
+            raise
         log(f"{Icons.ERROR} FATAL: Gagal total saat membangun laporan: {e}")
         log(traceback.format_exc())
         result.pdf_report_path = None # Tandai bahwa PDF gagal dibuat